@@ -9,13 +9,83 @@ export interface Document {
   created_at: string;
   updated_at: string;
   created_by: string;
-  versions: any[];
+  version_count: number;
+  latest_version: any | null;
+  /** Only on detail, or on lists with `expand=versions` */
+  versions?: any[];
+}
+
+export interface DocumentPage {
+  next: string | null;
+  previous: string | null;
+  results: Document[];
+}
+
+export interface DocumentStats {
+  total: number;
+  by_status: Record<'pending' | 'approved' | 'rejected' | 'signed' | 'archived', number>;
+  by_priority: Record<string, number>;
+  awaiting_review: number;
+  awaiting_signature: number;
+}
+
+export interface UploadSession {
+  id: string;
+  document_id: string;
+  filename: string;
+  size: number;
+  offset: number;
+}
+
+export interface TagCount {
+  tag: string;
+  count: number;
+}
+
+export interface DocumentListParams {
+  cursor?: string;
+  page_size?: number;
+  status?: string;
+  priority?: string;
+  document_type?: string;
+  assignee?: string;
+  reviewer?: string;
+  creator?: string;
+  created_after?: string;
+  created_before?: string;
+  updated_after?: string;
+  updated_before?: string;
+  ordering?: string;
 }
 
 export default class DocumentsApi {
-  /** List all documents for the current user */
-  static list() {
-    return client.get<Document[]>('/documents/');
+  /** List one page of documents, newest first */
+  static list(params?: DocumentListParams) {
+    return client.get<DocumentPage>('/documents/', { params });
+  }
+
+  /** Every matching document, following the `next` cursor page by page */
+  static async listAll(params?: DocumentListParams) {
+    const documents: Document[] = [];
+    let cursor: string | undefined;
+    do {
+      const { data } = await DocumentsApi.list({ page_size: 100, ...params, cursor });
+      documents.push(...data.results);
+      cursor = data.next
+        ? new URL(data.next, window.location.origin).searchParams.get('cursor') ?? undefined
+        : undefined;
+    } while (cursor);
+    return documents;
+  }
+
+  /** Document counts for the dashboard, aggregated on the server */
+  static stats(params?: DocumentListParams) {
+    return client.get<DocumentStats>('/documents/stats/', { params });
+  }
+
+  /** Most used tags with document counts; `prefix` narrows for autocomplete */
+  static tags(params?: DocumentListParams & { prefix?: string; limit?: number }) {
+    return client.get<TagCount[]>('/documents/tags/', { params });
   }
 
   /** Retrieve one document by ID */
@@ -74,4 +144,43 @@ export default class DocumentsApi {
       headers: { 'Content-Type': 'multipart/form-data' },
     });
   }
+
+  /**
+   * Upload a large file as a new version in resumable chunks. A failed chunk
+   * is retried from the offset the server reports.
+   */
+  static async uploadVersionResumable(
+    document_id: string,
+    file: File,
+    onProgress?: (sent: number, total: number) => void,
+    chunkSize = 8 * 1024 * 1024,
+    retries = 5
+  ) {
+    const { data: session } = await client.post<UploadSession>('/documents/uploads/', {
+      document_id,
+      filename: file.name,
+      size: file.size,
+    });
+    const url = `/documents/uploads/${session.id}/`;
+    let offset = session.offset;
+    let failures = 0;
+    while (offset < file.size) {
+      try {
+        const res = await client.patch(url, file.slice(offset, offset + chunkSize), {
+          headers: {
+            'Content-Type': 'application/offset+octet-stream',
+            'Upload-Offset': String(offset),
+          },
+        });
+        offset = Number(res.headers['upload-offset']);
+        failures = 0;
+        onProgress?.(offset, file.size);
+      } catch (error) {
+        if (++failures > retries) throw error;
+        const res = await client.head(url);
+        offset = Number(res.headers['upload-offset']);
+      }
+    }
+    return client.post(`${url}finalize/`);
+  }
 }
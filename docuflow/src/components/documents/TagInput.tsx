@@ -1,10 +1,26 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
+import DocumentsApi from '@/api/DocumentsApi';
 import { Input } from '@/components/ui/input';
 import { Badge } from '@/components/ui/badge';
 import { X } from 'lucide-react';
 
 export default function TagInput({ value = [], onChange }) {
   const [inputValue, setInputValue] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
+
+  useEffect(() => {
+    const prefix = inputValue.trim();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+    const timer = setTimeout(() => {
+      DocumentsApi.tags({ prefix, limit: 10 })
+        .then(({ data }) => setSuggestions(data.map((facet) => facet.tag)))
+        .catch(() => setSuggestions([]));
+    }, 200);
+    return () => clearTimeout(timer);
+  }, [inputValue]);
 
   const handleKeyDown = (e) => {
     if (e.key === 'Enter' || e.key === ',') {
@@ -51,7 +67,15 @@ export default function TagInput({ value = [], onChange }) {
           onBlur={addTag}
           placeholder="Add tag (press Enter)"
           className="flex-1"
+          list="tag-suggestions"
         />
+        <datalist id="tag-suggestions">
+          {suggestions
+            .filter((tag) => !value.includes(tag))
+            .map((tag) => (
+              <option key={tag} value={tag} />
+            ))}
+        </datalist>
       </div>
     </div>
   );
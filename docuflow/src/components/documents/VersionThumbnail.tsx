@@ -0,0 +1,34 @@
+import { useEffect, useState } from 'react';
+import { FileText } from 'lucide-react';
+import { getAccessToken } from '@/contexts/AuthContext';
+
+// Renditions need the bearer token, so they are fetched and shown through an
+// object URL instead of a plain <img src>. The browser cache still applies
+// because the server marks them immutable.
+export default function VersionThumbnail({ url, className = 'h-10 w-10' }) {
+  const [src, setSrc] = useState<string | null>(null);
+
+  useEffect(() => {
+    let active = true;
+    let objectUrl: string | null = null;
+
+    fetch(url, { headers: { Authorization: `Bearer ${getAccessToken()}` } })
+      .then((res) => (res.ok ? res.blob() : null))
+      .then((blob) => {
+        if (!active || !blob) return;
+        objectUrl = URL.createObjectURL(blob);
+        setSrc(objectUrl);
+      })
+      .catch(() => {});
+
+    return () => {
+      active = false;
+      if (objectUrl) URL.revokeObjectURL(objectUrl);
+    };
+  }, [url]);
+
+  if (!src) {
+    return <FileText className={`${className} text-gray-300`} />;
+  }
+  return <img src={src} alt="" className={`${className} object-cover rounded`} />;
+}
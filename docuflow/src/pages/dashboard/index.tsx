@@ -15,13 +15,11 @@ import { Skeleton } from '@/components/ui/skeleton';
 import StatusCard from '../../components/dashboard/StatusCard';
 import RecentDocumentsList from '../../components/dashboard/RecentDocumentsList';
 import DocumentStatusChart from '../../components/dashboard/DocumentStatusChart';
-import { useAuthContext } from '@/contexts/AuthContext';
 import DocumentsApi from '@/api/DocumentsApi';
 
 export default function Dashboard() {
   const [documents, setDocuments] = useState([]);
   const [loading, setLoading] = useState(true);
-  const { userData } = useAuthContext()
   const [statusCounts, setStatusCounts] = useState({
     pending: 0,
     approved: 0,
@@ -29,30 +27,22 @@ export default function Dashboard() {
     signed: 0,
     archived: 0,
   });
+  const [taskCounts, setTaskCounts] = useState({ reviews: 0, signatures: 0 });
 
   useEffect(() => {
     const fetchData = async () => {
       setLoading(true);
       try {
-        const { data } = await DocumentsApi.list();
-        setDocuments(data);
-
-        // Count documents by status
-        const counts = {
-          pending: 0,
-          approved: 0,
-          rejected: 0,
-          signed: 0,
-          archived: 0,
-        };
-
-        data.forEach((doc) => {
-          if (counts[doc.status] !== undefined) {
-            counts[doc.status]++;
-          }
+        const [{ data: page }, { data: stats }] = await Promise.all([
+          DocumentsApi.list({ page_size: 5 }),
+          DocumentsApi.stats(),
+        ]);
+        setDocuments(page.results);
+        setStatusCounts(stats.by_status);
+        setTaskCounts({
+          reviews: stats.awaiting_review,
+          signatures: stats.awaiting_signature,
         });
-
-        setStatusCounts(counts);
       } catch (error) {
         console.error('Error fetching data:', error);
       } finally {
@@ -63,17 +53,9 @@ export default function Dashboard() {
     fetchData();
   }, []);
 
-  const getPendingReviews = () => {
-    return documents.filter(
-      (doc) => doc.status === 'pending' && doc.reviewer_id === userData?.user_id
-    ).length;
-  };
+  const getPendingReviews = () => taskCounts.reviews;
 
-  const getPendingSigns = () => {
-    return documents.filter(
-      (doc) => doc.status === 'approved' && doc.assignee_id === userData?.user_id
-    ).length;
-  };
+  const getPendingSigns = () => taskCounts.signatures;
 
   const getRecentDocuments = () => {
     return documents.slice(0, 5);
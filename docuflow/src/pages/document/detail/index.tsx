@@ -11,6 +11,7 @@ import { Card, CardContent, CardHeader } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Separator } from '@/components/ui/separator';
 import DocumentDetails from '../../../components/documents/DocumentDetails';
+import VersionThumbnail from '../../../components/documents/VersionThumbnail';
 import { getAccessToken, useAuthContext } from '@/contexts/AuthContext';
 import DocumentsApi from '@/api/DocumentsApi';
 import { Label } from '@/components/ui/label';
@@ -20,6 +21,7 @@ interface Version {
   version_number: number;
   filename: string;
   download_url: string;
+  renditions: { thumbnail: string; preview: string };
   created_by: string;
   created_at: string;
 }
@@ -277,12 +279,13 @@ export default function DocumentDetail() {
                 key={v.version_number}
                 variant={v.version_number === selectedVersion?.version_number && 'outline'}
                 size="sm"
-                className="w-full justify-start"
+                className="w-full justify-start gap-2 h-auto py-1"
                 onClick={() => {
                   setSelectedVersion(v);
                 //   setPreviewUrl(v.download_url);
                 }}
               >
+                <VersionThumbnail url={v.renditions.thumbnail} />
                 Version {v.version_number}
               </Button>
             ))}
@@ -42,8 +42,8 @@ export default function Review() {
     const fetchData = async () => {
       setLoading(true);
       try {
-        const {data} = await DocumentsApi.list(); 
-        setDocuments(data);
+        const results = await DocumentsApi.listAll({ reviewer: 'me', status: 'pending,approved,rejected' });
+        setDocuments(results);
       } catch (error) {
         console.error('Error fetching data:', error);
       } finally {
@@ -64,8 +64,8 @@ export default function Review() {
         }
 
       // Refresh documents
-        const {data} = await DocumentsApi.list(); // GET DOCUMENT LIST API TODO
-      setDocuments(data);
+        const results = await DocumentsApi.listAll({ reviewer: 'me', status: 'pending,approved,rejected' });
+      setDocuments(results);
 
       // Reset UI state
       setShowReviewForm(false);
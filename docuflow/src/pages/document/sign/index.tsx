@@ -57,8 +57,8 @@ export default function Sign() {
       const fetchData = async () => {
         setLoading(true);
         try {
-          const {data} = await DocumentsApi.list(); 
-          setDocuments(data);
+          const results = await DocumentsApi.listAll({ assignee: 'me', status: 'approved,signed' });
+          setDocuments(results);
         } catch (error) {
           console.error('Error fetching data:', error);
         } finally {
@@ -87,8 +87,8 @@ export default function Sign() {
     //   }); // TODO SIGN DOCUMENT API  
       
       // Refresh documents
-      const {data} = await DocumentsApi.list();
-      setDocuments(data);
+      const results = await DocumentsApi.listAll({ assignee: 'me', status: 'approved,signed' });
+      setDocuments(results);
       
       // Reset UI state
       setShowSignForm(false);
@@ -145,7 +145,7 @@ export default function Sign() {
     setLoading(true)
     try {
       // fetch latest version (last approved)
-      const latest = selectedDocument?.versions?.slice(-1)[0]
+      const latest = selectedDocument?.latest_version
       const res = await fetch(latest.download_url, {
         headers: { Authorization: `Bearer ${getAccessToken()}` }
       })
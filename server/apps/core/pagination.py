@@ -0,0 +1,149 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPagination:
+    """
+    Keyset (cursor) pagination over a fixed ordering.
+
+    The last field of ``ordering`` must be unique so every row has a distinct
+    position. Pages are fetched with a range condition on the ordering columns
+    instead of an OFFSET, so any page costs the same as the first one as long
+    as an index matches the ordering.
+    """
+
+    page_size = 25
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(_flip(field) for field in ordering)
+        if position is not None:
+            queryset = queryset.filter(_seek(ordering, position))
+
+        rows = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Walked past the end: the previous page is the first one.
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def encode_cursor(self, row, reverse):
+        position = [_dump(getattr(row, field.lstrip("-"))) for field in self.ordering]
+        payload = json.dumps(
+            {"o": self.ordering, "p": position, "r": int(reverse)},
+            separators=(",", ":"),
+        )
+        token = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token.rstrip("="))
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            values, reverse = payload["p"], bool(payload["r"])
+            # A cursor is only meaningful for the ordering it was issued for.
+            if tuple(payload["o"]) != self.ordering or len(values) != len(
+                self.ordering
+            ):
+                raise InvalidCursor(token)
+            position = [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, KeyError, ValueError, binascii.Error, ValidationError):
+            raise InvalidCursor(token)
+        return position, reverse
+
+
+def _flip(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def _dump(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, float, str, bool)):
+        return value
+    return str(value)
+
+
+def _seek(ordering, position):
+    """
+    Build ``(f1, f2, ...) > (v1, v2, ...)`` honouring each field's direction.
+
+    The leading ``f1 >= v1`` term is redundant but gives the planner an index
+    condition to start the scan from, rather than filtering every row before
+    the cursor.
+    """
+    seek = Q()
+    for i, field in enumerate(ordering):
+        lookup = "lt" if field.startswith("-") else "gt"
+        term = Q(**{f"{field.lstrip('-')}__{lookup}": position[i]})
+        for prev, value in zip(ordering[:i], position):
+            term &= Q(**{prev.lstrip("-"): value})
+        seek |= term
+
+    first = ordering[0]
+    lookup = "lte" if first.startswith("-") else "gte"
+    return Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}) & seek
@@ -0,0 +1,136 @@
+"""
+Binary deltas between two versions of a file.
+
+A delta is a header followed by COPY (a range of the base) and INSERT
+(literal bytes) instructions that rebuild the target from the base. Matches
+are found by indexing the base in fixed-size blocks and extending each block
+hit in both directions, so unchanged stretches cost one instruction no
+matter how long they are, and scanning byte by byte only happens inside
+changed regions.
+"""
+
+import struct
+
+MAGIC = b"DLT1"
+BLOCK_SIZE = 32
+
+_COPY = b"C"
+_INSERT = b"I"
+_COPY_OP = struct.Struct(">QQ")
+_INSERT_OP = struct.Struct(">Q")
+_HEADER = struct.Struct(">4sQ")
+
+# Bytes compared per step while extending a match forwards.
+_EXTEND_STEP = 64 * 1024
+
+
+class CorruptDelta(ValueError):
+    pass
+
+
+def diff(base, target, limit=None, block_size=BLOCK_SIZE):
+    """
+    Delta that turns ``base`` into ``target`` (both ``bytes``).
+
+    Gives up and returns None as soon as the delta would exceed ``limit``
+    bytes, so unrelated files are not scanned to the end.
+    """
+    index = {}
+    for offset in range(0, len(base) - block_size + 1, block_size):
+        index.setdefault(base[offset : offset + block_size], offset)
+
+    out = [_HEADER.pack(MAGIC, len(target))]
+    written = _HEADER.size
+    literal_start = i = 0
+    end = len(target)
+    while i + block_size <= end:
+        if limit is not None and written + (i - literal_start) > limit:
+            return None
+        offset = index.get(target[i : i + block_size])
+        if offset is None:
+            i += 1
+            continue
+        # Grow the match back into pending literals, then forwards.
+        start, base_start = i, offset
+        while (
+            start > literal_start
+            and base_start > 0
+            and target[start - 1] == base[base_start - 1]
+        ):
+            start -= 1
+            base_start -= 1
+        length = (i - start) + block_size
+        length += _common_prefix(target, i + block_size, base, offset + block_size)
+
+        if start > literal_start:
+            written += _insert(out, target[literal_start:start])
+        out.append(_COPY + _COPY_OP.pack(base_start, length))
+        written += 1 + _COPY_OP.size
+        i = literal_start = start + length
+    if literal_start < end:
+        written += _insert(out, target[literal_start:])
+    if limit is not None and written > limit:
+        return None
+    return b"".join(out)
+
+
+def patch(base, delta):
+    """
+    Rebuild the target that ``delta`` was computed for from ``base``.
+    """
+    try:
+        magic, size = _HEADER.unpack_from(delta)
+    except struct.error:
+        raise CorruptDelta("Delta header is truncated.")
+    if magic != MAGIC:
+        raise CorruptDelta("Not a delta.")
+
+    out = []
+    pos = _HEADER.size
+    view = memoryview(delta)
+    try:
+        while pos < len(delta):
+            op = delta[pos : pos + 1]
+            pos += 1
+            if op == _COPY:
+                offset, length = _COPY_OP.unpack_from(delta, pos)
+                pos += _COPY_OP.size
+                out.append(base[offset : offset + length])
+            elif op == _INSERT:
+                (length,) = _INSERT_OP.unpack_from(delta, pos)
+                pos += _INSERT_OP.size
+                out.append(view[pos : pos + length])
+                pos += length
+            else:
+                raise CorruptDelta(f"Unknown instruction {op!r}.")
+    except struct.error:
+        raise CorruptDelta("Delta is truncated.")
+
+    target = b"".join(out)
+    if len(target) != size:
+        raise CorruptDelta(f"Rebuilt {len(target)} bytes, expected {size}.")
+    return target
+
+
+def _insert(out, data):
+    out.append(_INSERT + _INSERT_OP.pack(len(data)) + data)
+    return 1 + _INSERT_OP.size + len(data)
+
+
+def _common_prefix(a, a_start, b, b_start):
+    """
+    Length of the common run of ``a[a_start:]`` and ``b[b_start:]``.
+    """
+    matched = 0
+    step = _EXTEND_STEP
+    while step:
+        a_chunk = a[a_start + matched : a_start + matched + step]
+        if a_chunk and a_chunk == b[b_start + matched : b_start + matched + step]:
+            matched += len(a_chunk)
+            if len(a_chunk) < step:
+                return matched
+        else:
+            if step == 1:
+                return matched
+            step //= 2
+    return matched
@@ -0,0 +1,137 @@
+"""
+ZIP bundles of version files, built while they are sent.
+
+``stream_bundle`` writes the archive through ``zipfile`` into a small buffer
+that is emptied after every chunk of file content, so neither the archive
+nor a whole version file is ever held on disk or in memory. The buffer
+cannot seek, so ``zipfile`` writes each entry's sizes and CRC in a data
+descriptor after its data. Entries whose content is compressed already
+(images, Office files, archives...) are stored as is; the rest are
+deflated. A ``manifest.json`` listing every entry with its SHA-256 closes
+the archive.
+"""
+
+import hashlib
+import json
+import zipfile
+
+from apps.documents.compression import is_compressed_format
+from apps.documents.deltas import open_version
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.text import get_valid_filename, slugify
+
+# Bytes of a version file read, compressed and sent per step.
+READ_SIZE = 1024 * 1024
+MANIFEST_NAME = "manifest.json"
+# Longest title prefix used in an entry's folder name.
+FOLDER_TITLE_CHARS = 50
+
+
+class _Buffer:
+    """
+    Write-only, unseekable file collecting what ``zipfile`` writes until
+    ``take()`` hands it on.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.offset = 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def entry_path(version):
+    """
+    Path of ``version``'s file in a bundle: one folder per document, named
+    after its title and ID, holding ``v<number>-<filename>`` entries.
+    """
+    document = version.document
+    folder = slugify(document.title)[:FOLDER_TITLE_CHARS] or "document"
+    filename = get_valid_filename(version.filename) if version.filename else ""
+    return (
+        f"{folder}-{str(document.document_id)[:8]}/"
+        f"v{version.version_number}-{filename or 'file'}"
+    )
+
+
+def stream_bundle(versions):
+    """
+    Yield a ZIP archive of the files of ``versions``, which must have their
+    ``document`` and ``created_by`` selected.
+
+    A file missing from storage cannot abort a response that has started,
+    so it is left out and listed under ``missing`` in the manifest.
+    """
+    buffer = _Buffer()
+    files = []
+    missing = []
+    with zipfile.ZipFile(buffer, "w", allowZip64=True) as archive:
+        for version in versions:
+            path = entry_path(version)
+            record = {
+                "path": path,
+                "document_id": version.document.document_id,
+                "title": version.document.title,
+                "version_number": version.version_number,
+                "filename": version.filename,
+                "created_by": version.created_by.email,
+                "created_at": version.created_at,
+            }
+            try:
+                content = open_version(version)
+            except FileNotFoundError:
+                missing.append(record)
+                continue
+            with content:
+                head = content.read(READ_SIZE)
+                info = zipfile.ZipInfo(
+                    path,
+                    date_time=timezone.localtime(version.created_at).timetuple()[:6],
+                )
+                info.compress_type = (
+                    zipfile.ZIP_STORED
+                    if is_compressed_format(head)
+                    else zipfile.ZIP_DEFLATED
+                )
+                # Lets zipfile decide up front whether the entry needs ZIP64.
+                info.file_size = version.size or 0
+                digest = hashlib.sha256()
+                with archive.open(info, "w", force_zip64=version.size is None) as entry:
+                    data = head
+                    while data:
+                        digest.update(data)
+                        entry.write(data)
+                        if chunk := buffer.take():
+                            yield chunk
+                        data = content.read(READ_SIZE)
+            yield buffer.take()
+            files.append(
+                {**record, "size": info.file_size, "sha256": digest.hexdigest()}
+            )
+
+        manifest = {
+            "generated_at": timezone.now(),
+            "files": files,
+            "missing": missing,
+        }
+        archive.writestr(
+            MANIFEST_NAME,
+            json.dumps(manifest, cls=DjangoJSONEncoder, indent=2),
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+    yield buffer.take()
@@ -0,0 +1,262 @@
+"""
+Compressed file format used by the version storage.
+
+A compressed file is a header followed by one compressed stream::
+
+    MAGIC (8 bytes) | codec id (1 byte) | content size (8 bytes, big-endian)
+
+Files without the header are stored as uploaded, so files written before
+compression was enabled, or while it is off, read back unchanged.
+"""
+
+import bz2
+import io
+import lzma
+import struct
+import zlib
+
+MAGIC = b"\x89EDZ\r\n\x1a\n"
+HEADER = struct.Struct(">8sBQ")
+
+# Compressed bytes read, and decompressed bytes produced at most, per step
+# when decompressing.
+READ_SIZE = 64 * 1024
+OUTPUT_SIZE = 256 * 1024
+# First chunk of an upload that is test-compressed to decide whether the
+# whole file is worth compressing, and the share it has to save.
+SAMPLE_SIZE = 64 * 1024
+MIN_SAVING = 0.05
+
+# Leading bytes of formats that are compressed already: archives and Office
+# files (ZIP), gzip, bzip2, xz, zstd, 7z, RAR, JPEG, PNG, GIF, Ogg, MP3,
+# FLAC and Matroska/WebM.
+COMPRESSED_SIGNATURES = (
+    b"PK\x03\x04",
+    b"\x1f\x8b",
+    b"BZh",
+    b"\xfd7zXZ\x00",
+    b"\x28\xb5\x2f\xfd",
+    b"7z\xbc\xaf\x27\x1c",
+    b"Rar!\x1a\x07",
+    b"\xff\xd8\xff",
+    b"\x89PNG\r\n\x1a\n",
+    b"GIF8",
+    b"OggS",
+    b"ID3",
+    b"fLaC",
+    b"\x1a\x45\xdf\xa3",
+)
+
+
+class Codec:
+    def __init__(self, id, default_level, compressor, decompressor):
+        self.id = id
+        self.default_level = default_level
+        self.compressor = compressor
+        self.decompressor = decompressor
+
+
+CODECS = {
+    "zlib": Codec(1, 6, lambda level: zlib.compressobj(level), zlib.decompressobj),
+    "bz2": Codec(2, 9, lambda level: bz2.BZ2Compressor(level), bz2.BZ2Decompressor),
+    "lzma": Codec(
+        3,
+        6,
+        lambda level: lzma.LZMACompressor(preset=level),
+        lzma.LZMADecompressor,
+    ),
+}
+CODECS_BY_ID = {codec.id: codec for codec in CODECS.values()}
+
+
+def is_compressed_format(head):
+    """
+    Whether ``head``, the first bytes of a file, shows a compressed format.
+    """
+    if head.startswith(COMPRESSED_SIGNATURES):
+        return True
+    # MP4, MOV and HEIC; WebP and AVI.
+    return head[4:8] == b"ftyp" or (
+        head[:4] == b"RIFF" and head[8:12] in (b"WEBP", b"AVI ")
+    )
+
+
+def worth_compressing(head, codec, level=None):
+    """
+    Whether a file starting with ``head`` should be stored compressed.
+    """
+    if head.startswith(MAGIC):
+        # Would be mistaken for a compressed file if stored as is.
+        return True
+    if not head or is_compressed_format(head):
+        return False
+    sample = head[:SAMPLE_SIZE]
+    compressor = CODECS[codec].compressor(_level(codec, level))
+    size = len(compressor.compress(sample)) + len(compressor.flush())
+    return HEADER.size + size <= len(sample) * (1 - MIN_SAVING)
+
+
+def read_header(file):
+    """
+    ``(codec, content size)`` of an open compressed file, leaving it at the
+    start of the stream, or None with the file rewound if it is stored as is.
+    """
+    data = file.read(HEADER.size)
+    if len(data) == HEADER.size:
+        magic, codec_id, size = HEADER.unpack(data)
+        if magic == MAGIC and codec_id in CODECS_BY_ID:
+            return CODECS_BY_ID[codec_id], size
+    file.seek(0)
+    return None
+
+
+class CompressingWriter:
+    """
+    Writes a compressed file to the seekable binary file ``file``.
+    ``finish()`` completes the stream and fills in the size in the header.
+    """
+
+    def __init__(self, file, codec, level=None):
+        self.file = file
+        self.codec = CODECS[codec]
+        self.compressor = self.codec.compressor(_level(codec, level))
+        self.size = 0
+        self.start = file.tell()
+        file.write(HEADER.pack(MAGIC, self.codec.id, 0))
+
+    def write(self, data):
+        self.size += len(data)
+        self.file.write(self.compressor.compress(data))
+
+    def finish(self):
+        self.file.write(self.compressor.flush())
+        end = self.file.tell()
+        self.file.seek(self.start)
+        self.file.write(HEADER.pack(MAGIC, self.codec.id, self.size))
+        self.file.seek(end)
+
+
+class DecompressingFile(io.RawIOBase):
+    """
+    Read-only, seekable view of the content of a compressed file.
+
+    ``raw`` is positioned at the start of the compressed stream, as
+    ``read_header`` leaves it. Seeking is lazy: nothing is decompressed until
+    the next read, which continues forwards or, for an earlier position,
+    starts again from the beginning. Finding the size needs no
+    decompression, so responses can set Content-Length up front.
+    """
+
+    def __init__(self, raw, codec, size):
+        self.raw = raw
+        self.codec = codec
+        self.size = size
+        self.stream_start = raw.tell()
+        self.name = getattr(raw, "name", None)
+        self._restart()
+        self._target = 0
+
+    def _restart(self):
+        self.raw.seek(self.stream_start)
+        self._decompressor = self.codec.decompressor()
+        # Compressed input the decompressor has not taken yet (zlib only).
+        self._input = b""
+        # Decompressed bytes not read yet start at _buffer[_offset], which is
+        # content position _position.
+        self._buffer = bytearray()
+        self._offset = 0
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._target
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._target
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("Negative seek position")
+        self._target = offset
+        return offset
+
+    def read(self, size=-1):
+        if self._target < self._position:
+            self._restart()
+        while self._position < self._target:
+            if not self._buffered() and not self._fill():
+                break
+            skipped = min(self._buffered(), self._target - self._position)
+            self._offset += skipped
+            self._position += skipped
+
+        if size is None or size < 0:
+            size = max(self.size - self._position, 0)
+        while self._buffered() < size and self._fill():
+            pass
+        data = bytes(self._buffer[self._offset : self._offset + size])
+        self._offset += len(data)
+        self._position += len(data)
+        self._target = self._position
+        return data
+
+    def _buffered(self):
+        return len(self._buffer) - self._offset
+
+    def _fill(self):
+        """
+        Decompress at most ``OUTPUT_SIZE`` more bytes into the buffer,
+        dropping the part already read. Returns whether any came.
+        """
+        data = self._inflate(OUTPUT_SIZE)
+        if not data:
+            return False
+        del self._buffer[: self._offset]
+        self._offset = 0
+        self._buffer += data
+        return True
+
+    def _inflate(self, limit):
+        """
+        Up to ``limit`` more bytes of content, or b"" at its end. Output is
+        capped so a highly compressed chunk is not inflated all at once.
+        """
+        decompressor = self._decompressor
+        while not decompressor.eof:
+            data, self._input = self._input, b""
+            # bz2 and lzma keep leftover input themselves and say when they
+            # have output left to give without more.
+            if not data and getattr(decompressor, "needs_input", True):
+                data = self.raw.read(READ_SIZE)
+                if not data:
+                    # zlib may still hold output back once all input is in.
+                    flush = getattr(decompressor, "flush", None)
+                    return flush() if flush else b""
+            out = decompressor.decompress(data, limit)
+            self._input = getattr(decompressor, "unconsumed_tail", b"")
+            if out:
+                return out
+        return b""
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def readall(self):
+        return self.read()
+
+    def close(self):
+        if not self.closed:
+            self.raw.close()
+        super().close()
+
+
+def _level(codec, level):
+    return CODECS[codec].default_level if level is None else level
@@ -0,0 +1,67 @@
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def document_validators(queryset, request):
+    """
+    ETag and Last-Modified for ``queryset`` as rendered for ``request``.
+
+    Both come from one aggregate over the document rows alone: any edit,
+    upload or version deletion bumps ``updated_at`` and deletions change a
+    count. The user and full path are mixed into the ETag
+    because filters, fields, cursors and allowed actions shape the payload.
+    Returns ``(etag, last_modified, count)``.
+    """
+    state = queryset.order_by().aggregate(
+        count=Count("pk"),
+        last_updated=Max("updated_at"),
+        version_count=Sum("version_count"),
+    )
+    last_updated = state["last_updated"]
+    last_modified = int(last_updated.timestamp()) if last_updated else None
+
+    key = "|".join(
+        str(value)
+        for value in (request.user.pk, request.get_full_path(), *state.values())
+    )
+    etag = f'"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]}"'
+    return etag, last_modified, state["count"]
+
+
+def page_etag(rows, request, *state):
+    """
+    ETag for the page of documents ``rows`` as rendered for ``request``.
+
+    Lists get no Last-Modified: a document leaving the filter or being
+    deleted changes the page without making anything newer. The page rows
+    are fetched anyway, so the ETag comes from their keys and ``updated_at``
+    plus ``state`` (whether there are neighbouring pages) rather than from
+    an aggregate over every matching document.
+    """
+    key = "|".join(
+        str(value)
+        for value in (
+            request.user.pk,
+            request.get_full_path(),
+            *state,
+            *(f"{row.pk}@{row.updated_at.isoformat()}" for row in rows),
+        )
+    )
+    return f'"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def not_modified(request, etag, last_modified):
+    """
+    The ``304 Not Modified`` response if the client's copy is current.
+    """
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,209 @@
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from apps.documents import bindiff
+from apps.documents.models import Blob, DocumentVersion
+from apps.documents.storage import version_storage
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+
+class ContentCache:
+    """
+    LRU of rebuilt version contents, bounded by their total size in bytes
+    (``DOCUMENT_DELTA_CACHE_BYTES``). Shared by the threads of a process.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            content = self.entries.get(key)
+            if content is not None:
+                self.entries.move_to_end(key)
+            return content
+
+    def put(self, key, content):
+        max_bytes = settings.DOCUMENT_DELTA_CACHE_BYTES
+        if len(content) > max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self.entries[key] = content
+            self.size += len(content)
+            while self.size > max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+cache = ContentCache()
+
+
+def read_version(version):
+    """
+    The content of ``version``, rebuilt through its delta chain if needed.
+
+    The chain is walked back to a full copy or a cached version, then the
+    deltas are applied forwards, caching each rebuilt version on the way.
+    """
+    chain = []
+    while True:
+        if not version.delta_base_id:
+            with version.file.open("rb") as f:
+                content = f.read()
+            break
+        content = cache.get(_cache_key(version))
+        if content is not None:
+            break
+        chain.append(version)
+        # Through a deleted base too: it stays until its purge job runs.
+        version = DocumentVersion.all_objects.only("file", "delta_base").get(
+            pk=version.delta_base_id
+        )
+
+    for version in reversed(chain):
+        with version.file.open("rb") as f:
+            content = bindiff.patch(content, f.read())
+        cache.put(_cache_key(version), content)
+    return content
+
+
+def open_version(version):
+    """
+    A binary file object positioned at the start of ``version``'s content.
+    """
+    if version.delta_base_id:
+        return BytesIO(read_version(version))
+    return version.file.storage.open(version.file.name, "rb")
+
+
+def local_path(version, workdir):
+    """
+    A path to ``version``'s content for tools that need a file: the stored
+    file itself when it holds the content as is, otherwise a copy written
+    into ``workdir``.
+    """
+    if not version.delta_base_id and not version_storage.is_compressed(
+        version.file.name
+    ):
+        return version.file.path
+    path = os.path.join(workdir, "content")
+    with open_version(version) as content, open(path, "wb") as out:
+        shutil.copyfileobj(content, out)
+    return path
+
+
+def encode_version(pk):
+    """
+    Store version ``pk`` as a delta against the previous version if the
+    delta is small enough, neither file is over ``DOCUMENT_DELTA_MAX_BYTES``
+    and the chain has not reached a keyframe.
+
+    The files are read and diffed without holding any lock; the version and
+    its base are only locked to check that neither changed meanwhile and to
+    swap in the delta. Returns whether the version was re-encoded.
+    """
+    version = DocumentVersion.objects.filter(pk=pk).first()
+    if version is None or version.delta_base_id or not version.blob_id:
+        return False
+    base = (
+        DocumentVersion.objects.filter(
+            document_id=version.document_id,
+            version_number__lt=version.version_number,
+        )
+        .exclude(blob=None)
+        .order_by("-version_number")
+        .first()
+    )
+    if base is None:
+        return False
+    if base.delta_depth + 1 >= settings.DOCUMENT_DELTA_KEYFRAME_INTERVAL:
+        return False
+    if max(version.size or 0, base.size or 0) > settings.DOCUMENT_DELTA_MAX_BYTES:
+        return False
+
+    target = read_version(version)
+    limit = int(len(target) * settings.DOCUMENT_DELTA_MAX_RATIO)
+    delta = bindiff.diff(read_version(base), target, limit=limit)
+    if delta is None:
+        return False
+
+    with transaction.atomic():
+        locked = {
+            v.pk: v
+            for v in DocumentVersion.objects.select_for_update().filter(
+                pk__in=[version.pk, base.pk]
+            )
+        }
+        current, current_base = locked.get(version.pk), locked.get(base.pk)
+        # A purge of either, another encoder or a re-encoded base may have
+        # got there first. The base's content cannot change, only its depth.
+        if (
+            current is None
+            or current_base is None
+            or current.delta_base_id
+            or current.blob_id != version.blob_id
+        ):
+            return False
+        depth = current_base.delta_depth + 1
+        if depth >= settings.DOCUMENT_DELTA_KEYFRAME_INTERVAL:
+            return False
+        _replace_content(
+            current,
+            delta,
+            f"{current.filename}.delta",
+            delta_base=current_base,
+            delta_depth=depth,
+        )
+    cache.put(_cache_key(current), target)
+    return True
+
+
+def materialize(version):
+    """
+    Store ``version`` as a full copy again, e.g. before its base is deleted.
+    """
+    if version.delta_base_id:
+        _replace_content(
+            version,
+            read_version(version),
+            version.filename,
+            delta_base=None,
+            delta_depth=0,
+        )
+
+
+def _replace_content(version, data, filename, **fields):
+    upload_name = version.file.field.generate_filename(version, filename)
+    with transaction.atomic():
+        name = version_storage.save(upload_name, ContentFile(data))
+        Blob.acquire(name, len(data))
+        if not version_storage.exists(name):
+            # A purge removed the copy this was deduplicated to.
+            version_storage.save(upload_name, ContentFile(data))
+        DocumentVersion.objects.filter(pk=version.pk).update(
+            file=name, blob=name, **fields
+        )
+        if version.blob_id:
+            Blob.release(version.blob_id)
+    version.file.name = version.blob_id = name
+    for field, value in fields.items():
+        setattr(version, field, value)
+
+
+def _cache_key(version):
+    return version.pk, version.file.name
@@ -0,0 +1,202 @@
+import os
+from urllib.parse import quote
+
+from apps.documents.deltas import open_version
+from apps.documents.sniffing import OCTET_STREAM
+from apps.documents.storage import version_storage
+from django.conf import settings
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+)
+
+# Types a browser would run as a page of the API's origin when shown inline.
+ACTIVE_CONTENT_TYPES = (
+    "text/html",
+    "application/xhtml+xml",
+    "image/svg+xml",
+    "application/xml",
+    "text/xml",
+)
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+class RangeFile:
+    """
+    ``length`` bytes of an open file starting at ``start``.
+
+    The OS file offset is moved to ``start`` and ``fileno()`` is exposed, so
+    WSGI servers with ``wsgi.file_wrapper`` send the range with sendfile();
+    others read it through ``read()``.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def can_download(doc, user):
+    return user.is_staff or user.pk in (
+        doc.created_by_id,
+        doc.assigned_to_id,
+        doc.reviewer_id,
+    )
+
+
+def can_delete(doc, user):
+    return user.is_staff or user.pk == doc.created_by_id
+
+
+def downloadable_documents(queryset, user):
+    """
+    The documents of ``queryset`` whose files ``user`` may download, as
+    ``can_download`` decides for one document.
+    """
+    if user.is_staff:
+        return queryset
+    return queryset.filter(Q(created_by=user) | Q(assigned_to=user) | Q(reviewer=user))
+
+
+def version_etag(version):
+    """
+    Strong validator for a version's bytes. Content-addressed files are named
+    after their SHA-256; older files fall back to name, size and mtime.
+    """
+    if version.blob_id:
+        return f'"{version_storage.digest(version.file.name)}"'
+    stat = os.stat(version.file.path)
+    return f'"{version.pk}-{stat.st_size}-{int(stat.st_mtime)}"'
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)``, inclusive, for a single ``bytes=`` range of a ``size``
+    byte file, or None to send the whole file.
+
+    Malformed and multi-range headers are ignored, as RFC 9110 allows.
+    Raises RangeNotSatisfiable when the range starts past the end.
+    """
+    unit, _, spec = (header or "").partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def if_range_matches(request, etag, last_modified):
+    """
+    Whether a ``Range`` may be honoured given the request's ``If-Range``.
+    """
+    validator = request.headers.get("If-Range")
+    if not validator:
+        return True
+    if validator.startswith(('"', "W/")):
+        return validator == etag
+    return parse_http_date_safe(validator) == last_modified
+
+
+def version_response(request, version, etag, last_modified, as_attachment=False):
+    """
+    The file of ``version``, whole or as the requested byte range.
+
+    With ``DOCUMENT_DOWNLOAD_OFFLOAD`` set, only headers are produced for
+    files stored whole and the front proxy sends the bytes (and applies
+    ranges) itself.
+
+    The type is the one sniffed from the content, never the uploader's
+    filename, and markup that could run script is only sent as an
+    attachment.
+    """
+    filename = version.filename or os.path.basename(version.file.name)
+    content_type = version.content_type or OCTET_STREAM
+    if content_type in ACTIVE_CONTENT_TYPES:
+        as_attachment = True
+    offload = settings.DOCUMENT_DOWNLOAD_OFFLOAD
+
+    # Deltas are rebuilt and compressed files inflated here; only files
+    # stored as is can be handed off.
+    if (
+        offload in ("nginx", "apache")
+        and not version.delta_base_id
+        and not version_storage.is_compressed(version.file.name)
+    ):
+        response = HttpResponse(content_type=content_type)
+        if offload == "nginx":
+            prefix = settings.DOCUMENT_DOWNLOAD_ACCEL_PREFIX.rstrip("/")
+            response["X-Accel-Redirect"] = f"{prefix}/{quote(version.file.name)}"
+        else:
+            response["X-Sendfile"] = version.file.path
+    else:
+        file = open_version(version)
+        size = file.seek(0, os.SEEK_END)
+        file.seek(0)
+        try:
+            byte_range = None
+            if if_range_matches(request, etag, last_modified):
+                byte_range = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            file.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range is None:
+            response = FileResponse(file, content_type=content_type)
+        else:
+            start, end = byte_range
+            response = FileResponse(
+                RangeFile(file, start, end - start + 1),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Length"] = end - start + 1
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Accept-Ranges"] = "bytes"
+
+    response["X-Content-Type-Options"] = "nosniff"
+    response["Content-Disposition"] = content_disposition_header(
+        as_attachment, filename
+    )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "private, max-age=0"
+    return response
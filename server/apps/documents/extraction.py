@@ -0,0 +1,295 @@
+"""
+Text extraction from version files, for searching document content.
+
+Uploads queue ``extract_text``, which streams the file's text into
+``VersionTextChunk`` rows of about ``TEXT_CHUNK_CHARS`` characters. Plain
+text is decoded incrementally, Office Open XML and OpenDocument files are
+read part by part with ``iterparse``, and PDFs go through poppler's
+``pdftotext`` when it is installed. Without it only the text of simple
+PDFs (literal strings in Flate or unfiltered content streams) is found,
+reading the file in blocks and inflating at most ``PDF_STREAM_MAX_BYTES`` of
+each stream.
+"""
+
+import codecs
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import zipfile
+import zlib
+from xml.etree.ElementTree import ParseError, iterparse
+
+from apps.documents.deltas import local_path, open_version
+from apps.documents.models import DocumentVersion, VersionTextChunk
+from django.conf import settings
+from django.db import transaction
+
+TEXT_CHUNK_CHARS = 32 * 1024
+READ_SIZE = 64 * 1024
+SNIFF_BYTES = 8192
+PDF_EXTRACT_TIMEOUT = 300
+# Chunks inserted per query.
+CHUNK_BATCH = 50
+
+# XML elements that end a paragraph: w:p and a:p in Office Open XML, text:p
+# and text:h in OpenDocument, si (a shared string) in spreadsheets.
+PARAGRAPH_TAGS = {"p", "h", "si"}
+SLIDE_RE = re.compile(r"ppt/slides/slide(\d+)\.xml")
+
+# Most bytes kept of any one PDF stream, after inflating it.
+PDF_STREAM_MAX_BYTES = 8 * 1024 * 1024
+PDF_STREAM_START_RE = re.compile(rb"stream\r?\n")
+PDF_STREAM_END = b"endstream"
+PDF_TEXT_BLOCK_RE = re.compile(rb"\bBT\b(.*?)\bET\b", re.S)
+PDF_TEXT_TOKEN_RE = re.compile(
+    rb"\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)|T[Jj]|T\*|T[dDm]|'|\"", re.S
+)
+PDF_ESCAPE_RE = re.compile(rb"\\([0-7]{1,3}|\r\n|.)", re.S)
+PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+class TextUnavailable(Exception):
+    """
+    No text can be extracted from the version's file type here.
+    """
+
+
+def extract_text(version_id):
+    """
+    Replace the text chunks of version ``version_id`` with its file's text.
+    """
+    version = (
+        DocumentVersion.objects.only("file", "filename", "delta_base")
+        .filter(pk=version_id)
+        .first()
+    )
+    if version is None:
+        return
+    with transaction.atomic():
+        VersionTextChunk.objects.filter(version_id=version_id).delete()
+        batch = []
+        pieces = iter_text(version)
+        try:
+            chunks = chunk_text(pieces, settings.DOCUMENT_TEXT_MAX_CHARS)
+            for position, content in enumerate(chunks):
+                batch.append(
+                    VersionTextChunk(
+                        version_id=version_id, position=position, content=content
+                    )
+                )
+                if len(batch) >= CHUNK_BATCH:
+                    VersionTextChunk.objects.bulk_create(batch)
+                    batch = []
+        except TextUnavailable:
+            pass
+        finally:
+            # Stops a pdftotext process when the limit cut the text short.
+            pieces.close()
+        VersionTextChunk.objects.bulk_create(batch)
+        DocumentVersion.objects.filter(pk=version_id).update(text_extracted=True)
+
+
+def iter_text(version):
+    """
+    Yield the text of ``version``'s file in pieces.
+    """
+    with open_version(version) as f:
+        head = f.read(SNIFF_BYTES)
+        f.seek(0)
+        if head.startswith(b"%PDF-"):
+            yield from _pdf_text(version, f)
+        elif head.startswith(b"PK\x03\x04"):
+            yield from _office_text(f)
+        elif b"\x00" not in head:
+            yield from _plain_text(f, _text_encoding(head))
+        else:
+            raise TextUnavailable(f"Cannot extract text from {version.filename!r}.")
+
+
+def chunk_text(pieces, limit=None, size=TEXT_CHUNK_CHARS):
+    """
+    Regroup text ``pieces`` into chunks of at most ``size`` characters,
+    split at whitespace where possible, stopping after ``limit`` characters.
+    """
+    buffer = ""
+    remaining = limit
+    for piece in pieces:
+        # Postgres text cannot hold NUL.
+        piece = piece.replace("\x00", "")
+        if remaining is not None:
+            piece = piece[:remaining]
+            remaining -= len(piece)
+        buffer += piece
+        while len(buffer) >= size:
+            cut = max(buffer.rfind(" ", 0, size), buffer.rfind("\n", 0, size))
+            if cut < size // 2:
+                cut = size
+            chunk, buffer = buffer[:cut], buffer[cut:]
+            if chunk.strip():
+                yield chunk
+        if remaining == 0:
+            break
+    if buffer.strip():
+        yield buffer
+
+
+def _text_encoding(head):
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # A character cut off by the sniffing window is still UTF-8.
+        if exc.start < len(head) - 3:
+            return "cp1252"
+    return "utf-8"
+
+
+def _plain_text(f, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while chunk := f.read(READ_SIZE):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def _office_text(f):
+    try:
+        archive = zipfile.ZipFile(f)
+    except zipfile.BadZipFile:
+        raise TextUnavailable("Not a readable ZIP archive.")
+    with archive:
+        for part in _office_parts(archive.namelist()):
+            with archive.open(part) as xml:
+                try:
+                    for _, element in iterparse(xml):
+                        if element.tag.rpartition("}")[2] in PARAGRAPH_TAGS:
+                            text = "".join(element.itertext())
+                            if text:
+                                yield text + "\n"
+                            element.clear()
+                except ParseError:
+                    raise TextUnavailable(f"Malformed XML in {part}.")
+
+
+def _office_parts(names):
+    if "word/document.xml" in names:
+        return ["word/document.xml"]
+    slides = sorted(
+        (int(m[1]), name) for name in names if (m := SLIDE_RE.fullmatch(name))
+    )
+    if slides:
+        return [name for _, name in slides]
+    if "xl/sharedStrings.xml" in names:
+        return ["xl/sharedStrings.xml"]
+    if "content.xml" in names:
+        return ["content.xml"]
+    raise TextUnavailable("Not an Office or OpenDocument file.")
+
+
+def _pdf_text(version, f):
+    pdftotext = shutil.which("pdftotext")
+    if pdftotext is None:
+        yield from _pdf_text_builtin(f)
+        return
+    with tempfile.TemporaryDirectory() as workdir:
+        source = local_path(version, workdir)
+        process = subprocess.Popen(
+            [pdftotext, "-q", "-enc", "UTF-8", source, "-"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        timer = threading.Timer(PDF_EXTRACT_TIMEOUT, process.kill)
+        timer.start()
+        try:
+            yield from _plain_text(process.stdout, "utf-8")
+        finally:
+            timer.cancel()
+            process.kill()
+            process.stdout.close()
+            process.wait()
+
+
+def _pdf_text_builtin(f):
+    for stream in _pdf_streams(f):
+        for block in PDF_TEXT_BLOCK_RE.finditer(stream):
+            words = []
+            for token in PDF_TEXT_TOKEN_RE.findall(block[1]):
+                if token.startswith(b"("):
+                    words.append(_pdf_string(token[1:-1]))
+                elif token in (b"Td", b"TD", b"Tm"):
+                    words.append(" ")
+                elif token in (b"T*", b"'", b'"'):
+                    words.append("\n")
+            text = "".join(words).strip()
+            if text:
+                yield text + "\n"
+
+
+def _pdf_streams(f):
+    """
+    Yield the content of each stream of the PDF file ``f``, inflated when it
+    is Flate-compressed and cut off after ``PDF_STREAM_MAX_BYTES``. The file
+    is read in blocks, so neither it nor a stream is held whole.
+    """
+    # Long enough for "stream\r\n" or "endstream" split across two blocks.
+    overlap = len(PDF_STREAM_END) - 1
+    pending = b""
+    while True:
+        match = PDF_STREAM_START_RE.search(pending)
+        if match is None:
+            block = f.read(READ_SIZE)
+            if not block:
+                return
+            pending = pending[-overlap:] + block
+            continue
+        pending = pending[match.end() :]
+
+        decompressor = zlib.decompressobj()
+        raw = bytearray()
+        inflated = bytearray()
+        compressed = True
+        ended = False
+        while not ended:
+            end = pending.find(PDF_STREAM_END)
+            if end >= 0:
+                data, pending = pending[:end], pending[end + len(PDF_STREAM_END) :]
+                ended = True
+            else:
+                cut = max(len(pending) - overlap, 0)
+                data, pending = pending[:cut], pending[cut:]
+                block = f.read(READ_SIZE)
+                if block:
+                    pending += block
+                else:
+                    data, pending, ended = data + pending, b"", True
+            raw += data[: PDF_STREAM_MAX_BYTES - len(raw)]
+            # Output is capped so a small stream cannot inflate to gigabytes.
+            while (
+                compressed
+                and data
+                and not decompressor.eof
+                and len(inflated) < PDF_STREAM_MAX_BYTES
+            ):
+                try:
+                    inflated += decompressor.decompress(
+                        data, PDF_STREAM_MAX_BYTES - len(inflated)
+                    )
+                except zlib.error:
+                    compressed = False
+                data = decompressor.unconsumed_tail
+        yield bytes(inflated) if compressed else bytes(raw)
+
+
+def _pdf_string(raw):
+    def unescape(match):
+        escape = match[1]
+        if escape[:1].isdigit():
+            return bytes([int(escape, 8) & 0xFF])
+        if escape in (b"\n", b"\r", b"\r\n"):
+            return b""
+        return PDF_ESCAPES.get(escape, escape)
+
+    raw = PDF_ESCAPE_RE.sub(unescape, raw)
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", errors="replace")
+    return raw.decode("cp1252", errors="replace")
@@ -0,0 +1,126 @@
+import datetime
+import uuid
+
+from apps.documents.models import Document
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+# Fields a client may order the document list by. Each is non-null so keyset
+# pagination can seek on it; document_id is appended as the tiebreaker.
+ORDERING_FIELDS = ("created_at", "updated_at", "title", "status", "priority")
+DEFAULT_ORDERING = "-created_at"
+
+STATUSES = {value for value, _ in Document.document_status_choices}
+PRIORITIES = {value for value, _ in Document.document_priority_choices}
+
+USER_FILTERS = {
+    "assignee": "assigned_to",
+    "reviewer": "reviewer",
+    "creator": "created_by",
+}
+
+DATE_FILTERS = {
+    "created_after": "created_at__gte",
+    "created_before": "created_at__lt",
+    "updated_after": "updated_at__gte",
+    "updated_before": "updated_at__lt",
+}
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def filter_documents(queryset, params, user):
+    """
+    Narrow ``queryset`` by the list endpoint's query parameters.
+
+    Multi-valued filters take comma-separated values; ``tags`` matches any of
+    the given tags and ``tags_all`` all of them. User filters accept a user id
+    or ``me`` for the requesting user.
+    """
+    status = _split(params.get("status"))
+    if status:
+        _check_choices("status", status, STATUSES)
+        queryset = queryset.filter(status__in=status)
+
+    priority = _split(params.get("priority"))
+    if priority:
+        _check_choices("priority", priority, PRIORITIES)
+        queryset = queryset.filter(priority__in=priority)
+
+    document_type = _split(params.get("document_type"))
+    if document_type:
+        queryset = queryset.filter(document_type__in=document_type)
+
+    # Array operators the GIN index on tags can answer: && and @>.
+    tags = _split(params.get("tags"))
+    if tags:
+        queryset = queryset.filter(tags__overlap=tags)
+
+    tags_all = _split(params.get("tags_all"))
+    if tags_all:
+        queryset = queryset.filter(tags__contains=tags_all)
+
+    for param, field in USER_FILTERS.items():
+        value = params.get(param)
+        if value:
+            queryset = queryset.filter(**{f"{field}_id": _user_id(param, value, user)})
+
+    for param, lookup in DATE_FILTERS.items():
+        value = params.get(param)
+        if value:
+            queryset = queryset.filter(**{lookup: _datetime(param, value)})
+
+    return queryset
+
+
+def get_ordering(params):
+    """
+    Resolve the ``ordering`` parameter into a unique keyset ordering.
+    """
+    ordering = params.get("ordering") or DEFAULT_ORDERING
+    if ordering.lstrip("-") not in ORDERING_FIELDS:
+        raise InvalidFilter(
+            f"Invalid ordering. Choose from: {', '.join(ORDERING_FIELDS)}."
+        )
+    tiebreaker = "-document_id" if ordering.startswith("-") else "document_id"
+    return (ordering, tiebreaker)
+
+
+def _split(value):
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _check_choices(param, values, choices):
+    unknown = set(values) - choices
+    if unknown:
+        raise InvalidFilter(f"Invalid {param}: {', '.join(sorted(unknown))}.")
+
+
+def _user_id(param, value, user):
+    if value == "me":
+        if user is None:
+            raise InvalidFilter(f"Invalid {param}: 'me' needs an authenticated user.")
+        return user.pk
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise InvalidFilter(f"Invalid {param}: expected a user id or 'me'.")
+
+
+def _datetime(param, value):
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(value)
+            parsed = datetime.datetime.combine(day, datetime.time.min)
+    except ValueError:
+        raise InvalidFilter(f"Invalid {param}: expected an ISO 8601 date.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
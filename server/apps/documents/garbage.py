@@ -0,0 +1,127 @@
+"""
+Reconciliation of stored version files with the rows pointing at them.
+
+Files under ``documents/`` that no ``Blob`` and no ``DocumentVersion.file``
+names are orphans: left by crashes between writing a file and committing
+its row, by deletions from before files were reference counted, or by
+interrupted temporary writes. ``orphaned_files`` finds them with a
+streaming walk of the directory tree, checked against the database in
+batches, so memory use does not grow with the number of files.
+
+Resumable uploads leave part files under ``uploads/``. Sessions past their
+``expires_at`` are aborted, which removes their part files, and
+``orphaned_parts`` finds part files whose session row is gone.
+"""
+
+import os
+import time
+import uuid
+from itertools import islice
+from pathlib import PurePosixPath
+
+from apps.documents.models import Blob, DocumentVersion, UploadSession
+from apps.documents.storage import version_storage
+from django.utils import timezone
+
+# Files looked up per query.
+LOOKUP_BATCH = 1000
+# Directory the version FileField uploads to.
+VERSIONS_DIR = "documents"
+# Directory of the part files of resumable uploads.
+UPLOADS_DIR = "uploads"
+
+
+def walk_files(root, prefix):
+    """
+    Yield ``(name, stat)`` for every file below ``root/prefix``, ``name``
+    being relative to ``root`` with forward slashes.
+    """
+    stack = [prefix]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, directory))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                name = f"{directory}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(name)
+                elif entry.is_file(follow_symlinks=False):
+                    yield name, entry.stat(follow_symlinks=False)
+
+
+def _referenced(names):
+    referenced = set(Blob.objects.filter(name__in=names).values_list("name", flat=True))
+    referenced.update(
+        DocumentVersion.all_objects.filter(file__in=names).values_list(
+            "file", flat=True
+        )
+    )
+    return referenced
+
+
+def orphaned_files(grace):
+    """
+    Yield ``(name, size)`` for unreferenced version files last modified
+    more than ``grace`` seconds ago; younger ones may belong to an upload
+    that has not committed yet.
+    """
+    cutoff = time.time() - grace
+    files = (
+        (name, stat.st_size)
+        for name, stat in walk_files(version_storage.location, VERSIONS_DIR)
+        if stat.st_mtime < cutoff
+    )
+    while batch := list(islice(files, LOOKUP_BATCH)):
+        referenced = _referenced([name for name, _ in batch])
+        for name, size in batch:
+            if name not in referenced:
+                yield name, size
+
+
+def remove_orphan(name):
+    # Blob.purge locks the name and rechecks it, so a file an upload has
+    # just deduplicated to survives.
+    if not DocumentVersion.all_objects.filter(file=name).exists():
+        Blob.purge(name)
+
+
+def expired_sessions():
+    return UploadSession.objects.filter(expires_at__lt=timezone.now())
+
+
+def _session_id(name):
+    try:
+        return uuid.UUID(PurePosixPath(name).stem)
+    except ValueError:
+        return None
+
+
+def orphaned_parts(grace):
+    """
+    Yield ``(name, size)`` for part files under ``uploads/`` last modified
+    more than ``grace`` seconds ago that no upload session owns.
+    """
+    cutoff = time.time() - grace
+    files = (
+        (name, stat.st_size)
+        for name, stat in walk_files(version_storage.location, UPLOADS_DIR)
+        if stat.st_mtime < cutoff
+    )
+    while batch := list(islice(files, LOOKUP_BATCH)):
+        ids = {_session_id(name) for name, _ in batch} - {None}
+        live = set(
+            UploadSession.objects.filter(id__in=ids).values_list("id", flat=True)
+        )
+        for name, size in batch:
+            if _session_id(name) not in live:
+                yield name, size
+
+
+def remove_part(name):
+    try:
+        os.remove(version_storage.path(name))
+    except FileNotFoundError:
+        pass
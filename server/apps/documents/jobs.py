@@ -0,0 +1,328 @@
+"""
+Background jobs for work that should not hold up a request.
+
+A job is a call to a function, named ``module:qualified.name``, with
+JSON-serializable arguments::
+
+    enqueue(generate, version.pk)
+
+Jobs are kept in the ``documents_jobs`` table by default and claimed with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of ``run_jobs`` workers
+can share the queue. Set ``DOCUMENT_JOB_BACKEND = "redis"`` to keep them in
+Redis instead. Either way a job runs at least once: a failed job is retried
+with exponential backoff, and one whose worker died is taken over when its
+lease runs out, so tasks have to be idempotent.
+"""
+
+import json
+import logging
+import threading
+import time
+import traceback
+import uuid
+from functools import lru_cache
+from importlib import import_module
+
+import redis
+from apps.documents.models import Job
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between two attempts of a failing job, in seconds.
+MAX_RETRY_DELAY = 3600
+
+CLAIM_JOB_SQL = """
+UPDATE documents_jobs
+SET status = 'running',
+    attempts = attempts + 1,
+    run_at = statement_timestamp() + make_interval(secs => %s),
+    updated_at = now()
+WHERE id = (
+    SELECT id FROM documents_jobs
+    WHERE status IN ('queued', 'running') AND run_at <= statement_timestamp()
+    ORDER BY run_at
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, name, args, attempts, max_attempts
+"""
+
+RETRY_JOB_SQL = """
+UPDATE documents_jobs
+SET status = 'queued',
+    run_at = statement_timestamp() + make_interval(secs => %s),
+    last_error = %s,
+    updated_at = now()
+WHERE id = %s
+"""
+
+# Moves up to ARGV[2] members of the sorted set KEYS[1] scored at or below
+# ARGV[1] onto the ready list KEYS[2].
+PROMOTE_JOBS_LUA = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, item in ipairs(items) do
+    redis.call('ZREM', KEYS[1], item)
+    redis.call('LPUSH', KEYS[2], item)
+end
+return #items
+"""
+
+# Pops the oldest ready job and leases it until ARGV[1] in one step, so a
+# worker dying in between cannot lose it.
+CLAIM_JOB_LUA = """
+local item = redis.call('RPOP', KEYS[1])
+if not item then
+    return nil
+end
+local job = cjson.decode(item)
+job['attempts'] = job['attempts'] + 1
+item = cjson.encode(job)
+redis.call('ZADD', KEYS[2], ARGV[1], item)
+return item
+"""
+
+
+class ClaimedJob:
+    """
+    A job a worker has leased. ``token`` identifies it to its backend.
+    """
+
+    def __init__(self, token, name, args, attempts, max_attempts):
+        self.token = token
+        self.name = name
+        self.args = args
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+
+    def __repr__(self):
+        return f"<ClaimedJob {self.name}{tuple(self.args)} #{self.attempts}>"
+
+
+class DatabaseBackend:
+    """
+    Jobs as rows of ``documents_jobs``.
+
+    Enqueuing is part of the caller's transaction, so a job never sees data
+    that was rolled back and is never lost once that data is committed.
+    """
+
+    def enqueue(self, name, args, max_attempts):
+        Job.objects.create(name=name, args=args, max_attempts=max_attempts)
+
+    def claim(self):
+        with connection.cursor() as cursor:
+            cursor.execute(CLAIM_JOB_SQL, [settings.DOCUMENT_JOB_LEASE])
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        pk, name, args, attempts, max_attempts = row
+        # Django leaves decoding jsonb to JSONField, so raw SQL gets text.
+        return ClaimedJob(pk, name, json.loads(args), attempts, max_attempts)
+
+    def complete(self, job):
+        Job.objects.filter(pk=job.token).delete()
+
+    def retry(self, job, delay, error):
+        with connection.cursor() as cursor:
+            cursor.execute(RETRY_JOB_SQL, [delay, error, job.token])
+
+    def fail(self, job, error):
+        Job.objects.filter(pk=job.token).update(
+            status=Job.STATUS_FAILED, last_error=error
+        )
+
+
+class RedisBackend:
+    """
+    Jobs as JSON entries in Redis: a ready list, a sorted set of jobs
+    waiting for a retry, one of leased jobs scored by lease end, and a list
+    of jobs that used up their attempts.
+
+    Jobs are pushed once the caller's transaction commits.
+    """
+
+    def __init__(self, url, prefix="documents:jobs"):
+        self.redis = redis.Redis.from_url(url)
+        self.ready = f"{prefix}:ready"
+        self.delayed = f"{prefix}:delayed"
+        self.running = f"{prefix}:running"
+        self.failed = f"{prefix}:failed"
+        self._promote = self.redis.register_script(PROMOTE_JOBS_LUA)
+        self._claim = self.redis.register_script(CLAIM_JOB_LUA)
+
+    def enqueue(self, name, args, max_attempts):
+        item = json.dumps(
+            {
+                "id": uuid.uuid4().hex,
+                "name": name,
+                # Kept as a string: Lua's cjson turns [] into {}.
+                "args": json.dumps(args),
+                "attempts": 0,
+                "max_attempts": max_attempts,
+            }
+        )
+        transaction.on_commit(lambda: self.redis.lpush(self.ready, item))
+
+    def claim(self):
+        now = time.time()
+        for source in (self.delayed, self.running):
+            self._promote(keys=[source, self.ready], args=[now, 100])
+        item = self._claim(
+            keys=[self.ready, self.running],
+            args=[now + settings.DOCUMENT_JOB_LEASE],
+        )
+        if item is None:
+            return None
+        job = json.loads(item)
+        return ClaimedJob(
+            item,
+            job["name"],
+            json.loads(job["args"]),
+            job["attempts"],
+            job["max_attempts"],
+        )
+
+    def complete(self, job):
+        self.redis.zrem(self.running, job.token)
+
+    def retry(self, job, delay, error):
+        with self.redis.pipeline() as pipe:
+            pipe.zrem(self.running, job.token)
+            pipe.zadd(self.delayed, {job.token: time.time() + delay})
+            pipe.execute()
+
+    def fail(self, job, error):
+        item = json.loads(job.token)
+        item["error"] = error
+        with self.redis.pipeline() as pipe:
+            pipe.zrem(self.running, job.token)
+            pipe.lpush(self.failed, json.dumps(item))
+            pipe.execute()
+
+
+@lru_cache(maxsize=None)
+def _backend(name, redis_url):
+    if name == "db":
+        return DatabaseBackend()
+    if name == "redis":
+        return RedisBackend(redis_url)
+    raise ValueError(f"Unknown DOCUMENT_JOB_BACKEND {name!r}.")
+
+
+def get_backend():
+    return _backend(settings.DOCUMENT_JOB_BACKEND, settings.DOCUMENT_JOB_REDIS_URL)
+
+
+def job_name(func):
+    return f"{func.__module__}:{func.__qualname__}"
+
+
+def enqueue(func, *args, max_attempts=None):
+    """
+    Run ``func(*args)`` on a worker once the current transaction commits.
+    """
+    get_backend().enqueue(
+        job_name(func),
+        list(args),
+        max_attempts or settings.DOCUMENT_JOB_MAX_ATTEMPTS,
+    )
+
+
+def pending_ids(func):
+    """
+    First arguments of the calls to ``func`` queued or running in the
+    database queue. Jobs in the Redis queue are not looked at.
+    """
+    jobs = Job.objects.filter(name=job_name(func)).exclude(status=Job.STATUS_FAILED)
+    return {args[0] for args in jobs.values_list("args", flat=True) if args}
+
+
+def retry_delay(attempts):
+    """
+    Seconds to wait before retrying a job that has failed ``attempts`` times.
+    """
+    return min(settings.DOCUMENT_JOB_RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def resolve(name):
+    module, _, qualname = name.partition(":")
+    func = import_module(module)
+    for attr in qualname.split("."):
+        func = getattr(func, attr)
+    return func
+
+
+def run_job(backend, job):
+    try:
+        resolve(job.name)(*job.args)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            delay = retry_delay(job.attempts)
+            logger.warning("%r failed, retrying in %ss", job, delay, exc_info=True)
+            backend.retry(job, delay, error)
+        else:
+            logger.error("%r failed for good", job, exc_info=True)
+            backend.fail(job, error)
+        return False
+    backend.complete(job)
+    return True
+
+
+def run_pending(backend=None):
+    """
+    Run due jobs in this thread until there are none left. Returns how many
+    ran.
+    """
+    backend = backend or get_backend()
+    count = 0
+    while (job := backend.claim()) is not None:
+        run_job(backend, job)
+        count += 1
+    return count
+
+
+def work(concurrency=1, burst=False, poll_interval=1.0, stop=None):
+    """
+    Run jobs on ``concurrency`` threads until ``stop`` is set, or with
+    ``burst`` until the queue has no due jobs left.
+    """
+    stop = stop or threading.Event()
+    threads = [
+        threading.Thread(
+            target=_work_loop,
+            args=(stop, burst, poll_interval),
+            name=f"jobs-{i}",
+        )
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _work_loop(stop, burst, poll_interval):
+    backend = get_backend()
+    try:
+        while not stop.is_set():
+            try:
+                job = backend.claim()
+                if job is not None:
+                    run_job(backend, job)
+            except Exception:
+                # Usually a lost database or Redis connection; back off and
+                # let an expired lease hand the job to the next claim.
+                logger.exception("Job worker error")
+                connection.close()
+                stop.wait(poll_interval)
+                continue
+            connection.close_if_unusable_or_obsolete()
+            if job is None:
+                if burst:
+                    return
+                stop.wait(poll_interval)
+    finally:
+        connection.close()
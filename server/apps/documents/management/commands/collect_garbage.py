@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from apps.documents.garbage import (
+    expired_sessions,
+    orphaned_files,
+    orphaned_parts,
+    remove_orphan,
+    remove_part,
+)
+from apps.documents.jobs import enqueue, pending_ids
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.uploads import abort
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete version files no row refers to, found by walking the storage "
+        "directory, remove expired upload sessions and stray part files, and "
+        "queue purges again for deleted documents and versions still waiting "
+        "for theirs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Leave files and deletions younger than this alone.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list what would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        grace = timedelta(hours=options["grace_hours"])
+        dry_run = options["dry_run"]
+
+        cutoff = timezone.now() - grace
+        documents = Document.all_objects.filter(deleted_at__lt=cutoff)
+        versions = DocumentVersion.all_objects.filter(
+            deleted_at__lt=cutoff, document__deleted_at__isnull=True
+        )
+        purges = 0
+        if dry_run:
+            purges = documents.count() + versions.count()
+        else:
+            # Purges still in the queue are left to run rather than doubled.
+            queued = pending_ids(Document.purge)
+            for pk in documents.values_list("pk", flat=True).iterator():
+                if str(pk) not in queued:
+                    enqueue(Document.purge, str(pk))
+                    purges += 1
+            queued = pending_ids(DocumentVersion.purge)
+            for pk in versions.values_list("pk", flat=True).iterator():
+                if pk not in queued:
+                    enqueue(DocumentVersion.purge, pk)
+                    purges += 1
+
+        sessions = 0
+        for session in expired_sessions().iterator():
+            if dry_run:
+                self.stdout.write(session.part_name)
+            else:
+                abort(session)
+            sessions += 1
+
+        count = total = 0
+        for name, size in orphaned_files(grace.total_seconds()):
+            if dry_run:
+                self.stdout.write(name)
+            else:
+                remove_orphan(name)
+            count += 1
+            total += size
+        for name, size in orphaned_parts(grace.total_seconds()):
+            if dry_run:
+                self.stdout.write(name)
+            else:
+                remove_part(name)
+            count += 1
+            total += size
+
+        if dry_run:
+            summary = f"Would delete {count} orphaned files"
+        else:
+            summary = f"Deleted {count} orphaned files"
+        self.stdout.write(
+            f"{summary} ({total / 1024 / 1024:.1f} MB), {sessions} expired "
+            f"upload sessions; {purges} overdue purges queued again."
+        )
@@ -0,0 +1,129 @@
+import os
+import time
+
+from apps.documents.compression import (
+    CODECS,
+    HEADER,
+    SAMPLE_SIZE,
+    is_compressed_format,
+    worth_compressing,
+)
+from apps.documents.models import Blob
+from apps.documents.storage import version_storage
+from django.core.management.base import BaseCommand, CommandError
+
+MB = 1024 * 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure compression ratio and throughput of the storage codecs on "
+        "stored versions or on sample files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="Sample files or directories (default: stored version files).",
+        )
+        parser.add_argument(
+            "--codec",
+            action="append",
+            choices=sorted(CODECS),
+            help="Codec to measure. Repeatable (default: all).",
+        )
+        parser.add_argument(
+            "--level",
+            action="append",
+            type=int,
+            help="Compression level. Repeatable (default: the codec's default).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=200,
+            help="Most stored files to sample (default: 200).",
+        )
+
+    def handle(self, *args, **options):
+        samples = list(self.samples(options["paths"], options["limit"]))
+        if not samples:
+            raise CommandError("No sample files found.")
+        total = sum(len(data) for data in samples)
+        sniffed = [data for data in samples if is_compressed_format(data)]
+        self.stdout.write(
+            f"Sample: {len(samples)} files, {total / MB:.1f} MB; {len(sniffed)} "
+            f"({sum(map(len, sniffed)) / MB:.1f} MB) in compressed formats."
+        )
+        self.stdout.write(
+            f"{'codec':<6} {'level':>5} {'files':>6} {'ratio':>6} {'saved':>7} "
+            f"{'compress MB/s':>14} {'decompress MB/s':>16}"
+        )
+        for name in options["codec"] or sorted(CODECS):
+            for level in options["level"] or [CODECS[name].default_level]:
+                result = self.measure(name, level, samples)
+                compressed, stored, read, compress_time, decompress_time = result
+                self.stdout.write(
+                    f"{name:<6} {level:>5} {compressed:>6} {stored / total:>6.3f} "
+                    f"{100 * (1 - stored / total):>6.1f}% "
+                    f"{self.rate(read, compress_time):>14} "
+                    f"{self.rate(read, decompress_time):>16}"
+                )
+
+    def samples(self, paths, limit):
+        if not paths:
+            blobs = (
+                Blob.objects.filter(versions__delta_base__isnull=True)
+                .distinct()
+                .order_by("-created_at")
+                .values_list("name", flat=True)[:limit]
+            )
+            for name in blobs:
+                try:
+                    with version_storage.open(name) as f:
+                        yield f.read()
+                except FileNotFoundError:
+                    self.stderr.write(f"Skipping {name}: file is missing")
+            return
+        for path in paths:
+            if os.path.isdir(path):
+                files = (
+                    os.path.join(root, name)
+                    for root, _, names in os.walk(path)
+                    for name in sorted(names)
+                )
+            else:
+                files = [path]
+            for file in files:
+                with open(file, "rb") as f:
+                    yield f.read()
+
+    def measure(self, name, level, samples):
+        """
+        Store ``samples`` as the storage would with ``name`` at ``level``.
+        Throughput counts the files that were compressed.
+        """
+        codec = CODECS[name]
+        compressed = stored = read = compress_time = decompress_time = 0
+        for data in samples:
+            if not worth_compressing(data[:SAMPLE_SIZE], name, level):
+                stored += len(data)
+                continue
+            start = time.perf_counter()
+            compressor = codec.compressor(level)
+            output = compressor.compress(data) + compressor.flush()
+            compress_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            codec.decompressor().decompress(output)
+            decompress_time += time.perf_counter() - start
+
+            compressed += 1
+            stored += HEADER.size + len(output)
+            read += len(data)
+        return compressed, stored, read, compress_time, decompress_time
+
+    @staticmethod
+    def rate(size, seconds):
+        return f"{size / MB / seconds:.1f}" if seconds else "-"
@@ -0,0 +1,50 @@
+from pathlib import PurePosixPath
+
+from apps.documents.models import Blob, DocumentVersion
+from apps.documents.storage import version_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Move version files stored before deduplication into content-addressed "
+        "storage, keeping one copy of each distinct file."
+    )
+
+    def handle(self, *args, **options):
+        legacy = (
+            DocumentVersion.objects.filter(blob=None)
+            .exclude(file="")
+            .only("file", "filename")
+            .order_by("pk")
+        )
+        moved = duplicates = freed = 0
+        for version in legacy.iterator():
+            old = version.file.name
+            path = PurePosixPath(old)
+            try:
+                with version_storage.open(old) as content:
+                    size = content.size
+                    new = version_storage.save(
+                        str(path.parent / (version.filename or path.name)), content
+                    )
+            except FileNotFoundError:
+                self.stderr.write(f"Skipping version {version.pk}: {old} is missing")
+                continue
+
+            with transaction.atomic():
+                duplicate = Blob.objects.filter(name=new).exists()
+                Blob.acquire(new, size)
+                DocumentVersion.objects.filter(pk=version.pk).update(file=new, blob=new)
+            moved += 1
+            if old != new and not DocumentVersion.objects.filter(file=old).exists():
+                version_storage.delete(old)
+                if duplicate:
+                    duplicates += 1
+                    freed += size
+
+        self.stdout.write(
+            f"Moved {moved} files; {duplicates} were duplicates, "
+            f"freeing {freed} bytes."
+        )
@@ -0,0 +1,27 @@
+from apps.documents.models import DocumentVersion
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q, Sum
+
+
+class Command(BaseCommand):
+    help = "Report how much space storing versions as binary deltas saves."
+
+    def handle(self, *args, **options):
+        deltas = Q(delta_base__isnull=False)
+        totals = DocumentVersion.objects.aggregate(
+            versions=Count("pk"),
+            deltas=Count("pk", filter=deltas),
+            content=Sum("size", filter=deltas, default=0),
+            stored=Sum("blob__size", filter=deltas, default=0),
+        )
+        saved = totals["content"] - totals["stored"]
+        share = 100 * saved / totals["content"] if totals["content"] else 0
+
+        self.stdout.write(
+            f"{totals['deltas']} of {totals['versions']} versions are stored "
+            "as deltas."
+        )
+        self.stdout.write(
+            f"Their content is {totals['content']} bytes, stored in "
+            f"{totals['stored']} bytes: {saved} bytes ({share:.1f}%) saved."
+        )
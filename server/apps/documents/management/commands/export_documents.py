@@ -0,0 +1,44 @@
+from apps.documents.export import FORMATS, RESOURCES, export_rows, render
+from apps.documents.filters import InvalidFilter
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Stream document or version metadata as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resource", choices=RESOURCES, default="documents")
+        parser.add_argument(
+            "--format", dest="export_format", choices=FORMATS, default="ndjson"
+        )
+        parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="Document list filter, e.g. --filter status=pending. Repeatable.",
+        )
+
+    def handle(self, *args, **options):
+        params = {}
+        for item in options["filter"]:
+            name, sep, value = item.partition("=")
+            if not sep:
+                raise CommandError(f"Filters look like NAME=VALUE, got {item!r}.")
+            params[name] = value
+
+        try:
+            columns, rows = export_rows(options["resource"], params, None)
+        except InvalidFilter as exc:
+            raise CommandError(str(exc))
+        chunks = render(options["export_format"], columns, rows)
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="", encoding="utf-8") as out:
+            out.writelines(chunks)
+        self.stderr.write(f"Wrote {options['resource']} to {options['output']}")
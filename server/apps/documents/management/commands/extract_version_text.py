@@ -0,0 +1,37 @@
+from apps.documents.extraction import extract_text
+from apps.documents.jobs import enqueue
+from apps.documents.models import DocumentVersion
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue text extraction for versions uploaded before it existed, so "
+        "their file content becomes searchable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Extract every version again, not only those never extracted.",
+        )
+        parser.add_argument(
+            "--now",
+            action="store_true",
+            help="Extract in this process instead of queueing jobs.",
+        )
+
+    def handle(self, *args, **options):
+        versions = DocumentVersion.objects.exclude(file="")
+        if not options["all"]:
+            versions = versions.filter(text_extracted=False)
+        count = 0
+        for pk in versions.order_by("pk").values_list("pk", flat=True).iterator():
+            if options["now"]:
+                extract_text(pk)
+            else:
+                enqueue(extract_text, pk)
+            count += 1
+        action = "Extracted" if options["now"] else "Queued extraction for"
+        self.stdout.write(f"{action} {count} versions.")
@@ -0,0 +1,61 @@
+import signal
+import threading
+
+from apps.documents.jobs import work
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs: delta encoding, renditions and cleanup."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            "-c",
+            type=int,
+            default=settings.DOCUMENT_JOB_CONCURRENCY,
+            help="Jobs to run at once (default: DOCUMENT_JOB_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for more.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before looking again when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        stop = threading.Event()
+
+        def shut_down(signum, frame):
+            # Let running jobs finish; unfinished ones are retried elsewhere
+            # once their lease ends.
+            self.stderr.write("Stopping after the running jobs finish...")
+            stop.set()
+
+        handlers = {
+            signum: signal.signal(signum, shut_down)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        self.stderr.write(
+            f"Running {settings.DOCUMENT_JOB_BACKEND} jobs on "
+            f"{options['concurrency']} threads."
+        )
+        try:
+            work(
+                concurrency=options["concurrency"],
+                burst=options["burst"],
+                poll_interval=options["poll_interval"],
+                stop=stop,
+            )
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
@@ -0,0 +1,73 @@
+import multiprocessing
+
+from apps.documents.scrub import scrub_shard
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def _scrub_worker(shard, shards, rate, batch_size, restart):
+    # Each process opens its own database connection.
+    connections.close_all()
+    try:
+        return [
+            str(problem)
+            for problem in scrub_shard(shard, shards, rate, batch_size, restart)
+        ]
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Check stored version files against the size and checksum recorded "
+        "at upload and report missing or damaged ones. Resumes where an "
+        "interrupted run stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes checking disjoint shards of the versions in parallel.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=settings.DOCUMENT_SCRUB_RATE_MB,
+            help="Megabytes read per second, across all workers (0: no limit).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Versions checked between two checkpoints.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Start from the first version instead of the last checkpoint.",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(options["workers"], 1)
+        rate = options["rate"] * 1024 * 1024 / workers or None
+        jobs = [
+            (shard, workers, rate, options["batch_size"], options["restart"])
+            for shard in range(workers)
+        ]
+        if workers == 1:
+            results = [[str(problem) for problem in scrub_shard(*jobs[0])]]
+        else:
+            # Forked processes must not share the parent's connections.
+            connections.close_all()
+            with multiprocessing.get_context("fork").Pool(workers) as pool:
+                results = pool.starmap(_scrub_worker, jobs)
+
+        problems = [problem for result in results for problem in result]
+        for problem in problems:
+            self.stdout.write(problem)
+        if problems:
+            raise CommandError(f"{len(problems)} damaged or missing files.")
+        self.stdout.write(self.style.SUCCESS("All checked files are intact."))
@@ -0,0 +1,33 @@
+from apps.documents.jobs import enqueue
+from apps.documents.tiering import candidates, tier_blob, trim_cache
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Move version files of archived documents to cold storage, bring back "
+        "those active documents use again, and trim the hot cache. Meant to "
+        "run periodically, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--now",
+            action="store_true",
+            help="Move files in this process instead of queueing jobs.",
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        for name in candidates().iterator():
+            if options["now"]:
+                tier_blob(name)
+            else:
+                enqueue(tier_blob, name)
+            count += 1
+        if options["now"]:
+            dropped = trim_cache()
+            self.stdout.write(f"Tiered {count} files, dropped {dropped} cached copies.")
+        else:
+            enqueue(trim_cache)
+            self.stdout.write(f"Queued tiering for {count} files.")
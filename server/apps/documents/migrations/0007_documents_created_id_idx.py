@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0006_document_review_date_document_review_notes_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["-created_at", "-document_id"], name="documents_created_id_idx"
+            ),
+        ),
+    ]
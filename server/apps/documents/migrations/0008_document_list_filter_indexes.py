@@ -0,0 +1,59 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0007_documents_created_id_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["status", "-created_at", "-document_id"],
+                name="documents_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["reviewer", "status", "-created_at", "-document_id"],
+                name="documents_reviewer_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["assigned_to", "status", "-created_at", "-document_id"],
+                name="documents_assignee_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["created_by", "-created_at", "-document_id"],
+                name="documents_creator_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["reviewer", "-created_at", "-document_id"],
+                name="documents_pending_review_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                condition=models.Q(("status", "approved")),
+                fields=["assigned_to", "-created_at", "-document_id"],
+                name="documents_approved_assign_idx",
+            ),
+        ),
+    ]
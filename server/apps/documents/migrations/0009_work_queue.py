@@ -0,0 +1,118 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Same mapping as apps.documents.work_queue.required_actions.
+QUEUE_OWNERS = {
+    "pending": ("reviewer_id", "review"),
+    "approved": ("assigned_to_id", "sign"),
+    "rejected": ("created_by_id", "resubmit"),
+}
+
+
+def backfill_work_queue(apps, schema_editor):
+    Document = apps.get_model("documents", "Document")
+    WorkQueueItem = apps.get_model("documents", "WorkQueueItem")
+
+    batch = []
+    docs = Document.objects.filter(status__in=QUEUE_OWNERS).only(
+        "title", "priority", "status", "reviewer", "assigned_to", "created_by"
+    )
+    for doc in docs.iterator(chunk_size=2000):
+        owner, action = QUEUE_OWNERS[doc.status]
+        batch.append(
+            WorkQueueItem(
+                document_id=doc.pk,
+                user_id=getattr(doc, owner),
+                action=action,
+                title=doc.title,
+                priority=doc.priority,
+            )
+        )
+        if len(batch) >= 2000:
+            WorkQueueItem.objects.bulk_create(batch)
+            batch = []
+    WorkQueueItem.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0008_document_list_filter_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkQueueItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("review", "Review"),
+                            ("sign", "Sign"),
+                            ("resubmit", "Resubmit"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("title", models.CharField(max_length=128)),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("low", "Low"),
+                            ("medium", "Medium"),
+                            ("high", "High"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="work_queue_items",
+                        to="documents.document",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="work_queue",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "documents_work_queue",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-created_at", "-id"],
+                        name="work_queue_user_idx",
+                    ),
+                    models.Index(
+                        fields=["user", "action", "-created_at", "-id"],
+                        name="work_queue_user_action_idx",
+                    ),
+                ],
+                "unique_together": {("document", "user", "action")},
+            },
+        ),
+        migrations.RunPython(backfill_work_queue, migrations.RunPython.noop),
+    ]
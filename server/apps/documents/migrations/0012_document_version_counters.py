@@ -0,0 +1,57 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL = """
+UPDATE documents
+SET version_count = v.version_count,
+    last_version_number = v.last_version_number,
+    latest_version_id = (
+        SELECT id FROM documents_versions
+        WHERE document_id = documents.document_id
+        ORDER BY version_number DESC
+        LIMIT 1
+    )
+FROM (
+    SELECT document_id,
+           count(*) AS version_count,
+           max(version_number) AS last_version_number
+    FROM documents_versions
+    GROUP BY document_id
+) AS v
+WHERE documents.document_id = v.document_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0011_document_tags_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="last_version_number",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="latest_version",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="documents.documentversion",
+            ),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="version_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:40
+
+import apps.documents.storage
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Existing files keep their names; dedupe_versions moves them into
+# content-addressed storage.
+BACKFILL_FILENAMES = """
+UPDATE documents_versions SET filename = regexp_replace(file, '^.*/', '');
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0012_document_version_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Blob",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "name",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("sha256", models.CharField(db_index=True, max_length=64)),
+                ("size", models.PositiveBigIntegerField()),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "documents_blobs",
+            },
+        ),
+        migrations.AddField(
+            model_name="documentversion",
+            name="filename",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="documentversion",
+            name="file",
+            field=models.FileField(
+                storage=apps.documents.storage.ContentAddressedStorage(),
+                upload_to="documents/",
+            ),
+        ),
+        migrations.AddField(
+            model_name="documentversion",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="versions",
+                to="documents.blob",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_FILENAMES, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL_SIZES = """
+UPDATE documents_versions
+SET size = documents_blobs.size
+FROM documents_blobs
+WHERE documents_versions.blob_id = documents_blobs.name;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0014_upload_sessions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentversion",
+            name="delta_base",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="delta_children",
+                to="documents.documentversion",
+            ),
+        ),
+        migrations.AddField(
+            model_name="documentversion",
+            name="delta_depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="documentversion",
+            name="size",
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(BACKFILL_SIZES, migrations.RunSQL.noop),
+    ]
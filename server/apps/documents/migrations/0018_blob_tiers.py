@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0017_version_text"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blob",
+            name="accessed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="blob",
+            name="tier",
+            field=models.CharField(
+                choices=[("hot", "Hot"), ("cached", "Cold, cached"), ("cold", "Cold")],
+                default="hot",
+                max_length=6,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blob",
+            index=models.Index(
+                condition=models.Q(("tier", "cached")),
+                fields=["accessed_at"],
+                name="documents_blobs_cached_idx",
+            ),
+        ),
+    ]
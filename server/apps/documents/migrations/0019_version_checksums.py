@@ -0,0 +1,55 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:17
+
+from django.db import migrations, models
+
+# Content-addressed files are named after their content's SHA-256.
+BACKFILL_CHECKSUMS = """
+UPDATE documents_versions
+SET sha256 = documents_blobs.sha256
+FROM documents_blobs
+WHERE documents_versions.blob_id = documents_blobs.name
+AND documents_versions.delta_base_id IS NULL;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0018_blob_tiers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentversion",
+            name="sha256",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.CreateModel(
+            name="ScrubCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("shard", models.PositiveSmallIntegerField()),
+                ("shards", models.PositiveSmallIntegerField()),
+                ("last_version_id", models.BigIntegerField(default=0)),
+                ("checked", models.PositiveBigIntegerField(default=0)),
+                ("problems", models.PositiveIntegerField(default=0)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "documents_scrub_checkpoints",
+                "unique_together": {("shard", "shards")},
+            },
+        ),
+        migrations.RunSQL(BACKFILL_CHECKSUMS, migrations.RunSQL.noop),
+    ]
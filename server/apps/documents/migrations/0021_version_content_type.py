@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0020_soft_delete"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentversion",
+            name="content_type",
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:47
+
+import apps.documents.models.upload_session
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0021_version_content_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="uploadsession",
+            name="expires_at",
+            field=models.DateTimeField(
+                default=apps.documents.models.upload_session.session_expiry
+            ),
+        ),
+    ]
@@ -1,2 +1,8 @@
+from .blob import Blob
 from .document import Document
 from .document_version import DocumentVersion
+from .job import Job
+from .scrub_checkpoint import ScrubCheckpoint
+from .upload_session import UploadSession
+from .version_text_chunk import VersionTextChunk
+from .work_queue_item import WorkQueueItem
@@ -0,0 +1,110 @@
+from apps.core.models.base import BaseModel
+from apps.documents.storage import cold_storage, version_storage
+from django.db import connection, models, transaction
+
+# Serializes reference changes and file removal for one stored file, so a
+# purge can never delete content that a concurrent upload just reused.
+LOCK_BLOB_SQL = "SELECT pg_advisory_xact_lock(hashtext(%s))"
+
+ACQUIRE_BLOB_SQL = """
+INSERT INTO documents_blobs
+    (name, sha256, size, ref_count, tier, created_at, updated_at)
+VALUES (%s, %s, %s, 1, 'hot', now(), now())
+ON CONFLICT (name) DO UPDATE
+SET ref_count = documents_blobs.ref_count + 1, updated_at = now()
+"""
+
+RELEASE_BLOB_SQL = """
+UPDATE documents_blobs
+SET ref_count = ref_count - 1, updated_at = now()
+WHERE name = %s
+RETURNING ref_count
+"""
+
+
+class Blob(BaseModel):
+    """
+    A stored file, shared by every document version with the same content.
+
+    ``name`` is the content-addressed storage name and ``ref_count`` the
+    number of versions pointing at it. The file is deleted together with the
+    row once the last reference is released. ``tier`` tells where the file
+    is kept; see ``apps.documents.tiering``.
+    """
+
+    TIER_HOT = "hot"
+    TIER_CACHED = "cached"
+    TIER_COLD = "cold"
+
+    tier_choices = (
+        (TIER_HOT, "Hot"),
+        (TIER_CACHED, "Cold, cached"),
+        (TIER_COLD, "Cold"),
+    )
+
+    name = models.CharField(max_length=255, primary_key=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    tier = models.CharField(max_length=6, choices=tier_choices, default=TIER_HOT)
+    # When a cached file was last brought back from cold storage.
+    accessed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = "documents_blobs"
+        indexes = [
+            models.Index(
+                fields=["accessed_at"],
+                condition=models.Q(tier="cached"),
+                name="documents_blobs_cached_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+    @staticmethod
+    def acquire(name, size):
+        """
+        Count one more reference to the stored file ``name``.
+
+        Run it in the transaction that saves the referencing row. The lock it
+        takes lasts until commit, so callers can then check the file is still
+        in storage without racing a purge.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(LOCK_BLOB_SQL, [name])
+            cursor.execute(ACQUIRE_BLOB_SQL, [name, version_storage.digest(name), size])
+
+    @staticmethod
+    def release(name):
+        """
+        Drop one reference to ``name``, queueing the file for deletion when
+        it was the last.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(LOCK_BLOB_SQL, [name])
+            cursor.execute(RELEASE_BLOB_SQL, [name])
+            row = cursor.fetchone()
+            if row is None or row[0] > 0:
+                return
+            cursor.execute(
+                "DELETE FROM documents_blobs WHERE name = %s AND ref_count = 0",
+                [name],
+            )
+        from apps.documents.jobs import enqueue
+
+        enqueue(Blob.purge, name)
+
+    @staticmethod
+    def purge(name):
+        """
+        Delete the file ``name``, from every tier, unless a new reference
+        appeared meanwhile.
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(LOCK_BLOB_SQL, [name])
+            if not Blob.objects.filter(name=name).exists():
+                version_storage.delete(name)
+                cold_storage().delete(name)
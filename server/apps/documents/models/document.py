@@ -2,8 +2,28 @@ import uuid
 
 from apps.core.models.base import BaseModel
 from apps.user.models.user import User
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+
+from .blob import Blob
+
+VERSION_FIELDS = ("latest_version", "version_count", "last_version_number")
+
+# Versions a purge job deletes before queueing the next one.
+PURGE_BATCH = 100
+
+
+class DocumentManager(models.Manager):
+    """
+    Documents that have not been deleted. ``Document.all_objects`` also
+    returns those still waiting for their purge.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Document(BaseModel):
@@ -29,16 +49,16 @@ class Document(BaseModel):
         (STATUS_SIGNED, "SIGNED"),
         (STATUS_ARCHIVED, "ARCHIVED"),
     )
-    
+
     PRIORITY_LOW = "low"
     PRIORITY_MEDIUM = "medium"
     PRIORITY_HIGH = "high"
-    
+
     document_priority_choices = (
         (PRIORITY_LOW, "Low"),
         (PRIORITY_MEDIUM, "Medium"),
         (PRIORITY_HIGH, "High"),
-    )  
+    )
 
     status = models.CharField(
         choices=document_status_choices, default=STATUS_PENDING, max_length=20
@@ -54,9 +74,132 @@ class Document(BaseModel):
     document_type = models.CharField(max_length=50, blank=True, null=True)
     review_notes = models.TextField(blank=True, null=True)
     review_date = models.DateTimeField(blank=True, null=True)
-    
+    # Weighted title/tags/description/review notes, kept current by the
+    # documents_search_vector trigger (see migration 0010).
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Maintained by DocumentVersion with atomic UPDATEs: the highest numbered
+    # version, how many versions exist and the last number handed out.
+    latest_version = models.ForeignKey(
+        "DocumentVersion",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    version_count = models.PositiveIntegerField(default=0, editable=False)
+    last_version_number = models.PositiveIntegerField(default=0, editable=False)
+    # Set by soft_delete(); the row and its files go once Document.purge runs.
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = DocumentManager()
+    all_objects = models.Manager()
+
     class Meta:
         db_table = "documents"
+        indexes = [
+            # Backs keyset pagination of the document list.
+            models.Index(
+                fields=["-created_at", "-document_id"],
+                name="documents_created_id_idx",
+            ),
+            # Filtered list views, each with the list's keyset ordering.
+            models.Index(
+                fields=["status", "-created_at", "-document_id"],
+                name="documents_status_created_idx",
+            ),
+            models.Index(
+                fields=["reviewer", "status", "-created_at", "-document_id"],
+                name="documents_reviewer_status_idx",
+            ),
+            models.Index(
+                fields=["assigned_to", "status", "-created_at", "-document_id"],
+                name="documents_assignee_status_idx",
+            ),
+            models.Index(
+                fields=["created_by", "-created_at", "-document_id"],
+                name="documents_creator_created_idx",
+            ),
+            # Inboxes: small partial indexes covering only actionable rows.
+            models.Index(
+                fields=["reviewer", "-created_at", "-document_id"],
+                condition=models.Q(status="pending"),
+                name="documents_pending_review_idx",
+            ),
+            models.Index(
+                fields=["assigned_to", "-created_at", "-document_id"],
+                condition=models.Q(status="approved"),
+                name="documents_approved_assign_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="documents_search_idx"),
+            GinIndex(fields=["tags"], name="documents_tags_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} (ID: {self.document_id})"
+
+    def delete(self, *args, **kwargs):
+        from apps.documents.jobs import enqueue
+        from apps.documents.renditions import delete_renditions
+
+        # Versions are deleted along with the document; release their files
+        # and renditions.
+        with transaction.atomic():
+            versions = list(
+                self.versions(manager="all_objects").values_list("pk", "blob_id")
+            )
+            result = super().delete(*args, **kwargs)
+            for pk, blob in versions:
+                if blob:
+                    Blob.release(blob)
+                enqueue(delete_renditions, pk)
+        return result
+
+    def soft_delete(self):
+        """
+        Hide the document and its versions at once and queue the deletion
+        of the rows and files.
+        """
+        from apps.documents.jobs import enqueue
+        from apps.documents.work_queue import sync_work_queue
+
+        with transaction.atomic():
+            self.deleted_at = timezone.now()
+            Document.all_objects.filter(pk=self.pk).update(deleted_at=self.deleted_at)
+            sync_work_queue(self)
+            enqueue(Document.purge, str(self.pk))
+
+    @staticmethod
+    def purge(document_id):
+        """
+        Delete a soft-deleted document: its versions ``PURGE_BATCH`` at a
+        time, newest first so no delta has to be rebuilt, then the row.
+        """
+        from apps.documents.jobs import enqueue
+
+        doc = Document.all_objects.filter(
+            pk=document_id, deleted_at__isnull=False
+        ).first()
+        if doc is None:
+            return
+        versions = doc.versions(manager="all_objects").order_by("-version_number")
+        batch = list(versions[:PURGE_BATCH])
+        for version in batch:
+            version.delete()
+        if len(batch) == PURGE_BATCH:
+            enqueue(Document.purge, document_id)
+        else:
+            doc.delete()
+
+    def save(self, *args, **kwargs):
+        # A stale instance must not write back counters that uploads moved
+        # on, nor bring back a document soft-deleted since it was loaded.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in VERSION_FIELDS
+                and field.name != "deleted_at"
+            ]
+        super().save(*args, **kwargs)
@@ -1,19 +1,110 @@
+from pathlib import Path
+
 from apps.core.models.base import BaseModel
+from apps.documents.sniffing import sniff_file
+from apps.documents.storage import version_storage
 from apps.user.models.user import User
-from django.db import models
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
 
+from .blob import Blob
 from .document import Document
 
+# Hands out the next version number. The row lock taken by the UPDATE
+# serializes concurrent uploads to one document until their transaction ends.
+ALLOCATE_VERSION_SQL = """
+UPDATE documents
+SET last_version_number = last_version_number + 1
+WHERE document_id = %s
+RETURNING last_version_number
+"""
+
+VERSION_ADDED_SQL = """
+UPDATE documents
+SET version_count = version_count + 1,
+    latest_version_id = CASE
+        WHEN %s >= last_version_number THEN %s ELSE latest_version_id
+    END,
+    last_version_number = GREATEST(last_version_number, %s),
+    updated_at = now()
+WHERE document_id = %s
+RETURNING latest_version_id, version_count, last_version_number
+"""
+
+VERSION_REMOVED_SQL = """
+UPDATE documents
+SET version_count = version_count - 1,
+    latest_version_id = (
+        SELECT id FROM documents_versions
+        WHERE document_id = documents.document_id AND deleted_at IS NULL
+        ORDER BY version_number DESC
+        LIMIT 1
+    ),
+    updated_at = now()
+WHERE document_id = %s
+RETURNING latest_version_id, version_count, last_version_number
+"""
+
+
+class DocumentVersionManager(models.Manager):
+    """
+    Versions that have not been deleted, of documents that have not been
+    deleted. ``DocumentVersion.all_objects`` returns every row.
+    """
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .filter(deleted_at__isnull=True, document__deleted_at__isnull=True)
+        )
+
 
 class DocumentVersion(BaseModel):
     document = models.ForeignKey(
         Document, on_delete=models.CASCADE, related_name="versions"
     )
     version_number = models.PositiveIntegerField()
-    file = models.FileField(upload_to="documents/")
+    file = models.FileField(upload_to="documents/", storage=version_storage)
+    # Name the file was uploaded under; stored files are named by content.
+    filename = models.CharField(max_length=255, blank=True)
+    blob = models.ForeignKey(
+        Blob,
+        on_delete=models.PROTECT,
+        related_name="versions",
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    # Bytes and SHA-256 of the version's content, however it is stored,
+    # recorded at upload so `manage.py scrub` can tell when a file rots.
+    size = models.PositiveBigIntegerField(blank=True, null=True, editable=False)
+    sha256 = models.CharField(max_length=64, blank=True, editable=False)
+    # MIME type sniffed from the content's first bytes.
+    content_type = models.CharField(max_length=100, blank=True, editable=False)
+    # Set when ``file`` holds a binary delta against another version instead
+    # of the content; ``delta_depth`` counts the deltas back to a full copy.
+    delta_base = models.ForeignKey(
+        "self",
+        on_delete=models.RESTRICT,
+        related_name="delta_children",
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    delta_depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Whether the file's text has been extracted into VersionTextChunk rows.
+    text_extracted = models.BooleanField(default=False, editable=False)
     created_by = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="created_versions"
     )
+    # Set by soft_delete(); the row and file go once DocumentVersion.purge
+    # runs.
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = DocumentVersionManager()
+    all_objects = models.Manager()
 
     class Meta:
         db_table = "documents_versions"
@@ -23,13 +114,117 @@ class DocumentVersion(BaseModel):
         return f"{self.document.title} - v{self.version_number}"
 
     def save(self, *args, **kwargs):
-        if not self.version_number:
-            last_version = (
-                DocumentVersion.objects.filter(document=self.document)
-                .order_by("-version_number")
-                .first()
+        adding = self._state.adding
+        content = None
+        if self.file and not self.file._committed:
+            # Hash and write the upload before taking the document row lock,
+            # so concurrent uploads only queue behind the short UPDATE/INSERT.
+            content = self.file.file
+            self.filename = self.filename or Path(self.file.name).name
+            # Sniffed already when it came through StreamingUploadHandler.
+            self.content_type = getattr(content, "detected_type", None) or sniff_file(
+                content
             )
-            self.version_number = (
-                (last_version.version_number + 1) if last_version else 1
+            self.file.save(self.filename, content, save=False)
+            self.blob_id = self.file.name
+            self.size = content.size
+            self.sha256 = version_storage.digest(self.file.name)
+        with transaction.atomic():
+            if not self.version_number:
+                self.version_number = self._execute(
+                    ALLOCATE_VERSION_SQL, [self.document_id]
+                )[0]
+            if content is not None:
+                Blob.acquire(self.blob_id, content.size)
+                if not self.file.storage.exists(self.blob_id):
+                    # A purge removed the copy this upload was deduplicated to.
+                    self.file.save(self.filename, content, save=False)
+            super().save(*args, **kwargs)
+            if adding:
+                self._update_document(
+                    VERSION_ADDED_SQL,
+                    [
+                        self.version_number,
+                        self.pk,
+                        self.version_number,
+                        self.document_id,
+                    ],
+                )
+                from apps.documents.deltas import encode_version
+                from apps.documents.extraction import extract_text
+                from apps.documents.jobs import enqueue
+                from apps.documents.renditions import generate
+
+                if settings.DOCUMENT_DELTA_ENCODING:
+                    enqueue(encode_version, self.pk)
+                enqueue(generate, self.pk)
+                enqueue(extract_text, self.pk)
+
+    def delete(self, *args, **kwargs):
+        from apps.documents.deltas import materialize
+        from apps.documents.jobs import enqueue
+        from apps.documents.renditions import delete_renditions
+
+        pk = self.pk
+        with transaction.atomic():
+            # Versions stored as deltas against this one need a full copy.
+            for child in self.delta_children(manager="all_objects").all():
+                materialize(child)
+            result = super().delete(*args, **kwargs)
+            if not result[1].get(self._meta.label):
+                # A stale instance, or a purge that ran twice: whoever deleted
+                # the row released its file.
+                return result
+            if self.deleted_at is None:
+                # Otherwise soft_delete() already took it off the counters.
+                self._update_document(VERSION_REMOVED_SQL, [self.document_id])
+            if self.blob_id:
+                Blob.release(self.blob_id)
+            enqueue(delete_renditions, pk)
+        return result
+
+    def soft_delete(self):
+        """
+        Hide the version at once and queue the deletion of the row and file.
+        """
+        from apps.documents.jobs import enqueue
+
+        with transaction.atomic():
+            self.deleted_at = timezone.now()
+            DocumentVersion.all_objects.filter(pk=self.pk).update(
+                deleted_at=self.deleted_at
             )
-        super().save(*args, **kwargs)
+            self._update_document(VERSION_REMOVED_SQL, [self.document_id])
+            enqueue(DocumentVersion.purge, self.pk)
+
+    @staticmethod
+    def purge(pk):
+        """
+        Delete the soft-deleted version ``pk`` and release its file.
+        """
+        with transaction.atomic():
+            # Locked so a second run of the job waits and then finds no row.
+            version = (
+                DocumentVersion.all_objects.select_for_update()
+                .filter(pk=pk, deleted_at__isnull=False)
+                .first()
+            )
+            if version is not None:
+                version.delete()
+
+    def _update_document(self, sql, params):
+        # Keep the caller's Document instance in step with the row.
+        row = self._execute(sql, params)
+        if row and self._meta.get_field("document").is_cached(self):
+            document = self.document
+            (
+                document.latest_version_id,
+                document.version_count,
+                document.last_version_number,
+            ) = row
+
+    @staticmethod
+    def _execute(sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()
@@ -0,0 +1,47 @@
+from apps.core.models.base import BaseModel
+from django.db import models
+from django.utils import timezone
+
+
+class Job(BaseModel):
+    """
+    A call to a background task waiting in the database queue.
+
+    ``name`` is the dotted path of the task and ``args`` its JSON arguments.
+    While a worker runs the job ``run_at`` is the end of its lease, after
+    which another worker may take it over. Finished jobs are deleted; jobs
+    that used up their attempts stay behind as ``failed``.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_FAILED = "failed"
+
+    status_choices = (
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    status = models.CharField(
+        choices=status_choices, max_length=20, default=STATUS_QUEUED
+    )
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField()
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = "documents_jobs"
+        indexes = [
+            models.Index(
+                fields=["run_at"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="documents_jobs_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name}{tuple(self.args)} ({self.status})"
@@ -0,0 +1,26 @@
+from apps.core.models.base import BaseModel
+from django.db import models
+
+
+class ScrubCheckpoint(BaseModel):
+    """
+    How far one worker of ``manage.py scrub`` got: it checks the versions
+    whose id is ``shard`` modulo ``shards``, in id order, up to
+    ``last_version_id``. A run that is interrupted resumes from there; one
+    that reached the end sets ``finished_at`` and the next starts over.
+    """
+
+    shard = models.PositiveSmallIntegerField()
+    shards = models.PositiveSmallIntegerField()
+    last_version_id = models.BigIntegerField(default=0)
+    checked = models.PositiveBigIntegerField(default=0)
+    problems = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = "documents_scrub_checkpoints"
+        unique_together = ("shard", "shards")
+
+    def __str__(self):
+        return f"Scrub {self.shard}/{self.shards} at version {self.last_version_id}"
@@ -0,0 +1,52 @@
+import uuid
+from datetime import timedelta
+
+from apps.core.models.base import BaseModel
+from apps.user.models.user import User
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .document import Document
+
+
+def session_expiry():
+    return timezone.now() + timedelta(hours=settings.DOCUMENT_UPLOAD_SESSION_HOURS)
+
+
+class UploadSession(BaseModel):
+    """
+    A resumable upload of one file that becomes a new document version.
+
+    Chunks are appended straight into the part file at ``part_name`` (a
+    storage name) and ``offset`` counts the bytes received so far. Finalizing
+    moves the part file into version storage without copying it. Each
+    chunk pushes ``expires_at`` back; expired sessions are removed by
+    ``manage.py collect_garbage``.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    document = models.ForeignKey(
+        Document, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    expires_at = models.DateTimeField(default=session_expiry)
+
+    class Meta:
+        db_table = "documents_upload_sessions"
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def part_name(self):
+        return f"uploads/{self.id}.part"
+
+    @property
+    def complete(self):
+        return self.offset == self.size
@@ -0,0 +1,37 @@
+from apps.core.models.base import BaseModel
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+
+from .document_version import DocumentVersion
+
+
+class VersionTextChunk(BaseModel):
+    """
+    A piece of the text extracted from a version's file.
+
+    Long texts are split so no single ``tsvector`` hits Postgres' size limit
+    and extraction never holds a whole file's text in memory.
+    """
+
+    version = models.ForeignKey(
+        DocumentVersion, on_delete=models.CASCADE, related_name="text_chunks"
+    )
+    position = models.PositiveIntegerField()
+    content = models.TextField()
+    # Keep the configuration in sync with apps.documents.search.SEARCH_CONFIG.
+    search_vector = models.GeneratedField(
+        expression=SearchVector("content", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        db_table = "documents_version_text"
+        unique_together = ("version", "position")
+        indexes = [
+            GinIndex(fields=["search_vector"], name="documents_version_text_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.version} text #{self.position}"
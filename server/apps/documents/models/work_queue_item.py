@@ -0,0 +1,51 @@
+from apps.core.models.base import BaseModel
+from apps.user.models.user import User
+from django.db import models
+
+from .document import Document
+
+
+class WorkQueueItem(BaseModel):
+    """
+    One action a user still has to take on a document.
+
+    Rows are derived from document state by ``apps.documents.work_queue`` and
+    carry copies of the fields the inbox shows, so reading a queue never
+    touches the documents table.
+    """
+
+    ACTION_REVIEW = "review"
+    ACTION_SIGN = "sign"
+    ACTION_RESUBMIT = "resubmit"
+
+    action_choices = (
+        (ACTION_REVIEW, "Review"),
+        (ACTION_SIGN, "Sign"),
+        (ACTION_RESUBMIT, "Resubmit"),
+    )
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="work_queue")
+    document = models.ForeignKey(
+        Document, on_delete=models.CASCADE, related_name="work_queue_items"
+    )
+    action = models.CharField(choices=action_choices, max_length=20)
+    title = models.CharField(max_length=128)
+    priority = models.CharField(
+        choices=Document.document_priority_choices, max_length=20
+    )
+
+    class Meta:
+        db_table = "documents_work_queue"
+        unique_together = ("document", "user", "action")
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="work_queue_user_idx"
+            ),
+            models.Index(
+                fields=["user", "action", "-created_at", "-id"],
+                name="work_queue_user_action_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.action} {self.title}"
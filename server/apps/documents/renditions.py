@@ -0,0 +1,128 @@
+"""
+Thumbnails and first-page previews of document versions.
+
+Renditions are JPEGs stored in the default storage under
+``renditions/<version id>/<size>.jpg``. Uploads queue a job to render them;
+a rendition that is missing when requested is rendered on the spot. Images
+are rendered with Pillow and PDFs with poppler's ``pdftoppm`` when it is
+installed.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from io import BytesIO
+
+from apps.documents.deltas import local_path, open_version
+from apps.documents.models import DocumentVersion
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Longest edge in pixels for each rendition.
+RENDITION_SIZES = {"thumbnail": 256, "preview": 1024}
+
+JPEG_QUALITY = 85
+PDF_RENDER_TIMEOUT = 60
+
+
+class RenditionUnavailable(Exception):
+    """
+    The version's file type cannot be rendered here.
+    """
+
+
+def rendition_name(version_id, size):
+    return f"renditions/{version_id}/{size}.jpg"
+
+
+def render(version, size):
+    """
+    JPEG bytes of ``version`` scaled to fit a ``size`` rendition.
+    """
+    edge = RENDITION_SIZES[size]
+    with open_version(version) as content:
+        if content.read(5) == b"%PDF-":
+            image = _render_pdf_page(version, edge)
+        else:
+            content.seek(0)
+            try:
+                image = Image.open(content)
+                # Lets JPEG decode straight at a reduced scale.
+                image.draft("RGB", (edge, edge))
+                image.load()
+            except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+                raise RenditionUnavailable(f"Cannot render {version.filename!r}.")
+
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((edge, edge))
+    if image.mode != "RGB":
+        rgba = image.convert("RGBA")
+        image = Image.new("RGB", image.size, "white")
+        image.paste(rgba, mask=rgba.getchannel("A"))
+    out = BytesIO()
+    image.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    return out.getvalue()
+
+
+def generate(version_id, sizes=tuple(RENDITION_SIZES)):
+    """
+    Render and store the missing ``sizes`` of version ``version_id``, if its
+    file type can be rendered.
+    """
+    version = (
+        DocumentVersion.objects.only("file", "filename", "delta_base")
+        .filter(pk=version_id)
+        .first()
+    )
+    if version is None:
+        return
+    for size in sizes:
+        name = rendition_name(version_id, size)
+        if default_storage.exists(name):
+            continue
+        try:
+            data = render(version, size)
+        except RenditionUnavailable:
+            return
+        default_storage.save(name, ContentFile(data))
+
+
+def ensure_rendition(version, size):
+    """
+    Storage name of ``version``'s ``size`` rendition, rendering it if missing.
+    """
+    name = rendition_name(version.pk, size)
+    if not default_storage.exists(name):
+        data = render(version, size)
+        if not default_storage.exists(name):
+            default_storage.save(name, ContentFile(data))
+    return name
+
+
+def delete_renditions(version_id):
+    for size in RENDITION_SIZES:
+        default_storage.delete(rendition_name(version_id, size))
+
+
+def _render_pdf_page(version, edge):
+    pdftoppm = shutil.which("pdftoppm")
+    if pdftoppm is None:
+        raise RenditionUnavailable("PDF previews need poppler's pdftoppm.")
+    with tempfile.TemporaryDirectory() as workdir:
+        source = local_path(version, workdir)
+        output = os.path.join(workdir, "page")
+        try:
+            subprocess.run(
+                [pdftoppm, "-f", "1", "-l", "1", "-singlefile", "-png"]
+                + ["-scale-to", str(edge), source, output],
+                check=True,
+                capture_output=True,
+                timeout=PDF_RENDER_TIMEOUT,
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            raise RenditionUnavailable(f"Cannot render {version.filename!r}.")
+        with Image.open(f"{output}.png") as page:
+            page.load()
+            return page.copy()
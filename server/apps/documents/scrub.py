@@ -0,0 +1,185 @@
+"""
+Integrity checks of stored version files.
+
+``scrub_shard`` rereads the files of one shard of the versions and compares
+them with the size and SHA-256 recorded at upload. Versions stored as
+deltas are checked against their delta file's content address instead, so
+no chain is rebuilt. Files are read from whichever tier holds them without
+bringing cold ones back, at no more than ``rate`` bytes per second, and
+dropped from the page cache once read, so a scrub competes with requests as
+little as possible. Progress is saved in ``ScrubCheckpoint`` after every
+batch.
+"""
+
+import hashlib
+import logging
+import os
+import time
+
+from apps.documents.compression import DecompressingFile, read_header
+from apps.documents.models import DocumentVersion, ScrubCheckpoint
+from apps.documents.storage import cold_storage, version_storage
+from django.db.models import F
+from django.db.models.functions import Mod
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 1024 * 1024
+
+MISSING = "missing"
+SIZE_MISMATCH = "size mismatch"
+CHECKSUM_MISMATCH = "checksum mismatch"
+UNREADABLE = "unreadable"
+
+
+class Problem:
+    def __init__(self, version, kind, detail=""):
+        self.version_id = version.pk
+        self.document_id = version.document_id
+        self.name = version.file.name
+        self.kind = kind
+        self.detail = detail
+
+    def __str__(self):
+        text = f"version {self.version_id} of {self.document_id} ({self.name}): "
+        return text + (f"{self.kind}, {self.detail}" if self.detail else self.kind)
+
+
+class Throttle:
+    """
+    Sleeps as needed to keep the bytes passed to ``consume()`` under
+    ``rate`` per second, on average since it was created.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.start = time.monotonic()
+        self.consumed = 0
+
+    def consume(self, size):
+        self.consumed += size
+        if self.rate:
+            ahead = self.consumed / self.rate - (time.monotonic() - self.start)
+            if ahead > 0:
+                time.sleep(ahead)
+
+
+def _open_stored(name):
+    """
+    ``(raw, content)`` file objects for the stored file ``name``, from the
+    hot volume or else from cold storage.
+    """
+    try:
+        raw = open(version_storage.path(name), "rb")
+    except FileNotFoundError:
+        raw = cold_storage().open(name, "rb")
+    header = read_header(raw)
+    if header is None:
+        return raw, raw
+    return raw, DecompressingFile(raw, *header)
+
+
+def _drop_from_page_cache(raw):
+    try:
+        os.posix_fadvise(raw.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except (AttributeError, OSError):
+        pass
+
+
+def measure(name, throttle):
+    """
+    ``(size, sha256)`` of the content of the stored file ``name``.
+    """
+    raw, content = _open_stored(name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        while chunk := content.read(READ_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+            throttle.consume(len(chunk))
+    finally:
+        _drop_from_page_cache(raw)
+        content.close()
+        raw.close()
+    return size, digest.hexdigest()
+
+
+def check_version(version, throttle):
+    """
+    The Problem with ``version``'s file, or None.
+
+    A version uploaded before checksums were recorded gets them recorded
+    now, to be checked by the next scrub.
+    """
+    name = version.file.name
+    if version.delta_base_id:
+        expected = (version.blob.size, version_storage.digest(name))
+    else:
+        expected = (version.size, version.sha256)
+    try:
+        size, sha256 = measure(name, throttle)
+    except FileNotFoundError:
+        return Problem(version, MISSING)
+    except (OSError, EOFError, ValueError) as exc:
+        return Problem(version, UNREADABLE, str(exc))
+
+    if not expected[1]:
+        DocumentVersion.objects.filter(pk=version.pk).update(size=size, sha256=sha256)
+        return None
+    if expected[0] is not None and size != expected[0]:
+        return Problem(version, SIZE_MISMATCH, f"{size} bytes, expected {expected[0]}")
+    if sha256 != expected[1]:
+        return Problem(version, CHECKSUM_MISMATCH, f"{sha256}, expected {expected[1]}")
+    return None
+
+
+def scrub_shard(shard=0, shards=1, rate=None, batch_size=200, restart=False):
+    """
+    Check the versions whose id is ``shard`` modulo ``shards``, resuming
+    from the shard's checkpoint unless ``restart``. Returns the problems.
+    """
+    checkpoint, _ = ScrubCheckpoint.objects.get_or_create(shard=shard, shards=shards)
+    if restart or checkpoint.finished_at or not checkpoint.started_at:
+        checkpoint.last_version_id = checkpoint.checked = checkpoint.problems = 0
+        checkpoint.started_at = timezone.now()
+        checkpoint.finished_at = None
+        checkpoint.save()
+
+    versions = (
+        DocumentVersion.objects.exclude(file="")
+        .alias(shard=Mod(F("id"), shards))
+        .filter(shard=shard)
+        .select_related("blob")
+        .only(
+            "document_id",
+            "file",
+            "size",
+            "sha256",
+            "delta_base",
+            "blob__size",
+        )
+        .order_by("pk")
+    )
+    throttle = Throttle(rate)
+    problems = []
+    while True:
+        batch = list(versions.filter(pk__gt=checkpoint.last_version_id)[:batch_size])
+        if not batch:
+            break
+        for version in batch:
+            problem = check_version(version, throttle)
+            if problem is not None:
+                logger.warning("Scrub found %s", problem)
+                problems.append(problem)
+                checkpoint.problems += 1
+        checkpoint.checked += len(batch)
+        checkpoint.last_version_id = batch[-1].pk
+        checkpoint.save(
+            update_fields=["last_version_id", "checked", "problems", "updated_at"]
+        )
+
+    checkpoint.finished_at = timezone.now()
+    checkpoint.save(update_fields=["finished_at", "updated_at"])
+    return problems
@@ -0,0 +1,57 @@
+from apps.documents.models import Document, VersionTextChunk
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# Text search configuration used by the documents_search_vector trigger and
+# VersionTextChunk.search_vector.
+SEARCH_CONFIG = "english"
+
+HEADLINE_OPTIONS = {
+    "config": SEARCH_CONFIG,
+    "start_sel": "<mark>",
+    "stop_sel": "</mark>",
+    "max_words": 35,
+    "min_words": 15,
+    "max_fragments": 2,
+}
+
+
+def search_documents(queryset, text):
+    """
+    Rank documents matching ``text`` (web search syntax) by relevance.
+
+    A document matches on its metadata, through the GIN-indexed
+    ``search_vector``, or on the text of its latest version's file, through
+    the GIN index of ``VersionTextChunk``. The two matches are combined as a
+    UNION of ids rather than an OR, which would make Postgres check every
+    document row instead of using either index. Only matching rows are
+    ranked.
+    Postgres evaluates the expensive ``ts_headline`` annotations after the
+    sort and LIMIT, so only the returned page pays for highlighting.
+    """
+    query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+    best_chunk = (
+        VersionTextChunk.objects.filter(
+            search_vector=query, version_id=OuterRef("latest_version_id")
+        )
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank")
+    )
+    metadata_ids = Document.objects.filter(search_vector=query).values("pk")
+    content_ids = Document.objects.filter(
+        latest_version__text_chunks__search_vector=query
+    ).values("pk")
+    return (
+        queryset.filter(pk__in=metadata_ids.union(content_ids))
+        .annotate(
+            rank=SearchRank(F("search_vector"), query)
+            + Coalesce(Subquery(best_chunk.values("rank")[:1]), 0.0),
+            title_highlight=SearchHeadline("title", query, **HEADLINE_OPTIONS),
+            snippet=SearchHeadline("description", query, **HEADLINE_OPTIONS),
+            content_snippet=SearchHeadline(
+                Subquery(best_chunk.values("content")[:1]), query, **HEADLINE_OPTIONS
+            ),
+        )
+        .order_by("-rank", "-created_at", "-document_id")
+    )
@@ -0,0 +1,10 @@
+from .document import (
+    ALL_FIELDS,
+    LIST_FIELDS,
+    InvalidFields,
+    allowed_actions,
+    document_queryset,
+    parse_fields,
+    serialize_document,
+    serialize_version,
+)
@@ -0,0 +1,107 @@
+"""
+MIME types of uploaded files, told from their first bytes.
+
+The type a client declares for an upload is whatever its file picker made
+of the extension, so versions record the type their content shows instead.
+Only ``SNIFF_SIZE`` leading bytes are needed, which lets the upload handler
+sniff the first chunk as it arrives rather than reading the file again.
+"""
+
+import mimetypes
+import struct
+
+# Leading bytes looked at.
+SNIFF_SIZE = 2048
+
+OCTET_STREAM = "application/octet-stream"
+
+SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"{\\rtf", "application/rtf"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (b"Rar!\x1a\x07", "application/vnd.rar"),
+)
+ZIP = b"PK\x03\x04"
+OLE2 = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# Types stored as ZIP or OLE2 containers, told apart by the file's extension
+# when the container itself does not say.
+ZIP_TYPES = ("application/vnd.openxmlformats-officedocument.", "application/epub")
+OLE2_TYPES = (
+    "application/msword",
+    "application/vnd.ms-excel",
+    "application/vnd.ms-powerpoint",
+    "application/vnd.ms-outlook",
+)
+
+
+def _by_extension(filename, prefixes, default):
+    guessed = mimetypes.guess_type(filename or "")[0] or ""
+    return guessed if guessed.startswith(prefixes) else default
+
+
+def _text_type(head):
+    if b"\x00" in head:
+        return None
+    try:
+        text = head.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # Only a character cut off at the end of the sample is forgiven.
+        if exc.start < len(head) - 3:
+            return None
+        text = head[: exc.start].decode("utf-8")
+    start = text.lstrip("\ufeff \t\r\n")[:64].lower()
+    if start.startswith(("<!doctype html", "<html")):
+        return "text/html"
+    if start.startswith("<?xml"):
+        return "application/xml"
+    return "text/plain"
+
+
+def _odf_type(head):
+    # OpenDocument files begin with an uncompressed "mimetype" entry.
+    size, _, name_length, extra_length = struct.unpack_from("<IIHH", head, 18)
+    start = 30 + name_length + extra_length
+    if head[30 : 30 + name_length] != b"mimetype" or size > 100:
+        return None
+    return head[start : start + size].decode("ascii", "replace") or None
+
+
+def sniff_content_type(head, filename=""):
+    """
+    The MIME type the leading bytes ``head`` of a file called ``filename``
+    show, ``application/octet-stream`` when they show none.
+    """
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head.startswith(ZIP):
+        if len(head) >= 30 and (odf := _odf_type(head)):
+            return odf
+        return _by_extension(filename, ZIP_TYPES, "application/zip")
+    if head.startswith(OLE2):
+        return _by_extension(filename, OLE2_TYPES, "application/x-ole-storage")
+    if head[4:8] == b"ftyp":
+        return "video/mp4"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head:
+        return _text_type(head) or OCTET_STREAM
+    return OCTET_STREAM
+
+
+def sniff_file(file):
+    """
+    ``sniff_content_type`` of a seekable file object, left at its start.
+    """
+    file.seek(0)
+    head = file.read(SNIFF_SIZE)
+    file.seek(0)
+    return sniff_content_type(head, getattr(file, "name", ""))
@@ -0,0 +1,194 @@
+import hashlib
+import itertools
+import os
+import tempfile
+from pathlib import PurePosixPath
+
+from apps.documents.compression import (
+    SAMPLE_SIZE,
+    CompressingWriter,
+    DecompressingFile,
+    read_header,
+    worth_compressing,
+)
+from django.conf import settings
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+from django.utils.deconstruct import deconstructible
+
+# Bytes read per step when hashing a file on disk.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """
+    SHA-256 hex digest of the file at ``path``, read in one streaming pass.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names each file after the SHA-256 of its bytes.
+
+    ``save("documents/scan.pdf", content)`` hashes and writes the content in a
+    single streaming pass to a temporary file, then moves it to
+    ``documents/<aa>/<bb>/<sha256>.pdf``. Identical content maps to the same
+    name, so a duplicate upload is dropped instead of stored twice. Which
+    versions share a file is tracked by ``apps.documents.models.Blob``.
+
+    With a ``compression`` codec (by default ``DOCUMENT_STORAGE_COMPRESSION``)
+    content is compressed in the same pass, unless sniffing its first bytes
+    shows it is compressed already. ``open()`` decompresses while reading and
+    ``size()`` reports the content's size, so callers only see the content.
+    Names and digests always refer to the uncompressed bytes.
+
+    Files moved to cold storage by ``apps.documents.tiering`` are brought
+    back to this storage the first time they are read.
+    """
+
+    def __init__(self, compression=None, level=None, **kwargs):
+        super().__init__(**kwargs)
+        self._compression = compression
+        self._level = level
+
+    @property
+    def compression(self):
+        if self._compression is None:
+            return settings.DOCUMENT_STORAGE_COMPRESSION
+        return self._compression
+
+    @property
+    def level(self):
+        if self._level is None:
+            return settings.DOCUMENT_STORAGE_COMPRESSION_LEVEL
+        return self._level
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content; a clash is a duplicate.
+        return name
+
+    def _save(self, name, content):
+        compression = self.compression
+        if hasattr(content, "temporary_file_path"):
+            # Already on disk (an upload or an assembled chunked one): hash
+            # it in place, unless the upload handler did while receiving it,
+            # and move it rather than copy it, unless it is to be compressed.
+            source = content.temporary_file_path()
+            if not compression or not self._worth_compressing(source):
+                sha256 = getattr(content, "sha256", None) or file_digest(source)
+                name = self.content_name(name, sha256)
+                if not os.path.exists(self.path(name)):
+                    self._place(source, name, move=file_move_safe)
+                return name
+            with open(source, "rb") as f:
+                return self._write(name, File(f).chunks(), compression)
+        return self._write(name, content.chunks(), compression)
+
+    def _write(self, name, chunks, compression):
+        """
+        Hash ``chunks`` while writing them, compressed if that pays off, to
+        a temporary file, then move it to its content name.
+        """
+        directory = self.path(str(PurePosixPath(name).parent))
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        chunks = iter(chunks)
+        head = next(chunks, b"")
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                out = temp
+                if compression and worth_compressing(head, compression, self.level):
+                    out = CompressingWriter(temp, compression, self.level)
+                for chunk in itertools.chain([head], chunks):
+                    digest.update(chunk)
+                    out.write(chunk)
+                if out is not temp:
+                    out.finish()
+            name = self.content_name(name, digest.hexdigest())
+            if os.path.exists(self.path(name)):
+                os.remove(temp_path)
+            else:
+                self._place(temp_path, name, move=os.replace)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
+
+    def _worth_compressing(self, path):
+        with open(path, "rb") as f:
+            return worth_compressing(f.read(SAMPLE_SIZE), self.compression, self.level)
+
+    def local_path(self, name):
+        """
+        ``path(name)``, once the file is there again if it was moved to cold
+        storage.
+        """
+        path = self.path(name)
+        if not os.path.exists(path):
+            from apps.documents.tiering import rehydrate
+
+            rehydrate(name)
+        return path
+
+    def _open(self, name, mode="rb"):
+        if mode == "rb":
+            self.local_path(name)
+        file = super()._open(name, mode)
+        if mode == "rb":
+            header = read_header(file.file)
+            if header is not None:
+                return File(DecompressingFile(file.file, *header), name=file.name)
+        return file
+
+    def size(self, name):
+        # The size of the content, not of the compressed file.
+        with open(self.local_path(name), "rb") as f:
+            header = read_header(f)
+        return header[1] if header else super().size(name)
+
+    def is_compressed(self, name):
+        with open(self.local_path(name), "rb") as f:
+            return read_header(f) is not None
+
+    def _place(self, source, name, move):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        move(source, path)
+        os.chmod(path, self.file_permissions_mode or 0o644)
+
+    @staticmethod
+    def content_name(name, sha256):
+        """
+        Where content with digest ``sha256`` uploaded as ``name`` is stored.
+        """
+        path = PurePosixPath(name)
+        return str(
+            path.parent / sha256[:2] / sha256[2:4] / f"{sha256}{path.suffix.lower()}"
+        )
+
+    @staticmethod
+    def digest(name):
+        """
+        The SHA-256 a name returned by ``save()`` was derived from.
+        """
+        return PurePosixPath(name).stem
+
+
+version_storage = ContentAddressedStorage()
+
+
+def cold_storage():
+    """
+    Where version files of archived documents are moved: the "cold" backend
+    of ``STORAGES``.
+    """
+    return storages["cold"]
@@ -0,0 +1,70 @@
+"""
+Set-up shared by the document tests that store files.
+"""
+
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+User = get_user_model()
+
+
+def make_user(email="owner@example.com", name="O", surname="W", **extra):
+    return User.objects.create_user(
+        email=email, password="StrongPass123!", name=name, surname=surname, **extra
+    )
+
+
+class MediaRootMixin:
+    """
+    Runs each test against an empty temporary ``MEDIA_ROOT``.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = self.temporary_directory()
+        self.override(MEDIA_ROOT=self.media_root)
+
+    def temporary_directory(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        return path
+
+    def override(self, **options):
+        """
+        Override settings until the test ends.
+        """
+        override = override_settings(**options)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def use_cold_storage(self):
+        """
+        Give the "cold" storage a temporary directory of its own.
+        """
+        self.cold_root = self.temporary_directory()
+        self.override(
+            STORAGES={
+                **settings.STORAGES,
+                "cold": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": self.cold_root},
+                },
+            }
+        )
+
+
+class OwnerMixin(MediaRootMixin):
+    """
+    Also creates ``self.user``, who owns the test's documents, and signs the
+    API client in as them.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = make_user()
+        if hasattr(self.client, "force_authenticate"):
+            self.client.force_authenticate(self.user)
@@ -0,0 +1,130 @@
+import hashlib
+import io
+import json
+import zipfile
+from unittest import mock
+
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.tests.helpers import OwnerMixin, make_user
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+TEXT = b"Quarterly report, quarterly numbers.\n" * 200
+
+
+class DocumentBundleTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = make_user("other@example.com", "X", "Y")
+        self.doc = self.make_document("Q3 Report", self.user)
+        self.add_version(self.doc, "report.txt", TEXT)
+        self.add_version(self.doc, "chart.png", PNG)
+        self.hidden = self.make_document("Hidden", self.other)
+        self.add_version(self.hidden, "secret.txt", b"secret")
+
+    def make_document(self, title, user, **fields):
+        return Document.objects.create(
+            title=title,
+            created_by=user,
+            assigned_to=user,
+            reviewer=user,
+            priority=Document.PRIORITY_LOW,
+            **fields,
+        )
+
+    def add_version(self, doc, name, content):
+        return DocumentVersion.objects.create(
+            document=doc,
+            file=SimpleUploadedFile(name, content),
+            created_by=doc.created_by,
+        )
+
+    def fetch(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertTrue(response["Content-Disposition"].startswith("attachment;"))
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        manifest = json.loads(archive.read("manifest.json"))
+        return archive, manifest
+
+    def test_all_versions_of_a_document(self):
+        url = reverse("documents:doc-version-bundle", args=[self.doc.document_id])
+        archive, manifest = self.fetch(url)
+
+        folder = f"q3-report-{str(self.doc.document_id)[:8]}"
+        text, image = archive.infolist()[:2]
+        self.assertEqual(text.filename, f"{folder}/v1-report.txt")
+        self.assertEqual(text.compress_type, zipfile.ZIP_DEFLATED)
+        self.assertLess(text.compress_size, len(TEXT))
+        self.assertEqual(archive.read(text), TEXT)
+        self.assertEqual(image.filename, f"{folder}/v2-chart.png")
+        self.assertEqual(image.compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.read(image), PNG)
+
+        self.assertEqual(
+            [
+                (f["path"], f["version_number"], f["size"], f["sha256"])
+                for f in manifest["files"]
+            ],
+            [
+                (text.filename, 1, len(TEXT), hashlib.sha256(TEXT).hexdigest()),
+                (image.filename, 2, len(PNG), hashlib.sha256(PNG).hexdigest()),
+            ],
+        )
+        self.assertEqual(manifest["files"][0]["document_id"], str(self.doc.document_id))
+        self.assertEqual(manifest["files"][0]["created_by"], "owner@example.com")
+        self.assertEqual(manifest["missing"], [])
+
+    def test_streams_in_chunks(self):
+        url = reverse("documents:doc-version-bundle", args=[self.doc.document_id])
+        with mock.patch("apps.documents.bundles.READ_SIZE", 1024):
+            response = self.client.get(url)
+            chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 4)
+        self.assertLess(max(len(chunk) for chunk in chunks), 8 * 1024)
+
+    def test_no_access(self):
+        url = reverse("documents:doc-version-bundle", args=[self.hidden.document_id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filtered_documents(self):
+        archived = self.make_document(
+            "Old Memo", self.user, status=Document.STATUS_ARCHIVED
+        )
+        self.add_version(archived, "memo.txt", b"memo")
+        url = reverse("documents:doc-bundle")
+
+        archive, manifest = self.fetch(url)
+        names = sorted(f["filename"] for f in manifest["files"])
+        # Latest versions only, and not the document of another user.
+        self.assertEqual(names, ["chart.png", "memo.txt"])
+        self.assertEqual(len(archive.namelist()), 3)
+
+        _, manifest = self.fetch(url, versions="all", status=Document.STATUS_ARCHIVED)
+        self.assertEqual([f["filename"] for f in manifest["files"]], ["memo.txt"])
+
+        _, manifest = self.fetch(url, versions="all")
+        self.assertEqual(len(manifest["files"]), 3)
+
+        response = self.client.get(url, {"versions": "some"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_see_every_document(self):
+        self.user.is_staff = True
+        self.user.save()
+        _, manifest = self.fetch(reverse("documents:doc-bundle"))
+        self.assertIn("secret.txt", [f["filename"] for f in manifest["files"]])
+
+    def test_missing_file_listed(self):
+        version = self.doc.versions.get(version_number=1)
+        version.file.storage.delete(version.file.name)
+        url = reverse("documents:doc-version-bundle", args=[self.doc.document_id])
+        archive, manifest = self.fetch(url)
+        self.assertEqual([f["filename"] for f in manifest["missing"]], ["report.txt"])
+        self.assertEqual([f["filename"] for f in manifest["files"]], ["chart.png"])
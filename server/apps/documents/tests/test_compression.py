@@ -0,0 +1,171 @@
+import hashlib
+import io
+import os
+import random
+import shutil
+import tempfile
+from unittest import mock
+
+from apps.documents.compression import MAGIC, OUTPUT_SIZE, DecompressingFile
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.storage import ContentAddressedStorage
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+TEXT = b"".join(
+    b"%d,invoice,paid,2024-03-%02d\n" % (i, i % 28 + 1) for i in range(5000)
+)
+NOISE = random.Random(3).randbytes(100_000)
+
+
+class CompressedStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+
+    def storage(self, compression):
+        return ContentAddressedStorage(location=self.location, compression=compression)
+
+    def stored_bytes(self, storage, name):
+        with open(storage.path(name), "rb") as f:
+            return f.read()
+
+    def test_round_trip_for_each_codec(self):
+        sha256 = hashlib.sha256(TEXT).hexdigest()
+        for codec in ("zlib", "bz2", "lzma"):
+            with self.subTest(codec):
+                storage = self.storage(codec)
+                name = storage.save(f"{codec}/export.csv", ContentFile(TEXT))
+                self.assertEqual(storage.digest(name), sha256)
+                stored = self.stored_bytes(storage, name)
+                self.assertTrue(stored.startswith(MAGIC))
+                self.assertLess(len(stored), len(TEXT) / 5)
+                self.assertEqual(storage.size(name), len(TEXT))
+                with storage.open(name) as f:
+                    self.assertEqual(f.size, len(TEXT))
+                    self.assertEqual(f.read(), TEXT)
+
+    def test_incompressible_content_is_stored_as_is(self):
+        storage = self.storage("zlib")
+        jpeg = b"\xff\xd8\xff\xe0" + TEXT
+        for content in (jpeg, NOISE):
+            name = storage.save("documents/file.bin", ContentFile(content))
+            self.assertEqual(self.stored_bytes(storage, name), content)
+            self.assertFalse(storage.is_compressed(name))
+            with storage.open(name) as f:
+                self.assertEqual(f.read(), content)
+
+    def test_content_that_looks_compressed_round_trips(self):
+        storage = self.storage("zlib")
+        content = MAGIC + NOISE
+        name = storage.save("documents/odd.bin", ContentFile(content))
+        self.assertTrue(storage.is_compressed(name))
+        with storage.open(name) as f:
+            self.assertEqual(f.read(), content)
+
+        # Uncompressed storage reads it back correctly too.
+        with self.storage("").open(name) as f:
+            self.assertEqual(f.read(), content)
+
+    def test_temporary_files_are_compressed_in_one_pass(self):
+        upload = TemporaryUploadedFile("big.csv", "text/csv", len(TEXT), None)
+        upload.write(TEXT)
+        upload.seek(0)
+        storage = self.storage("lzma")
+        name = storage.save("documents/big.csv", upload)
+        self.assertTrue(storage.is_compressed(name))
+        self.assertTrue(os.path.exists(upload.temporary_file_path()))
+        upload.close()
+
+    def test_seeking(self):
+        storage = self.storage("zlib")
+        name = storage.save("documents/export.csv", ContentFile(TEXT))
+        with storage.open(name) as f:
+            self.assertEqual(f.seek(0, io.SEEK_END), len(TEXT))
+            f.seek(70_000)
+            self.assertEqual(f.read(100), TEXT[70_000:70_100])
+            self.assertEqual(f.tell(), 70_100)
+            f.seek(10)
+            self.assertEqual(f.read(5), TEXT[10:15])
+            f.seek(len(TEXT) - 3)
+            self.assertEqual(f.read(), TEXT[-3:])
+            self.assertEqual(f.read(), b"")
+
+
+@override_settings(DOCUMENT_STORAGE_COMPRESSION="zlib")
+class CompressedVersionTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        doc = Document.objects.create(
+            title="Ledger",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+        self.version = DocumentVersion.objects.create(
+            document=doc,
+            file=SimpleUploadedFile("ledger.csv", TEXT),
+            created_by=self.user,
+        )
+        self.url = reverse("documents:doc-version-download", args=[doc.document_id, 1])
+
+    def test_downloads_are_decompressed(self):
+        self.assertLess(os.path.getsize(self.version.file.path), len(TEXT) / 5)
+        self.assertEqual(self.version.size, len(TEXT))
+
+        response = self.client.get(self.url)
+        self.assertEqual(int(response["Content-Length"]), len(TEXT))
+        self.assertEqual(b"".join(response.streaming_content), TEXT)
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=1000-1999")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), TEXT[1000:2000])
+
+    def test_highly_compressible_download_streams_in_bounded_steps(self):
+        content = b"2024-03-01,invoice,paid,0.00\n" * 600_000
+        version = DocumentVersion.objects.create(
+            document=self.version.document,
+            file=SimpleUploadedFile("export.csv", content),
+            created_by=self.user,
+        )
+        self.assertLess(os.path.getsize(version.file.path), len(content) / 200)
+
+        inflate = DecompressingFile._inflate
+        produced = []
+
+        def record(f, limit):
+            data = inflate(f, limit)
+            produced.append(len(data))
+            return data
+
+        url = reverse(
+            "documents:doc-version-download",
+            args=[version.document_id, version.version_number],
+        )
+        with mock.patch.object(DecompressingFile, "_inflate", record):
+            response = self.client.get(url)
+            digest = hashlib.sha256()
+            for chunk in response.streaming_content:
+                digest.update(chunk)
+        self.assertEqual(digest.hexdigest(), hashlib.sha256(content).hexdigest())
+        self.assertLessEqual(max(produced), OUTPUT_SIZE)
+
+    @override_settings(DOCUMENT_DOWNLOAD_OFFLOAD="nginx")
+    def test_compressed_files_are_not_offloaded(self):
+        response = self.client.get(self.url)
+        self.assertNotIn("X-Accel-Redirect", response)
+        self.assertEqual(b"".join(response.streaming_content), TEXT)
+
+    def test_benchmark_command(self):
+        out = io.StringIO()
+        call_command("compression_benchmark", "--codec=zlib", "--level=1", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn("Sample: 1 files", lines[0])
+        self.assertTrue(lines[2].startswith("zlib       1      1"))
@@ -0,0 +1,199 @@
+import io
+import os
+import time
+from unittest import mock
+
+from apps.documents.jobs import run_pending
+from apps.documents.models import (
+    Blob,
+    Document,
+    DocumentVersion,
+    Job,
+    WorkQueueItem,
+)
+from apps.documents.storage import version_storage
+from apps.documents.tests.helpers import OwnerMixin, make_user
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class DeletionTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = make_user("other@example.com", "X", "Y")
+        self.doc = Document.objects.create(
+            title="Contract",
+            created_by=self.user,
+            assigned_to=self.other,
+            reviewer=self.other,
+            priority=Document.PRIORITY_LOW,
+        )
+        self.versions = [self.upload(f"draft {i}".encode()) for i in range(3)]
+        run_pending()
+
+    def upload(self, content):
+        return DocumentVersion.objects.create(
+            document=self.doc,
+            file=SimpleUploadedFile("contract.pdf", content),
+            created_by=self.user,
+        )
+
+    def exists(self, version):
+        return os.path.exists(version_storage.path(version.file.name))
+
+    def test_document_delete_returns_before_purge(self):
+        WorkQueueItem.objects.create(
+            document=self.doc,
+            user=self.other,
+            action=WorkQueueItem.ACTION_REVIEW,
+            title=self.doc.title,
+            priority=self.doc.priority,
+        )
+        url = reverse("documents:doc-detail", args=[self.doc.document_id])
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        # Hidden at once, removed by the job.
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(DocumentVersion.objects.filter(document=self.doc).exists())
+        self.assertFalse(WorkQueueItem.objects.exists())
+        self.assertEqual(DocumentVersion.all_objects.count(), 3)
+        self.assertTrue(all(self.exists(v) for v in self.versions))
+
+        run_pending()
+        self.assertFalse(Document.all_objects.exists())
+        self.assertFalse(DocumentVersion.all_objects.exists())
+        self.assertFalse(any(self.exists(v) for v in self.versions))
+
+    def test_purge_runs_in_batches(self):
+        self.doc.soft_delete()
+        with mock.patch("apps.documents.models.document.PURGE_BATCH", 2):
+            self.assertEqual(
+                Job.objects.filter(name__endswith="Document.purge").count(), 1
+            )
+            run_pending()
+        self.assertFalse(Document.all_objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_only_creator_or_staff_deletes(self):
+        self.client.force_authenticate(self.other)
+        url = reverse("documents:doc-detail", args=[self.doc.document_id])
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+        url = reverse("documents:doc-version-item", args=[self.doc.document_id, 1])
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(Document.objects.get().deleted_at)
+
+    def test_version_delete(self):
+        url = reverse("documents:doc-version-item", args=[self.doc.document_id, 3])
+        self.assertEqual(self.client.get(url).data["version_number"], 3)
+        self.assertEqual(
+            self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT
+        )
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        doc = Document.objects.get()
+        self.assertEqual(doc.version_count, 2)
+        self.assertEqual(doc.latest_version_id, self.versions[1].pk)
+        self.assertTrue(self.exists(self.versions[2]))
+
+        run_pending()
+        doc.refresh_from_db()
+        self.assertEqual(doc.version_count, 2)
+        self.assertFalse(
+            DocumentVersion.all_objects.filter(pk=self.versions[2].pk).exists()
+        )
+        self.assertFalse(self.exists(self.versions[2]))
+
+    def test_purge_running_twice_releases_once(self):
+        shared = [self.upload(b"shared") for _ in range(3)]
+        stale = DocumentVersion.objects.get(pk=shared[0].pk)
+        shared[0].soft_delete()
+        DocumentVersion.purge(shared[0].pk)
+        DocumentVersion.purge(shared[0].pk)
+        stale.delete()
+        self.assertEqual(Blob.objects.get(name=shared[1].blob_id).ref_count, 2)
+
+        shared[1].delete()
+        self.assertEqual(Blob.objects.get(name=shared[2].blob_id).ref_count, 1)
+        self.assertTrue(self.exists(shared[2]))
+
+    def test_stale_document_save_keeps_it_deleted(self):
+        stale = Document.objects.get(pk=self.doc.pk)
+        self.doc.soft_delete()
+        stale.title = "Renamed"
+        stale.save()
+        self.assertFalse(Document.objects.filter(pk=self.doc.pk).exists())
+        self.assertEqual(Document.all_objects.get(pk=self.doc.pk).title, "Renamed")
+
+    def test_collect_garbage_leaves_queued_purges(self):
+        self.doc.soft_delete()
+        Document.all_objects.update(
+            deleted_at=timezone.now() - timezone.timedelta(days=2)
+        )
+        call_command("collect_garbage", stdout=io.StringIO())
+        self.assertEqual(Job.objects.filter(name__endswith="Document.purge").count(), 1)
+
+    @override_settings(DOCUMENT_DELTA_ENCODING=True)
+    def test_deleted_delta_base_still_serves_children(self):
+        base = self.upload(b"%PDF-1.4 " + bytes(range(256)) * 40)
+        child = self.upload(b"%PDF-1.4 " + bytes(range(256)) * 40 + b"appendix")
+        run_pending()
+        child.refresh_from_db()
+        self.assertEqual(child.delta_base_id, base.pk)
+
+        base.soft_delete()
+        download = reverse(
+            "documents:doc-version-download",
+            args=[self.doc.document_id, child.version_number],
+        )
+        body = b"".join(self.client.get(download).streaming_content)
+        self.assertTrue(body.endswith(b"appendix"))
+
+        run_pending()
+        child.refresh_from_db()
+        self.assertIsNone(child.delta_base_id)
+        body = b"".join(self.client.get(download).streaming_content)
+        self.assertTrue(body.endswith(b"appendix"))
+
+    def write_file(self, name, age):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"orphan")
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_collect_garbage(self):
+        old = self.write_file("documents/ab/cd/" + "ab" * 32 + ".pdf", 3 * 86400)
+        part = self.write_file("documents/tmp1234.part", 3 * 86400)
+        young = self.write_file("documents/ef/01/" + "ef" * 32 + ".pdf", 60)
+        for version in self.versions:
+            path = version_storage.path(version.file.name)
+            os.utime(path, (time.time() - 3 * 86400,) * 2)
+
+        out = io.StringIO()
+        call_command("collect_garbage", "--dry-run", stdout=out)
+        self.assertIn("Would delete 2 orphaned files", out.getvalue())
+        self.assertTrue(os.path.exists(old))
+
+        call_command("collect_garbage", stdout=io.StringIO())
+        self.assertFalse(os.path.exists(old))
+        self.assertFalse(os.path.exists(part))
+        self.assertTrue(os.path.exists(young))
+        self.assertTrue(all(self.exists(v) for v in self.versions))
+
+    def test_collect_garbage_requeues_overdue_purges(self):
+        self.doc.soft_delete()
+        Job.objects.all().delete()
+        Document.all_objects.update(
+            deleted_at=timezone.now() - timezone.timedelta(days=2)
+        )
+        call_command("collect_garbage", stdout=io.StringIO())
+        run_pending()
+        self.assertFalse(Document.all_objects.exists())
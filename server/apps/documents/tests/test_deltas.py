@@ -0,0 +1,144 @@
+import io
+import os
+import random
+from unittest import mock
+
+from apps.documents import bindiff
+from apps.documents.deltas import cache, encode_version, read_version
+from apps.documents.jobs import run_pending
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+
+class BinaryDiffTests(SimpleTestCase):
+    def test_round_trips(self):
+        base = os.urandom(20000)
+        cases = [
+            base[:5000] + b"inserted" + base[5000:],
+            base[:5000] + base[7000:],
+            b"prefix" + base + b"suffix",
+            base[10000:] + base[:10000],
+            b"",
+        ]
+        for target in cases:
+            self.assertEqual(bindiff.patch(base, bindiff.diff(base, target)), target)
+        self.assertEqual(bindiff.patch(b"", bindiff.diff(b"", base)), base)
+
+    def test_small_edits_give_small_deltas(self):
+        base = os.urandom(100000)
+        delta = bindiff.diff(base, base[:50000] + b"edit" + base[50004:])
+        self.assertLess(len(delta), 200)
+
+    def test_gives_up_past_limit(self):
+        self.assertIsNone(bindiff.diff(os.urandom(5000), os.urandom(5000), limit=1000))
+
+    def test_rejects_corrupt_deltas(self):
+        delta = bindiff.diff(b"abc" * 100, b"abc" * 99)
+        with self.assertRaises(bindiff.CorruptDelta):
+            bindiff.patch(b"abc" * 100, delta[:-3])
+
+
+@override_settings(DOCUMENT_DELTA_ENCODING=True, DOCUMENT_DELTA_KEYFRAME_INTERVAL=3)
+class DeltaStorageTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.doc = Document.objects.create(
+            title="Contract",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+        rng = random.Random(7)
+        self.contents = [rng.randbytes(30000)]
+        for i in range(3):
+            edited = bytearray(self.contents[-1])
+            edited[i * 1000 : i * 1000 + 10] = b"revision %d" % i
+            self.contents.append(bytes(edited))
+        self.versions = []
+        for content in self.contents:
+            self.versions.append(
+                DocumentVersion.objects.create(
+                    document=self.doc,
+                    file=SimpleUploadedFile("contract.pdf", content),
+                    created_by=self.user,
+                )
+            )
+            run_pending()
+        for version in self.versions:
+            version.refresh_from_db()
+
+    def download(self, version):
+        url = reverse(
+            "documents:doc-version-download",
+            args=[self.doc.document_id, version.version_number],
+        )
+        return b"".join(self.client.get(url).streaming_content)
+
+    def test_chain_with_keyframes(self):
+        self.assertEqual(
+            [(v.delta_base_id, v.delta_depth) for v in self.versions],
+            [
+                (None, 0),
+                (self.versions[0].pk, 1),
+                (self.versions[1].pk, 2),
+                (None, 0),
+            ],
+        )
+        self.assertLess(self.versions[2].blob.size, 1000)
+        self.assertEqual(self.versions[2].size, 30000)
+        for version, content in zip(self.versions, self.contents):
+            self.assertEqual(self.download(version), content)
+
+    def test_rebuilt_versions_are_cached(self):
+        cache.clear()
+        self.assertEqual(read_version(self.versions[2]), self.contents[2])
+        with self.assertNumQueries(0):
+            self.assertEqual(read_version(self.versions[2]), self.contents[2])
+
+    def test_deleting_a_base_keeps_dependents_readable(self):
+        self.versions[0].delete()
+        self.versions[1].refresh_from_db()
+        self.assertIsNone(self.versions[1].delta_base_id)
+        cache.clear()
+        self.assertEqual(read_version(self.versions[2]), self.contents[2])
+
+    def add_version(self, content):
+        with self.settings(DOCUMENT_DELTA_ENCODING=False):
+            return DocumentVersion.objects.create(
+                document=self.doc,
+                file=SimpleUploadedFile("contract.pdf", content),
+                created_by=self.user,
+            )
+
+    def test_large_versions_stay_whole(self):
+        version = self.add_version(self.contents[3] + b"appendix")
+        with self.settings(DOCUMENT_DELTA_MAX_BYTES=20000):
+            self.assertFalse(encode_version(version.pk))
+        self.assertTrue(encode_version(version.pk))
+
+    def test_base_deleted_while_diffing(self):
+        version = self.add_version(self.contents[3] + b"appendix")
+        diff = bindiff.diff
+
+        def delete_base(*args, **kwargs):
+            self.versions[3].delete()
+            return diff(*args, **kwargs)
+
+        with mock.patch("apps.documents.bindiff.diff", side_effect=delete_base):
+            self.assertFalse(encode_version(version.pk))
+        version.refresh_from_db()
+        self.assertIsNone(version.delta_base_id)
+        self.assertEqual(read_version(version), self.contents[3] + b"appendix")
+
+    def test_report(self):
+        out = io.StringIO()
+        call_command("delta_report", stdout=out)
+        self.assertIn("2 of 4 versions are stored as deltas", out.getvalue())
+        self.assertIn("Their content is 60000 bytes", out.getvalue())
@@ -0,0 +1,56 @@
+from apps.documents.models import Document
+from apps.documents.tests.helpers import make_user
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+@override_settings(DOCUMENT_STATS_CACHE_TTL=0)
+class DocumentStatsTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("documents:doc-stats")
+        self.user = make_user()
+        self.other = make_user("other@example.com", "R", "V")
+        self.client.force_authenticate(self.user)
+        self.create(Document.STATUS_PENDING, reviewer=self.user)
+        self.create(Document.STATUS_PENDING, reviewer=self.other)
+        self.create(Document.STATUS_APPROVED, assigned_to=self.user)
+        self.create(Document.STATUS_ARCHIVED, priority=Document.PRIORITY_HIGH)
+
+    def create(self, status, **extra):
+        extra.setdefault("reviewer", self.other)
+        extra.setdefault("assigned_to", self.other)
+        extra.setdefault("priority", Document.PRIORITY_LOW)
+        return Document.objects.create(
+            title="Doc", created_by=self.other, status=status, **extra
+        )
+
+    def test_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 4)
+        self.assertEqual(response.data["by_status"]["pending"], 2)
+        self.assertEqual(response.data["by_status"]["signed"], 0)
+        self.assertEqual(response.data["by_priority"], {"low": 3, "medium": 0, "high": 1})
+        self.assertEqual(response.data["awaiting_review"], 1)
+        self.assertEqual(response.data["awaiting_signature"], 1)
+
+    def test_filters_apply(self):
+        response = self.client.get(f"{self.url}?priority=high")
+        self.assertEqual(response.data["total"], 1)
+        self.assertEqual(response.data["by_status"]["archived"], 1)
+
+        response = self.client.get(f"{self.url}?status=nope")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(DOCUMENT_STATS_CACHE_TTL=30)
+    def test_cached(self):
+        self.addCleanup(cache.clear)
+        self.client.get(self.url)
+        self.create(Document.STATUS_PENDING, reviewer=self.user)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["awaiting_review"], 1)
@@ -0,0 +1,269 @@
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.tests.helpers import OwnerMixin, make_user
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class DocumentListPaginationTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("documents:doc-list")
+        self.user = make_user()
+        self.client.force_authenticate(self.user)
+        for i in range(7):
+            Document.objects.create(
+                title=f"Doc {i}",
+                created_by=self.user,
+                assigned_to=self.user,
+                reviewer=self.user,
+                priority=Document.PRIORITY_LOW,
+            )
+        # Force ties on created_at so the document_id tiebreaker is exercised.
+        Document.objects.filter(title__in=["Doc 2", "Doc 3", "Doc 4"]).update(
+            created_at=timezone.now()
+        )
+        self.expected = [
+            str(pk)
+            for pk in Document.objects.order_by(
+                "-created_at", "-document_id"
+            ).values_list("document_id", flat=True)
+        ]
+
+    def walk(self, url, link):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.append([doc["document_id"] for doc in response.data["results"]])
+            url = response.data[link]
+        return seen
+
+    def test_pages_cover_every_document_once_in_order(self):
+        pages = self.walk(f"{self.url}?page_size=3", "next")
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_previous_link_walks_back(self):
+        first = self.client.get(f"{self.url}?page_size=3").data
+        self.assertIsNone(first["previous"])
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+        self.assertEqual(back["results"], first["results"])
+
+    def test_page_size_is_clamped(self):
+        response = self.client.get(f"{self.url}?page_size=0")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"{self.url}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", response.data)
+
+
+class DocumentSerializationQueryTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = make_user("other@example.com", "R", "V")
+
+    def create_documents(self, count, versions=2):
+        for i in range(count):
+            doc = Document.objects.create(
+                title=f"Doc {i}",
+                created_by=self.user,
+                assigned_to=self.other,
+                reviewer=self.other,
+                priority=Document.PRIORITY_HIGH,
+            )
+            for _ in range(versions):
+                DocumentVersion.objects.create(
+                    document=doc,
+                    file=SimpleUploadedFile("scan.pdf", b"%PDF-1.4"),
+                    created_by=self.other,
+                )
+        return doc
+
+    def test_list_query_count_is_constant(self):
+        # One query for the page, which the ETag is computed from too.
+        url = reverse("documents:doc-list")
+        self.create_documents(2)
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        self.create_documents(5, versions=3)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 7)
+        doc = response.data["results"][0]
+        self.assertNotIn("versions", doc)
+        self.assertEqual(doc["version_count"], 3)
+        self.assertEqual(doc["latest_version"]["version_number"], 3)
+        self.assertEqual(doc["latest_version"]["created_by"], self.other.email)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f"{url}?expand=versions")
+        versions = response.data["results"][0]["versions"]
+        self.assertEqual([v["version_number"] for v in versions], [1, 2, 3])
+        self.assertEqual(versions[0]["created_by"], self.other.email)
+
+    def test_detail_query_count(self):
+        doc = self.create_documents(1, versions=4)
+        url = reverse("documents:doc-detail", args=[doc.document_id])
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["versions"]), 4)
+        self.assertEqual(response.data["allowed_actions"], ["resubmit", "archive"])
+
+    def test_sparse_fields_skip_joins_and_versions(self):
+        self.create_documents(3)
+        url = reverse("documents:doc-list")
+        with self.assertNumQueries(1) as ctx:
+            response = self.client.get(f"{url}?fields=title,status")
+        self.assertNotIn("description", ctx.captured_queries[0]["sql"])
+        self.assertNotIn("JOIN", ctx.captured_queries[0]["sql"])
+        self.assertEqual(set(response.data["results"][0]), {"title", "status"})
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f"{url}?fields=title,reviewer&expand=versions")
+        doc = response.data["results"][0]
+        self.assertEqual(set(doc), {"title", "reviewer", "versions"})
+        self.assertEqual(doc["reviewer"], self.other.email)
+        self.assertEqual(len(doc["versions"]), 2)
+
+    def test_sparse_detail(self):
+        doc = self.create_documents(1)
+        url = reverse("documents:doc-detail", args=[doc.document_id])
+        with self.assertNumQueries(2):
+            response = self.client.get(f"{url}?fields=title")
+        self.assertEqual(set(response.data), {"title", "allowed_actions"})
+
+        response = self.client.get(f"{url}?fields=title,secret")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f"{url}?expand=owner")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DocumentListFilterTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("documents:doc-list")
+        self.user = make_user()
+        self.other = make_user("other@example.com", "R", "V")
+        self.client.force_authenticate(self.user)
+        self.review_me = self.create("Bravo", reviewer=self.user)
+        self.create("Alpha", reviewer=self.user, status=Document.STATUS_APPROVED)
+        self.create("Charlie", reviewer=self.other, priority=Document.PRIORITY_HIGH)
+
+    def create(self, title, reviewer, status=Document.STATUS_PENDING, **extra):
+        extra.setdefault("priority", Document.PRIORITY_LOW)
+        return Document.objects.create(
+            title=title,
+            created_by=self.other,
+            assigned_to=self.other,
+            reviewer=reviewer,
+            status=status,
+            **extra,
+        )
+
+    def titles(self, query):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [doc["title"] for doc in response.data["results"]]
+
+    def test_reviewer_inbox(self):
+        self.assertEqual(self.titles("reviewer=me&status=pending"), ["Bravo"])
+        self.assertEqual(
+            self.titles(f"reviewer={self.other.user_id}&priority=high"), ["Charlie"]
+        )
+
+    def test_multiple_statuses(self):
+        self.assertEqual(
+            self.titles("status=pending,approved&ordering=title"),
+            ["Alpha", "Bravo", "Charlie"],
+        )
+
+    def test_date_range(self):
+        self.assertEqual(self.titles("created_before=2000-01-01"), [])
+        self.assertEqual(len(self.titles("created_after=2000-01-01")), 3)
+
+    def test_ordering_paginates(self):
+        first = self.client.get(f"{self.url}?ordering=-title&page_size=2").data
+        self.assertEqual([d["title"] for d in first["results"]], ["Charlie", "Bravo"])
+        second = self.client.get(first["next"]).data
+        self.assertEqual([d["title"] for d in second["results"]], ["Alpha"])
+
+    def test_cursor_is_bound_to_its_ordering(self):
+        first = self.client.get(f"{self.url}?ordering=title&page_size=1").data
+        response = self.client.get(first["next"].replace("ordering=title", ""))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_parameters(self):
+        for query in (
+            "status=lost",
+            "assignee=nobody",
+            "created_after=yesterday",
+            "ordering=review_notes",
+        ):
+            response = self.client.get(f"{self.url}?{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+            self.assertIn("error", response.data)
+
+
+class DocumentConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client.force_authenticate(self.user)
+        self.doc = Document.objects.create(
+            title="Doc",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+        self.urls = [
+            reverse("documents:doc-list"),
+            reverse("documents:doc-detail", args=[self.doc.document_id]),
+        ]
+
+    def test_matching_etag_returns_304_with_one_query(self):
+        for url in self.urls:
+            etag = self.client.get(url)["ETag"]
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_invalidate_the_etag(self):
+        etags = [self.client.get(url)["ETag"] for url in self.urls]
+        self.doc.title = "Renamed"
+        self.doc.save()
+        for url, etag in zip(self.urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_varies_with_query(self):
+        url = self.urls[0]
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(f"{url}?fields=title", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since(self):
+        response = self.client.get(self.urls[1])
+        response = self.client.get(
+            self.urls[1], HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_document_leaving_the_list_invalidates_it(self):
+        url = f"{self.urls[0]}?status=pending"
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        etag = response["ETag"]
+
+        Document.objects.filter(pk=self.doc.pk).update(status=Document.STATUS_APPROVED)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+
+    def test_missing_document(self):
+        url = reverse("documents:doc-detail", args=[self.user.user_id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
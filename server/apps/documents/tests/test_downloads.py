@@ -0,0 +1,121 @@
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.tests.helpers import OwnerMixin, make_user
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+CONTENT = b"%PDF-1.4 0123456789abcdef"
+
+
+class DocumentVersionDownloadTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        doc = Document.objects.create(
+            title="Scan",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+        self.version = DocumentVersion.objects.create(
+            document=doc,
+            file=SimpleUploadedFile("scan.pdf", CONTENT),
+            created_by=self.user,
+        )
+        self.url = reverse("documents:doc-version-download", args=[doc.document_id, 1])
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_whole_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.body(response), CONTENT)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["X-Content-Type-Options"], "nosniff")
+        self.assertEqual(response["Content-Disposition"], 'inline; filename="scan.pdf"')
+
+        detail = reverse("documents:doc-detail", args=[self.version.document_id])
+        versions = self.client.get(detail).data["versions"]
+        self.assertTrue(versions[0]["download_url"].endswith(self.url))
+
+    def test_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=9-12")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(self.body(response), b"0123")
+        self.assertEqual(response["Content-Length"], "4")
+        self.assertEqual(response["Content-Range"], f"bytes 9-12/{len(CONTENT)}")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-6")
+        self.assertEqual(self.body(response), b"abcdef")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=500-")
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_if_range_and_conditional_get(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.body(response), CONTENT)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_type_comes_from_content_and_markup_is_downloaded(self):
+        cases = [
+            ("report.html", CONTENT, "application/pdf", "inline"),
+            (
+                "notes.pdf",
+                b"<html><script>alert(1)</script>",
+                "text/html",
+                "attachment",
+            ),
+            ("data.bin", b"\x00\x01\x02", "application/octet-stream", "inline"),
+        ]
+        for number, (filename, content, content_type, disposition) in enumerate(
+            cases, 2
+        ):
+            with self.subTest(filename):
+                DocumentVersion.objects.create(
+                    document=self.version.document,
+                    file=SimpleUploadedFile(filename, content),
+                    created_by=self.user,
+                )
+                url = reverse(
+                    "documents:doc-version-download",
+                    args=[self.version.document_id, number],
+                )
+                response = self.client.get(url)
+                self.assertEqual(response["Content-Type"], content_type)
+                self.assertTrue(response["Content-Disposition"].startswith(disposition))
+                self.assertEqual(response["X-Content-Type-Options"], "nosniff")
+
+    def test_proxy_offload(self):
+        with override_settings(DOCUMENT_DOWNLOAD_OFFLOAD="nginx"):
+            response = self.client.get(f"{self.url}?download=1")
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.version.file.name}"
+        )
+        self.assertEqual(response.content, b"")
+        self.assertTrue(response["Content-Disposition"].startswith("attachment"))
+
+        with override_settings(DOCUMENT_DOWNLOAD_OFFLOAD="apache"):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Sendfile"], self.version.file.path)
+
+    def test_access_is_checked(self):
+        other = make_user("other@example.com", "R", "V")
+        self.client.force_authenticate(other)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.tests.helpers import make_user
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class DocumentExportTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("documents:doc-export")
+        self.user = make_user()
+        self.client.force_authenticate(self.user)
+        for i, doc_status in enumerate(["pending", "approved", "pending"]):
+            doc = Document.objects.create(
+                title=f"Doc {i}",
+                created_by=self.user,
+                assigned_to=self.user,
+                reviewer=self.user,
+                status=doc_status,
+                priority=Document.PRIORITY_LOW,
+                tags=["contract", "2024"],
+            )
+            DocumentVersion.objects.create(
+                document=doc, file="documents/a.pdf", created_by=self.user
+            )
+
+    def stream(self, query):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_ndjson_documents(self):
+        lines = self.stream("status=pending").splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row["title"] for row in rows], ["Doc 0", "Doc 2"])
+        self.assertEqual(rows[0]["created_by"], self.user.email)
+        self.assertNotIn("versions", rows[0])
+
+    def test_csv_versions(self):
+        body = self.stream("resource=versions&export_format=csv&status=approved")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["version_number"], "1")
+        self.assertEqual(rows[0]["file"], "documents/a.pdf")
+
+    def test_invalid_parameters(self):
+        for query in ("resource=users", "export_format=xml", "status=lost"):
+            response = self.client.get(f"{self.url}?{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_management_command(self):
+        out = io.StringIO()
+        call_command(
+            "export_documents", "--format=csv", "--filter=status=pending", stdout=out
+        )
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["tags"], "contract,2024")
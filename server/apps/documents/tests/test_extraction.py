@@ -0,0 +1,160 @@
+import io
+import zipfile
+import zlib
+from unittest import mock
+
+from apps.documents.extraction import _pdf_text_builtin, chunk_text
+from apps.documents.jobs import run_pending
+from apps.documents.models import Document, DocumentVersion, VersionTextChunk
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+def make_pdf(text):
+    """
+    A one-page PDF showing ``text`` in Helvetica, with a compressed content
+    stream.
+    """
+    content = zlib.compress(b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode())
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+        % (len(content), content),
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref)
+    )
+    return out.getvalue()
+
+
+def make_docx(*paragraphs):
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr(
+            "word/document.xml",
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+            f'wordprocessingml/2006/main"><w:body>{body}</w:body></w:document>',
+        )
+    return out.getvalue()
+
+
+class TextExtractionTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.doc = Document.objects.create(
+            title="Contract",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+
+    def upload(self, name, content):
+        version = DocumentVersion.objects.create(
+            document=self.doc,
+            file=SimpleUploadedFile(name, content),
+            created_by=self.user,
+        )
+        run_pending()
+        version.refresh_from_db()
+        return version
+
+    def text(self, version):
+        return "".join(
+            version.text_chunks.order_by("position").values_list("content", flat=True)
+        )
+
+    def search(self, text):
+        response = self.client.get(reverse("documents:doc-search"), {"q": text})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_formats(self):
+        cases = [
+            ("notes.txt", "Indemnity clause, café".encode(), "Indemnity clause, café"),
+            ("scan.pdf", make_pdf("Quarterly indemnity (draft)"), "indemnity"),
+            (
+                "memo.docx",
+                make_docx("First line", "Second line"),
+                "First line\nSecond line",
+            ),
+        ]
+        for name, content, expected in cases:
+            with self.subTest(name):
+                version = self.upload(name, content)
+                self.assertTrue(version.text_extracted)
+                self.assertIn(expected, self.text(version))
+
+    def test_binary_files_have_no_text(self):
+        version = self.upload("photo.jpg", b"\xff\xd8\xff\xe0\x00\x10JFIF\x00")
+        self.assertTrue(version.text_extracted)
+        self.assertFalse(version.text_chunks.exists())
+
+    def test_search_matches_latest_version_text(self):
+        self.upload("v1.txt", b"The lessee shall maintain the premises.")
+        [result] = self.search("lessee")
+        self.assertEqual(result["title"], "Contract")
+        self.assertIn("<mark>lessee</mark>", result["highlights"]["content"])
+
+        self.upload("v2.txt", b"The tenant shall maintain the premises.")
+        self.assertEqual(self.search("lessee"), [])
+        self.assertEqual(len(self.search("tenant")), 1)
+
+    def test_backfill_command(self):
+        version = self.upload("notes.txt", b"Arbitration in Vienna")
+        VersionTextChunk.objects.all().delete()
+        DocumentVersion.objects.update(text_extracted=False)
+
+        out = io.StringIO()
+        call_command("extract_version_text", "--now", stdout=out)
+        self.assertIn("Extracted 1 versions", out.getvalue())
+        self.assertIn("Arbitration", self.text(version))
+
+
+class ChunkTextTests(SimpleTestCase):
+    def test_splits_at_whitespace_and_limits(self):
+        pieces = ["alpha beta ", "gamma delta ", "epsilon"]
+        chunks = list(chunk_text(pieces, size=12))
+        self.assertEqual("".join(chunks), "".join(pieces))
+        self.assertTrue(all(len(chunk) <= 12 for chunk in chunks))
+        self.assertEqual(chunks[0], "alpha beta")
+
+        self.assertEqual("".join(chunk_text(pieces, limit=8, size=12)), "alpha be")
+        self.assertEqual(list(chunk_text(["a\x00b"])), ["ab"])
+
+
+class BuiltinPdfTextTests(SimpleTestCase):
+    def test_streams_split_across_reads(self):
+        pdf = make_pdf("Quarterly indemnity (draft)")
+        with mock.patch("apps.documents.extraction.READ_SIZE", 5):
+            text = "".join(_pdf_text_builtin(io.BytesIO(pdf)))
+        self.assertEqual(text, "Quarterly indemnity (draft)\n")
+
+    def test_inflated_streams_are_capped(self):
+        content = b"BT (head) Tj ET" + b" " * (1 << 20) + b"BT (tail) Tj ET"
+        pdf = b"%%PDF-1.4\nstream\n%s\nendstream\n" % zlib.compress(content)
+        with mock.patch("apps.documents.extraction.PDF_STREAM_MAX_BYTES", 4096):
+            text = "".join(_pdf_text_builtin(io.BytesIO(pdf)))
+        self.assertEqual(text, "head\n")
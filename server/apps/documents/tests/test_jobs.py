@@ -0,0 +1,157 @@
+import io
+import threading
+import unittest
+import uuid
+
+import redis
+from apps.documents import jobs
+from apps.documents.models import Job
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.utils import timezone
+
+calls = []
+
+
+def record(*args):
+    calls.append(args)
+
+
+def explode(message):
+    raise RuntimeError(message)
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_runs_enqueued_call(self):
+        jobs.enqueue(record, 1, "two")
+        job = Job.objects.get()
+        self.assertEqual(job.name, "apps.documents.tests.test_jobs:record")
+        self.assertEqual(job.args, [1, "two"])
+
+        self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(calls, [(1, "two")])
+        self.assertFalse(Job.objects.exists())
+
+    def test_retries_with_backoff_then_fails(self):
+        jobs.enqueue(explode, "boom", max_attempts=2)
+        with self.assertLogs("apps.documents.jobs", "WARNING"):
+            self.assertEqual(jobs.run_pending(), 1)
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_QUEUED, 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("RuntimeError: boom", job.last_error)
+        # Not due yet.
+        self.assertEqual(jobs.run_pending(), 0)
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs("apps.documents.jobs", "ERROR"):
+            jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_FAILED, 2))
+        self.assertEqual(jobs.run_pending(), 0)
+
+    def test_expired_lease_is_taken_over(self):
+        jobs.enqueue(record, "again")
+        Job.objects.update(status=Job.STATUS_RUNNING, attempts=1)
+        self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(calls, [("again",)])
+
+    def test_rolled_back_enqueue_is_dropped(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            jobs.enqueue(record)
+            raise RuntimeError
+        self.assertFalse(Job.objects.exists())
+
+
+class RetryDelayTests(SimpleTestCase):
+    @override_settings(DOCUMENT_JOB_RETRY_DELAY=10)
+    def test_exponential_and_capped(self):
+        self.assertEqual(
+            [jobs.retry_delay(n) for n in (1, 2, 3)],
+            [10, 20, 40],
+        )
+        self.assertEqual(jobs.retry_delay(20), jobs.MAX_RETRY_DELAY)
+
+
+class WorkerTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_workers_share_the_queue(self):
+        for i in range(20):
+            jobs.enqueue(record, i)
+        call_command("run_jobs", "--burst", "--concurrency=4", stderr=io.StringIO())
+        self.assertEqual(sorted(calls), [(i,) for i in range(20)])
+        self.assertFalse(Job.objects.exists())
+
+    def test_claim_skips_locked_jobs(self):
+        jobs.enqueue(record, "locked")
+        jobs.enqueue(record, "free")
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_first():
+            with transaction.atomic():
+                Job.objects.select_for_update().filter(args=["locked"]).get()
+                locked.set()
+                release.wait(10)
+            connection.close()
+
+        holder = threading.Thread(target=hold_first)
+        holder.start()
+        try:
+            locked.wait(10)
+            claimed = jobs.DatabaseBackend().claim()
+            self.assertEqual(claimed.args, ["free"])
+            self.assertIsNone(jobs.DatabaseBackend().claim())
+        finally:
+            release.set()
+            holder.join()
+
+
+def redis_available():
+    try:
+        return redis.Redis.from_url(settings.DOCUMENT_JOB_REDIS_URL).ping()
+    except redis.RedisError:
+        return False
+
+
+@unittest.skipUnless(redis_available(), "Redis is not running")
+class RedisBackendTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+        prefix = f"test:{uuid.uuid4().hex}"
+        self.backend = jobs.RedisBackend(settings.DOCUMENT_JOB_REDIS_URL, prefix)
+        self.addCleanup(
+            lambda: self.backend.redis.delete(
+                *self.backend.redis.keys(f"{prefix}:*") or ["none"]
+            )
+        )
+
+    def test_pushed_on_commit_and_retried(self):
+        with transaction.atomic():
+            self.backend.enqueue("apps.documents.tests.test_jobs:record", [], 3)
+            self.backend.enqueue("apps.documents.tests.test_jobs:explode", ["x"], 2)
+            self.assertIsNone(self.backend.claim())
+
+        with self.assertLogs("apps.documents.jobs", "WARNING"):
+            self.assertEqual(jobs.run_pending(self.backend), 2)
+        self.assertEqual(calls, [()])
+        self.assertEqual(self.backend.redis.zcard(self.backend.delayed), 1)
+
+        # Make the retry due.
+        [item] = self.backend.redis.zrange(self.backend.delayed, 0, -1)
+        self.backend.redis.zadd(self.backend.delayed, {item: 0})
+        with self.assertLogs("apps.documents.jobs", "ERROR"):
+            self.assertEqual(jobs.run_pending(self.backend), 1)
+        self.assertEqual(self.backend.redis.llen(self.backend.failed), 1)
+        self.assertEqual(self.backend.redis.zcard(self.backend.running), 0)
@@ -0,0 +1,97 @@
+import io
+import shutil
+import unittest
+from unittest import mock
+
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.jobs import run_pending
+from apps.documents.renditions import rendition_name
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+def image_bytes(fmt, size=(800, 400), mode="RGBA"):
+    out = io.BytesIO()
+    Image.new(mode, size, "red").save(out, fmt)
+    return out.getvalue()
+
+
+class RenditionTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.doc = Document.objects.create(
+            title="Scan",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+
+    def upload(self, name, content):
+        return DocumentVersion.objects.create(
+            document=self.doc,
+            file=SimpleUploadedFile(name, content),
+            created_by=self.user,
+        )
+
+    def get(self, version, size):
+        url = reverse(
+            "documents:doc-version-rendition",
+            args=[self.doc.document_id, version.version_number, size],
+        )
+        return self.client.get(url)
+
+    def test_rendered_lazily_and_cached(self):
+        version = self.upload("scan.png", image_bytes("PNG"))
+        self.assertFalse(
+            default_storage.exists(rendition_name(version.pk, "thumbnail"))
+        )
+
+        response = self.get(version, "thumbnail")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", response["Cache-Control"])
+        with Image.open(io.BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.size, (256, 128))
+        self.assertTrue(default_storage.exists(rendition_name(version.pk, "thumbnail")))
+
+        response = self.get(version, "thumbnail")
+        etag = response["ETag"]
+        url = response.wsgi_request.path
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_job_generates_every_size_and_delete_cleans_up(self):
+        version = self.upload("photo.jpg", image_bytes("JPEG", (2000, 3000), "RGB"))
+        run_pending()
+        for size in ("thumbnail", "preview"):
+            self.assertTrue(default_storage.exists(rendition_name(version.pk, size)))
+
+        pk = version.pk
+        version.delete()
+        run_pending()
+        self.assertFalse(default_storage.exists(rendition_name(pk, "preview")))
+
+    def test_unsupported_files_and_sizes(self):
+        version = self.upload("notes.txt", b"plain text")
+        response = self.get(version, "thumbnail")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        self.assertEqual(self.get(version, "poster").status_code, 404)
+
+    def test_decompression_bombs_are_refused(self):
+        version = self.upload("scan.png", image_bytes("PNG"))
+        # Pillow refuses images over twice this many pixels outright.
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+            response = self.get(version, "thumbnail")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    @unittest.skipUnless(shutil.which("pdftoppm"), "poppler is not installed")
+    def test_pdf_first_page(self):
+        version = self.upload("scan.pdf", image_bytes("PDF", mode="RGB"))
+        response = self.get(version, "preview")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
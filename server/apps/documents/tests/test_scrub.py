@@ -0,0 +1,130 @@
+import hashlib
+import io
+import os
+import shutil
+from unittest import mock
+
+from apps.documents import scrub
+from apps.documents.models import Document, DocumentVersion, ScrubCheckpoint
+from apps.documents.scrub import Throttle, scrub_shard
+from apps.documents.storage import version_storage
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+
+class ScrubTests(OwnerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_cold_storage()
+        self.doc = Document.objects.create(
+            title="Ledger",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+        self.versions = [self.upload(f"entry {i}\n".encode() * 50) for i in range(4)]
+
+    def upload(self, content):
+        return DocumentVersion.objects.create(
+            document=self.doc,
+            file=SimpleUploadedFile("ledger.txt", content),
+            created_by=self.user,
+        )
+
+    def path(self, version):
+        return version_storage.path(version.file.name)
+
+    def run_scrub(self, *args):
+        out = io.StringIO()
+        call_command("scrub", "--rate", "0", *args, stdout=out)
+        return out.getvalue()
+
+    def test_checksum_recorded_at_upload(self):
+        version = self.upload(b"ledger contents")
+        self.assertEqual(version.sha256, hashlib.sha256(b"ledger contents").hexdigest())
+        self.assertEqual(version.size, 15)
+
+    def test_intact_files(self):
+        self.assertIn("intact", self.run_scrub())
+        checkpoint = ScrubCheckpoint.objects.get(shard=0, shards=1)
+        self.assertEqual(checkpoint.checked, 4)
+        self.assertEqual(checkpoint.last_version_id, self.versions[-1].pk)
+        self.assertIsNotNone(checkpoint.finished_at)
+
+    def test_reports_damaged_and_missing_files(self):
+        with open(self.path(self.versions[0]), "r+b") as f:
+            f.write(b"E")
+        with open(self.path(self.versions[1]), "r+b") as f:
+            f.truncate(10)
+        os.remove(self.path(self.versions[2]))
+
+        problems = {p.version_id: p.kind for p in scrub_shard(batch_size=2)}
+        self.assertEqual(
+            problems,
+            {
+                self.versions[0].pk: scrub.CHECKSUM_MISMATCH,
+                self.versions[1].pk: scrub.SIZE_MISMATCH,
+                self.versions[2].pk: scrub.MISSING,
+            },
+        )
+        with self.assertRaisesMessage(CommandError, "3 damaged or missing files"):
+            self.run_scrub()
+
+    def test_resumes_from_checkpoint(self):
+        calls = []
+
+        def check(version, throttle):
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            calls.append(version.pk)
+
+        with mock.patch("apps.documents.scrub.check_version", side_effect=check):
+            with self.assertRaises(KeyboardInterrupt):
+                scrub_shard(batch_size=2)
+            checkpoint = ScrubCheckpoint.objects.get()
+            self.assertEqual(checkpoint.last_version_id, self.versions[1].pk)
+            self.assertIsNone(checkpoint.finished_at)
+
+            calls.clear()
+            scrub_shard(batch_size=2)
+        self.assertEqual(calls, [v.pk for v in self.versions[2:]])
+        self.assertEqual(ScrubCheckpoint.objects.get().checked, 4)
+
+    def test_shards_split_the_versions(self):
+        seen = []
+        with mock.patch(
+            "apps.documents.scrub.check_version",
+            side_effect=lambda version, throttle: seen.append(version.pk),
+        ):
+            scrub_shard(0, 2)
+            scrub_shard(1, 2)
+        self.assertEqual(sorted(seen), sorted(v.pk for v in self.versions))
+        self.assertEqual(ScrubCheckpoint.objects.count(), 2)
+
+    def test_records_missing_checksums(self):
+        version = self.versions[0]
+        DocumentVersion.objects.filter(pk=version.pk).update(sha256="")
+        self.assertEqual(scrub_shard(), [])
+        version.refresh_from_db()
+        self.assertEqual(version.sha256, version_storage.digest(version.file.name))
+
+    def test_compressed_and_cold_files(self):
+        with self.settings(DOCUMENT_STORAGE_COMPRESSION="zlib"):
+            version = self.upload(b"compressible " * 1000)
+        self.assertTrue(version_storage.is_compressed(version.file.name))
+        cold_path = os.path.join(self.cold_root, version.file.name)
+        os.makedirs(os.path.dirname(cold_path))
+        shutil.move(self.path(version), cold_path)
+
+        self.assertEqual(scrub_shard(), [])
+        # Read in place, not brought back to the hot volume.
+        self.assertFalse(os.path.exists(self.path(version)))
+
+    def test_throttle(self):
+        throttle = Throttle(rate=1000)
+        with mock.patch("apps.documents.scrub.time.sleep") as sleep:
+            throttle.consume(500)
+        self.assertAlmostEqual(sleep.call_args[0][0], 0.5, places=1)
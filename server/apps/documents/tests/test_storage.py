@@ -0,0 +1,100 @@
+import hashlib
+import io
+import os
+
+from apps.documents.jobs import run_pending
+from apps.documents.models import Blob, Document, DocumentVersion
+from apps.documents.storage import version_storage
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+
+PDF = b"%PDF-1.4 identical bytes"
+
+
+class ContentAddressedStorageTests(OwnerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.docs = [self.create_document(f"Doc {i}") for i in range(2)]
+
+    def create_document(self, title):
+        return Document.objects.create(
+            title=title,
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+
+    def upload(self, doc, name="scan.pdf", content=PDF):
+        return DocumentVersion.objects.create(
+            document=doc,
+            file=SimpleUploadedFile(name, content),
+            created_by=self.user,
+        )
+
+    def stored_files(self):
+        return [
+            os.path.join(root, name)
+            for root, _, names in os.walk(self.media_root)
+            for name in names
+        ]
+
+    def test_duplicates_share_one_file(self):
+        first = self.upload(self.docs[0], "contract.PDF")
+        second = self.upload(self.docs[1], "copy.pdf")
+        sha256 = hashlib.sha256(PDF).hexdigest()
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(
+            first.file.name, f"documents/{sha256[:2]}/{sha256[2:4]}/{sha256}.pdf"
+        )
+        self.assertEqual(
+            [first.filename, second.filename], ["contract.PDF", "copy.pdf"]
+        )
+        self.assertEqual(len(self.stored_files()), 1)
+        blob = Blob.objects.get()
+        self.assertEqual(
+            (blob.sha256, blob.size, blob.ref_count), (sha256, len(PDF), 2)
+        )
+
+    def test_file_removed_with_last_reference(self):
+        first = self.upload(self.docs[0])
+        self.upload(self.docs[1])
+        self.upload(self.docs[1], content=b"other")
+        first.delete()
+        run_pending()
+        self.assertEqual(Blob.objects.get(name=first.file.name).ref_count, 1)
+        self.assertTrue(version_storage.exists(first.file.name))
+
+        self.docs[1].delete()
+        run_pending()
+        self.assertFalse(Blob.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_dedupe_legacy_files(self):
+        os.makedirs(os.path.join(self.media_root, "documents"))
+        legacy = []
+        for i, doc in enumerate(self.docs):
+            name = f"documents/scan_{i}.pdf"
+            with open(os.path.join(self.media_root, name), "wb") as f:
+                f.write(PDF)
+            legacy.append(
+                DocumentVersion(
+                    document=doc,
+                    version_number=1,
+                    file=name,
+                    filename=f"scan_{i}.pdf",
+                    created_by=self.user,
+                )
+            )
+        DocumentVersion.objects.bulk_create(legacy)
+
+        out = io.StringIO()
+        call_command("dedupe_versions", stdout=out)
+        self.assertIn("1 were duplicates", out.getvalue())
+        names = set(DocumentVersion.objects.values_list("file", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertEqual(Blob.objects.get().ref_count, 2)
+        self.assertEqual(len(self.stored_files()), 1)
@@ -0,0 +1,58 @@
+from apps.documents.models import Document
+from apps.documents.tests.helpers import make_user
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class DocumentTagTests(APITestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client.force_authenticate(self.user)
+        self.create("A", ["contract", "legal"])
+        self.create("B", ["contract", "finance"], status=Document.STATUS_APPROVED)
+        self.create("C", ["Contractor", "legal"])
+        self.create("D", None)
+
+    def create(self, title, tags, **extra):
+        return Document.objects.create(
+            title=title,
+            tags=tags,
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+            **extra,
+        )
+
+    def titles(self, query):
+        response = self.client.get(f"{reverse('documents:doc-list')}?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(doc["title"] for doc in response.data["results"])
+
+    def test_any_and_all_tag_filters(self):
+        self.assertEqual(self.titles("tags=finance,legal"), ["A", "B", "C"])
+        self.assertEqual(self.titles("tags_all=contract,legal"), ["A"])
+
+    def test_facets(self):
+        response = self.client.get(reverse("documents:doc-tags"))
+        self.assertEqual(
+            response.data,
+            [
+                {"tag": "contract", "count": 2},
+                {"tag": "legal", "count": 2},
+                {"tag": "Contractor", "count": 1},
+                {"tag": "finance", "count": 1},
+            ],
+        )
+
+    def test_facets_scoped_and_prefixed(self):
+        url = reverse("documents:doc-tags")
+        response = self.client.get(f"{url}?status=pending&prefix=CON&limit=1")
+        self.assertEqual(response.data, [{"tag": "Contractor", "count": 1}])
+
+        response = self.client.get(f"{url}?prefix=%25")
+        self.assertEqual(response.data, [])
+
+        response = self.client.get(f"{url}?status=lost")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
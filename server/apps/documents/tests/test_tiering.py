@@ -0,0 +1,113 @@
+import os
+
+from apps.documents.jobs import run_pending
+from apps.documents.models import Blob, Document, DocumentVersion
+from apps.documents.storage import cold_storage, version_storage
+from apps.documents.tests.helpers import OwnerMixin
+from apps.documents.tiering import trim_cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+CONTENT = b"%PDF-1.4 signed contract"
+
+
+@override_settings(DOCUMENT_COLD_AFTER_DAYS=0, DOCUMENT_HOT_CACHE_BYTES=0)
+class StorageTieringTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_cold_storage()
+        self.doc = self.create_document("Contract", Document.STATUS_ARCHIVED)
+        self.version = self.upload(self.doc)
+        self.name = self.version.file.name
+        run_pending()
+
+    def create_document(self, title, status=Document.STATUS_PENDING):
+        return Document.objects.create(
+            title=title,
+            status=status,
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+
+    def upload(self, doc, content=CONTENT):
+        return DocumentVersion.objects.create(
+            document=doc,
+            file=SimpleUploadedFile("contract.pdf", content),
+            created_by=self.user,
+        )
+
+    def tier(self):
+        return Blob.objects.get(name=self.name).tier
+
+    def is_hot(self):
+        return os.path.exists(version_storage.path(self.name))
+
+    def download(self):
+        url = reverse("documents:doc-version-download", args=[self.doc.document_id, 1])
+        return b"".join(self.client.get(url).streaming_content)
+
+    def test_archived_files_move_and_come_back_on_read(self):
+        call_command("tier_storage", "--now", stdout=open(os.devnull, "w"))
+        self.assertEqual(self.tier(), Blob.TIER_COLD)
+        self.assertFalse(self.is_hot())
+        self.assertTrue(cold_storage().exists(self.name))
+
+        self.assertEqual(self.download(), CONTENT)
+        self.assertEqual(self.tier(), Blob.TIER_CACHED)
+        self.assertTrue(self.is_hot())
+
+        self.assertEqual(trim_cache(), 1)
+        self.assertEqual(self.tier(), Blob.TIER_COLD)
+        self.assertFalse(self.is_hot())
+        self.assertEqual(self.download(), CONTENT)
+
+    def test_active_and_shared_files_stay_hot(self):
+        active = self.create_document("Draft")
+        self.upload(active, b"%PDF-1.4 draft")
+        # Same content as the archived version, so the file is shared.
+        self.upload(active)
+        call_command("tier_storage", "--now", stdout=open(os.devnull, "w"))
+        self.assertEqual(set(Blob.objects.values_list("tier", flat=True)), {"hot"})
+        self.assertEqual(os.listdir(self.cold_root), [])
+
+    def test_recently_archived_files_stay_hot(self):
+        with self.settings(DOCUMENT_COLD_AFTER_DAYS=30):
+            call_command("tier_storage", "--now", stdout=open(os.devnull, "w"))
+        self.assertEqual(self.tier(), Blob.TIER_HOT)
+
+    def test_queued_and_brought_back_when_active_again(self):
+        call_command("tier_storage", stdout=open(os.devnull, "w"))
+        run_pending()
+        self.assertEqual(self.tier(), Blob.TIER_COLD)
+
+        self.doc.status = Document.STATUS_PENDING
+        self.doc.save()
+        call_command("tier_storage", stdout=open(os.devnull, "w"))
+        with self.captureOnCommitCallbacks(execute=True):
+            run_pending()
+        self.assertEqual(self.tier(), Blob.TIER_HOT)
+        self.assertTrue(self.is_hot())
+        self.assertFalse(cold_storage().exists(self.name))
+
+    def test_cache_keeps_most_recently_read(self):
+        other = self.upload(self.doc, b"%PDF-1.4 annex")
+        call_command("tier_storage", "--now", stdout=open(os.devnull, "w"))
+        self.download()
+        url = reverse("documents:doc-version-download", args=[self.doc.document_id, 2])
+        b"".join(self.client.get(url).streaming_content)
+
+        self.assertEqual(trim_cache(limit=len(CONTENT)), 1)
+        self.assertEqual(self.tier(), Blob.TIER_COLD)
+        self.assertEqual(Blob.objects.get(name=other.file.name).tier, Blob.TIER_CACHED)
+
+    def test_purge_removes_cold_copy(self):
+        call_command("tier_storage", "--now", stdout=open(os.devnull, "w"))
+        self.doc.delete()
+        run_pending()
+        self.assertFalse(cold_storage().exists(self.name))
+        self.assertFalse(self.is_hot())
@@ -0,0 +1,136 @@
+import hashlib
+import io
+import zipfile
+from unittest import mock
+
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.sniffing import sniff_content_type
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 10
+
+
+@override_settings(DOCUMENT_UPLOAD_MAX_BYTES=4096)
+class StreamingUploadTests(OwnerMixin, APITestCase):
+    def create(self, content, filename="report.pdf"):
+        return self.client.post(
+            reverse("documents:doc-list"),
+            {
+                "title": "Report",
+                "assignee_id": str(self.user.user_id),
+                "reviewer_id": str(self.user.user_id),
+                "priority": Document.PRIORITY_LOW,
+                "file": SimpleUploadedFile(filename, content),
+            },
+            format="multipart",
+        )
+
+    def test_metadata_computed_while_receiving(self):
+        # The stored file is named by the handler's digest, not a second read.
+        with mock.patch(
+            "apps.documents.storage.file_digest", side_effect=AssertionError
+        ):
+            response = self.create(PDF)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        version = DocumentVersion.objects.get()
+        self.assertEqual(version.sha256, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(version.size, len(PDF))
+        self.assertEqual(version.content_type, "application/pdf")
+        self.assertTrue(version.file.name.endswith(f"{version.sha256}.pdf"))
+
+    def test_type_comes_from_content(self):
+        self.create(b"plain minutes of the meeting\n", filename="minutes.pdf")
+        self.assertEqual(DocumentVersion.objects.get().content_type, "text/plain")
+
+    def test_oversized_upload_stopped(self):
+        response = self.create(PDF + PDF)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(Document.objects.exists())
+
+    def test_declared_length_refused_before_reading(self):
+        with mock.patch(
+            "apps.documents.upload_handlers.StreamingUploadHandler",
+            side_effect=AssertionError,
+        ):
+            response = self.create(PDF * 40)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_per_user_limit(self):
+        self.user.max_upload_bytes = 0
+        self.user.save()
+        self.assertEqual(self.create(PDF + PDF).status_code, status.HTTP_201_CREATED)
+
+        self.user.max_upload_bytes = 100
+        self.user.save()
+        doc = Document.objects.get()
+        response = self.client.post(
+            reverse("documents:doc-detail", args=[doc.document_id]) + "versions/",
+            {"file": SimpleUploadedFile("report.pdf", PDF)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(DocumentVersion.objects.count(), 1)
+
+    def test_upload_session_over_limit(self):
+        self.create(PDF)
+        response = self.client.post(
+            reverse("documents:doc-upload-list"),
+            {
+                "document_id": str(Document.objects.get().document_id),
+                "filename": "scan.pdf",
+                "size": 5000,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+
+class SniffingTests(SimpleTestCase):
+    def zip_bytes(self, *entries, method=zipfile.ZIP_DEFLATED):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for name, data in entries:
+                info = zipfile.ZipInfo(name)
+                info.compress_type = method
+                archive.writestr(info, data)
+        return buffer.getvalue()
+
+    def test_signatures(self):
+        self.assertEqual(sniff_content_type(PDF), "application/pdf")
+        self.assertEqual(sniff_content_type(b"\x89PNG\r\n\x1a\n\x00\x00"), "image/png")
+        self.assertEqual(sniff_content_type(b"\xff\xd8\xff\xe0"), "image/jpeg")
+        self.assertEqual(
+            sniff_content_type(b"\x00\x01\x02"), "application/octet-stream"
+        )
+        self.assertEqual(sniff_content_type(b""), "application/octet-stream")
+
+    def test_containers(self):
+        ooxml = self.zip_bytes(("[Content_Types].xml", b"<Types/>"))
+        self.assertEqual(
+            sniff_content_type(ooxml, "memo.docx"),
+            "application/vnd.openxmlformats-officedocument"
+            ".wordprocessingml.document",
+        )
+        self.assertEqual(sniff_content_type(ooxml, "memo.pdf"), "application/zip")
+        odf = self.zip_bytes(
+            ("mimetype", b"application/vnd.oasis.opendocument.text"),
+            method=zipfile.ZIP_STORED,
+        )
+        self.assertEqual(
+            sniff_content_type(odf), "application/vnd.oasis.opendocument.text"
+        )
+
+    def test_text(self):
+        self.assertEqual(sniff_content_type("Zürich".encode()[:2]), "text/plain")
+        self.assertEqual(
+            sniff_content_type(b"<?xml version='1.0'?>"), "application/xml"
+        )
+        self.assertEqual(
+            sniff_content_type(b"\xff\xfe\xfa" * 10), "application/octet-stream"
+        )
@@ -0,0 +1,188 @@
+import hashlib
+import io
+import os
+import time
+from unittest import mock
+
+from apps.documents.models import Document, DocumentVersion, UploadSession
+from apps.documents.tests.helpers import OwnerMixin, make_user
+from apps.documents.uploads import write_chunk
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+CONTENT = b"%PDF-1.4 " + bytes(range(256)) * 40
+
+
+class ResumableUploadTests(OwnerMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.doc = Document.objects.create(
+            title="Scan",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+
+    def start(self, size=len(CONTENT)):
+        response = self.client.post(
+            reverse("documents:doc-upload-list"),
+            {
+                "document_id": str(self.doc.document_id),
+                "filename": "scan.pdf",
+                "size": size,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response
+
+    def send(self, url, offset, data, content_type="application/offset+octet-stream"):
+        return self.client.patch(
+            url, data, content_type=content_type, HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_chunked_upload_becomes_a_version(self):
+        url = self.start()["Location"]
+        response = self.send(url, 0, CONTENT[:4000])
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response["Upload-Offset"], "4000")
+
+        # Resume from the offset the server reports.
+        offset = int(self.client.head(url)["Upload-Offset"])
+        self.assertEqual(offset, 4000)
+        self.send(url, offset, CONTENT[offset:])
+
+        session = UploadSession.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("documents:doc-upload-finalize", args=[session.id])
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["version_number"], 1)
+        self.assertEqual(response.data["filename"], "scan.pdf")
+
+        version = DocumentVersion.objects.get()
+        self.assertIn(hashlib.sha256(CONTENT).hexdigest(), version.file.name)
+        with version.file.open("rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "uploads")), [])
+
+    def test_failed_finalize_can_be_retried(self):
+        url = self.start()["Location"]
+        self.send(url, 0, CONTENT)
+        finalize = reverse(
+            "documents:doc-upload-finalize", args=[UploadSession.objects.get().id]
+        )
+        with mock.patch.object(
+            UploadSession, "delete", side_effect=DatabaseError("lost connection")
+        ):
+            with self.assertRaises(DatabaseError):
+                self.client.post(finalize)
+        self.assertFalse(DocumentVersion.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(finalize)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with DocumentVersion.objects.get().file.open("rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "uploads")), [])
+
+    def test_lost_part_file_ends_the_session(self):
+        url = self.start()["Location"]
+        self.send(url, 0, CONTENT)
+        session = UploadSession.objects.get()
+        os.remove(os.path.join(self.media_root, session.part_name))
+
+        response = self.client.post(
+            reverse("documents:doc-upload-finalize", args=[session.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_offset_and_size_are_enforced(self):
+        url = self.start(size=10)["Location"]
+        response = self.send(url, 3, b"abc")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response["Upload-Offset"], "0")
+
+        response = self.send(url, 0, b"x" * 11)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        response = self.send(url, 0, b"abc", content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+        self.send(url, 0, b"abc")
+        session = UploadSession.objects.get()
+        response = self.client.post(
+            reverse("documents:doc-upload-finalize", args=[session.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(DocumentVersion.objects.exists())
+
+    def test_sessions_are_private_and_can_be_aborted(self):
+        url = self.start()["Location"]
+        other = make_user("other@example.com", "R", "V")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.head(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.user)
+        self.assertEqual(
+            self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT
+        )
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "uploads")), [])
+
+    def test_invalid_session(self):
+        response = self.client.post(
+            reverse("documents:doc-upload-list"),
+            {"document_id": "nope", "filename": "scan.pdf", "size": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(DOCUMENT_UPLOAD_CHUNK_MAX_BYTES=1000)
+    def test_chunk_length_is_capped(self):
+        url = self.start()["Location"]
+        response = self.send(url, 0, CONTENT[:1001])
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(response["Upload-Offset"], "0")
+        self.assertEqual(self.send(url, 0, CONTENT[:1000])["Upload-Offset"], "1000")
+
+    def test_offset_moved_during_write_is_kept(self):
+        self.start()
+        session = UploadSession.objects.get()
+
+        class Racing(io.BytesIO):
+            # Another request for the same session finishes first.
+            def read(self, size=-1):
+                UploadSession.objects.filter(pk=session.pk).update(offset=2000)
+                return super().read(size)
+
+        session = write_chunk(session, 0, Racing(CONTENT[:1000]), 1000)
+        self.assertEqual(session.offset, 2000)
+
+    def test_expired_sessions_are_collected(self):
+        url = self.start()["Location"]
+        self.send(url, 0, CONTENT[:100])
+        session = UploadSession.objects.get()
+        UploadSession.objects.update(expires_at=timezone.now())
+        self.assertEqual(self.client.head(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        stray = os.path.join(self.media_root, "uploads", "not-a-session.part")
+        with open(stray, "wb") as f:
+            f.write(b"left behind")
+        old = time.time() - 3 * 86400
+        os.utime(stray, (old, old))
+
+        out = io.StringIO()
+        call_command("collect_garbage", stdout=out)
+        self.assertIn("1 expired upload sessions", out.getvalue())
+        self.assertFalse(UploadSession.objects.filter(pk=session.pk).exists())
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "uploads")), [])
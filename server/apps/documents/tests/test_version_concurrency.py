@@ -0,0 +1,56 @@
+import threading
+
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TransactionTestCase
+
+
+class ConcurrentUploadTests(OwnerMixin, TransactionTestCase):
+    uploads = 12
+
+    def setUp(self):
+        super().setUp()
+        self.doc = Document.objects.create(
+            title="Doc",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+
+    def upload(self, barrier, errors):
+        try:
+            barrier.wait()
+            DocumentVersion.objects.create(
+                document_id=self.doc.pk,
+                file=SimpleUploadedFile("scan.pdf", b"%PDF-1.4"),
+                created_by=self.user,
+            )
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def test_parallel_uploads_get_consecutive_numbers(self):
+        barrier = threading.Barrier(self.uploads)
+        errors = []
+        threads = [
+            threading.Thread(target=self.upload, args=(barrier, errors))
+            for _ in range(self.uploads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        numbers = DocumentVersion.objects.filter(document=self.doc).values_list(
+            "version_number", flat=True
+        )
+        self.assertEqual(sorted(numbers), list(range(1, self.uploads + 1)))
+        self.doc.refresh_from_db()
+        self.assertEqual(self.doc.version_count, self.uploads)
+        self.assertEqual(self.doc.last_version_number, self.uploads)
+        self.assertEqual(self.doc.latest_version.version_number, self.uploads)
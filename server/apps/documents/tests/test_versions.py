@@ -0,0 +1,64 @@
+from apps.documents.models import Document, DocumentVersion
+from apps.documents.tests.helpers import OwnerMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+
+class DocumentVersionCounterTests(OwnerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.doc = Document.objects.create(
+            title="Doc",
+            created_by=self.user,
+            assigned_to=self.user,
+            reviewer=self.user,
+            priority=Document.PRIORITY_LOW,
+        )
+
+    def upload(self):
+        return DocumentVersion.objects.create(
+            document=self.doc,
+            file=SimpleUploadedFile("scan.pdf", b"%PDF-1.4"),
+            created_by=self.user,
+        )
+
+    def assertCounters(self, latest, count, last_number):
+        for doc in (self.doc, Document.objects.get(pk=self.doc.pk)):
+            self.assertEqual(doc.latest_version_id, latest.pk if latest else None)
+            self.assertEqual(doc.version_count, count)
+            self.assertEqual(doc.last_version_number, last_number)
+
+    def test_upload_allocates_with_one_update(self):
+        first = self.upload()
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.upload()
+        statements = [q["sql"].split()[0] for q in ctx.captured_queries]
+        # Allocate the number, lock and reference the stored file, insert the
+        # version, update the counters, queue the rendition and text jobs.
+        self.assertEqual(
+            [s for s in statements if s not in ("SAVEPOINT", "RELEASE")],
+            ["UPDATE", "SELECT", "INSERT", "INSERT", "UPDATE", "INSERT", "INSERT"],
+        )
+        self.assertEqual([first.version_number, second.version_number], [1, 2])
+        self.assertCounters(second, 2, 2)
+
+    def test_delete_moves_latest_back_without_reusing_numbers(self):
+        first = self.upload()
+        second = self.upload()
+        second.delete()
+        self.assertCounters(first, 1, 2)
+        self.assertEqual(self.upload().version_number, 3)
+
+        DocumentVersion.objects.get(version_number=3).delete()
+        first.delete()
+        self.assertCounters(None, 0, 3)
+
+    def test_stale_document_save_keeps_counters(self):
+        stale = Document.objects.get(pk=self.doc.pk)
+        latest = self.upload()
+        stale.title = "Renamed"
+        stale.save()
+        self.assertCounters(latest, 1, 1)
+        self.assertEqual(Document.objects.get(pk=self.doc.pk).title, "Renamed")
@@ -0,0 +1,123 @@
+import threading
+
+from apps.documents.models import Document, WorkQueueItem
+from apps.documents.tests.helpers import MediaRootMixin, make_user
+from apps.documents.work_queue import sync_work_queue
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class WorkQueueTests(MediaRootMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.creator = make_user("creator@example.com", "C", "R")
+        self.reviewer = make_user("reviewer@example.com", "R", "V")
+        self.client.force_authenticate(self.creator)
+        response = self.client.post(
+            reverse("documents:doc-list"),
+            {
+                "title": "Contract",
+                "file": SimpleUploadedFile("contract.pdf", b"%PDF-1.4"),
+                "assignee_id": str(self.creator.user_id),
+                "reviewer_id": str(self.reviewer.user_id),
+                "priority": Document.PRIORITY_HIGH,
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.doc = Document.objects.get()
+
+    def queue(self, user):
+        return list(
+            WorkQueueItem.objects.filter(user=user).values_list("action", flat=True)
+        )
+
+    def act(self, action):
+        url = reverse(
+            "document-actions:doc-actions",
+            kwargs={"document_id": self.doc.document_id, "action": action},
+        )
+        return self.client.put(url, {"review_notes": "ok"}, format="json")
+
+    def test_transitions_move_the_document_between_queues(self):
+        self.assertEqual(self.queue(self.reviewer), ["review"])
+        self.assertEqual(self.queue(self.creator), [])
+
+        self.act("approve")
+        self.assertEqual(self.queue(self.reviewer), [])
+        self.assertEqual(self.queue(self.creator), ["sign"])
+
+        self.act("esign")
+        self.assertFalse(WorkQueueItem.objects.exists())
+
+    def test_rejection_and_resubmission(self):
+        self.act("reject")
+        self.assertEqual(self.queue(self.creator), ["resubmit"])
+
+        response = self.client.put(
+            reverse("documents:doc-detail", args=[self.doc.document_id]),
+            {"title": "Contract v2", "description": "Fixed"},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.queue(self.creator), [])
+        item = WorkQueueItem.objects.get(user=self.reviewer)
+        self.assertEqual(item.title, "Contract v2")
+
+    def test_my_queue_reads_only_the_queue(self):
+        self.client.force_authenticate(self.reviewer)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("documents:doc-queue"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [item] = response.data["results"]
+        self.assertEqual(item["document_id"], str(self.doc.document_id))
+        self.assertEqual(item["action"], "review")
+        self.assertEqual(item["priority"], "high")
+
+        response = self.client.get(f"{reverse('documents:doc-queue')}?action=sign")
+        self.assertEqual(response.data["results"], [])
+        response = self.client.get(f"{reverse('documents:doc-queue')}?action=nap")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConcurrentSyncTests(TransactionTestCase):
+    syncs = 8
+
+    def setUp(self):
+        user = make_user()
+        self.doc = Document.objects.create(
+            title="Doc",
+            created_by=user,
+            assigned_to=user,
+            reviewer=user,
+            priority=Document.PRIORITY_LOW,
+        )
+
+    def sync(self, barrier, errors):
+        try:
+            barrier.wait()
+            with transaction.atomic():
+                sync_work_queue(Document.objects.get(pk=self.doc.pk))
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def test_parallel_syncs_insert_each_row_once(self):
+        barrier = threading.Barrier(self.syncs)
+        errors = []
+        threads = [
+            threading.Thread(target=self.sync, args=(barrier, errors))
+            for _ in range(self.syncs)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(WorkQueueItem.objects.filter(document=self.doc).count(), 1)
@@ -0,0 +1,166 @@
+"""
+Storage tiers for version files.
+
+A stored file (a ``Blob``) is in one of three tiers:
+
+``hot``
+    only on the hot volume of ``version_storage``;
+``cold``
+    only in ``cold_storage()``;
+``cached``
+    in cold storage, with a copy on the hot volume that may be dropped.
+
+``tier_storage`` queues ``tier_blob`` for files whose versions all belong to
+documents archived ``DOCUMENT_COLD_AFTER_DAYS`` ago, which copies them to
+cold storage, and for cold files that an active document uses again, which
+brings them back for good. Reading a cold file through ``version_storage``
+rehydrates it into the cache; ``trim_cache`` keeps the cached copies under
+``DOCUMENT_HOT_CACHE_BYTES`` by dropping those brought back longest ago.
+
+Files are copied between tiers as stored, compressed or not. Every change
+holds the blob's advisory lock, so it cannot race uploads or purges of the
+same file.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from apps.documents.models import Blob, Document, DocumentVersion
+from apps.documents.models.blob import LOCK_BLOB_SQL
+from apps.documents.storage import cold_storage, version_storage
+from django.conf import settings
+from django.core.files import File
+from django.db import connection, transaction
+from django.db.models import Exists, F, OuterRef, Q, Sum
+from django.utils import timezone
+
+
+def _lock(name):
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_BLOB_SQL, [name])
+
+
+def _active_versions():
+    return DocumentVersion.objects.filter(blob=OuterRef("pk")).exclude(
+        document__status=Document.STATUS_ARCHIVED
+    )
+
+
+def _recent_versions(cutoff):
+    return DocumentVersion.objects.filter(blob=OuterRef("pk")).filter(
+        ~Q(document__status=Document.STATUS_ARCHIVED)
+        | Q(document__updated_at__gt=cutoff)
+    )
+
+
+def cold_after():
+    return timezone.now() - timedelta(days=settings.DOCUMENT_COLD_AFTER_DAYS)
+
+
+def candidates():
+    """
+    Names of the blobs ``tier_blob`` would move: hot ones only archived
+    documents use, and cold or cached ones an active document uses.
+    """
+    to_cold = Blob.objects.filter(tier=Blob.TIER_HOT, ref_count__gt=0).exclude(
+        Exists(_recent_versions(cold_after()))
+    )
+    to_hot = Blob.objects.exclude(tier=Blob.TIER_HOT).filter(Exists(_active_versions()))
+    return to_cold.values_list("name", flat=True).union(
+        to_hot.values_list("name", flat=True)
+    )
+
+
+def tier_blob(name):
+    """
+    Move the file ``name`` to the tier its documents call for.
+    """
+    with transaction.atomic():
+        _lock(name)
+        blob = Blob.objects.filter(name=name).first()
+        if blob is None:
+            return
+        blobs = Blob.objects.filter(name=name)
+        if blob.tier != Blob.TIER_HOT:
+            if blobs.filter(Exists(_active_versions())).exists():
+                version_storage.local_path(name)
+                blobs.update(tier=Blob.TIER_HOT, accessed_at=None)
+                transaction.on_commit(lambda: cold_storage().delete(name))
+        elif not blobs.filter(Exists(_recent_versions(cold_after()))).exists():
+            _copy_to_cold(name)
+            # The hot copy stays as the least recently used cache entry.
+            blobs.update(tier=Blob.TIER_CACHED, accessed_at=None)
+
+
+def _copy_to_cold(name):
+    cold = cold_storage()
+    path = version_storage.path(name)
+    size = os.path.getsize(path)
+    if cold.exists(name):
+        if cold.size(name) == size:
+            return
+        # Left incomplete by an interrupted copy.
+        cold.delete(name)
+    with open(path, "rb") as f:
+        saved = cold.save(name, File(f))
+    if saved != name or cold.size(name) != size:
+        cold.delete(saved)
+        raise OSError(f"Copying {name} to cold storage failed.")
+
+
+def rehydrate(name):
+    """
+    Copy the file ``name`` back from cold storage to the hot volume.
+    Raises FileNotFoundError when cold storage does not have it either.
+    """
+    cold = cold_storage()
+    path = version_storage.path(name)
+    with transaction.atomic():
+        _lock(name)
+        if os.path.exists(path):
+            return
+        if not cold.exists(name):
+            raise FileNotFoundError(f"{name} is in neither storage tier.")
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as temp, cold.open(name, "rb") as source:
+                shutil.copyfileobj(source, temp, 1024 * 1024)
+            os.chmod(temp_path, version_storage.file_permissions_mode or 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        Blob.objects.filter(name=name, tier=Blob.TIER_COLD).update(
+            tier=Blob.TIER_CACHED, accessed_at=timezone.now()
+        )
+
+
+def trim_cache(limit=None):
+    """
+    Drop hot copies of cold files, least recently rehydrated first, until
+    they take at most ``limit`` bytes (``DOCUMENT_HOT_CACHE_BYTES``).
+    Returns how many were dropped.
+    """
+    if limit is None:
+        limit = settings.DOCUMENT_HOT_CACHE_BYTES
+    cached = Blob.objects.filter(tier=Blob.TIER_CACHED)
+    total = cached.aggregate(total=Sum("size"))["total"] or 0
+    dropped = 0
+    entries = cached.order_by(F("accessed_at").asc(nulls_first=True), "name")
+    for name, size in list(entries.values_list("name", "size")):
+        if total <= limit:
+            break
+        with transaction.atomic():
+            _lock(name)
+            if Blob.objects.filter(name=name, tier=Blob.TIER_CACHED).update(
+                tier=Blob.TIER_COLD, accessed_at=None
+            ):
+                version_storage.delete(name)
+                dropped += 1
+        total -= size
+    return dropped
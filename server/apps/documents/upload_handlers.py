@@ -0,0 +1,98 @@
+"""
+Single-pass handling of uploaded version files.
+
+Django's default handlers only spool an upload, so storing it meant reading
+it again to hash it. ``StreamingUploadHandler`` computes the SHA-256, the
+byte count and the sniffed MIME type while the chunks arrive and attaches
+them to the uploaded file, where ``ContentAddressedStorage`` and
+``DocumentVersion.save`` use them instead of rereading it. It stops an
+upload as soon as it passes the uploader's size limit, and
+``receive_upload`` refuses a request whose declared length already does
+before reading any of it.
+"""
+
+import hashlib
+
+from apps.documents.sniffing import SNIFF_SIZE, sniff_content_type
+from django.conf import settings
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+
+# Allowance for the form fields and part headers around the file when a
+# request's Content-Length is compared with an upload limit.
+FORM_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, limit):
+        super().__init__(f"Files are limited to {limit} bytes.")
+        self.limit = limit
+
+
+def upload_limit(user):
+    """
+    Most bytes ``user`` may upload as one file, or None for no limit.
+    """
+    limit = getattr(user, "max_upload_bytes", None)
+    if limit is None:
+        limit = settings.DOCUMENT_UPLOAD_MAX_BYTES
+    return limit or None
+
+
+class StreamingUploadHandler(TemporaryFileUploadHandler):
+    """
+    Writes each file to a temporary file, which storage then moves into
+    place, and measures it on the way. The uploaded file gets ``sha256`` and
+    ``detected_type`` attributes next to its ``size``.
+    """
+
+    def __init__(self, request=None, limit=None):
+        super().__init__(request)
+        self.limit = limit
+        self.exceeded = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.head = b""
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.limit is not None and self.received > self.limit:
+            self.exceeded = True
+            # Give up on the request instead of reading the rest of its body.
+            raise StopUpload(connection_reset=True)
+        self.digest.update(raw_data)
+        if len(self.head) < SNIFF_SIZE:
+            self.head += raw_data[: SNIFF_SIZE - len(self.head)]
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.digest.hexdigest()
+        file.detected_type = sniff_content_type(self.head, self.file_name)
+        return file
+
+
+def receive_upload(request, field="file"):
+    """
+    The file uploaded as ``field`` of the DRF ``request``, or None, read
+    with a ``StreamingUploadHandler`` limited to what the user may upload.
+
+    Must be called before anything reads ``request.data``. Raises
+    UploadTooLarge when the file is over the limit.
+    """
+    limit = upload_limit(request.user)
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    if limit is not None and length > limit + FORM_OVERHEAD:
+        raise UploadTooLarge(limit)
+
+    handler = StreamingUploadHandler(request._request, limit)
+    request._request.upload_handlers = [handler]
+    upload = request.FILES.get(field)
+    if handler.exceeded:
+        raise UploadTooLarge(limit)
+    return upload
@@ -0,0 +1,163 @@
+import os
+import shutil
+
+from apps.documents.models import DocumentVersion, UploadSession
+from apps.documents.models.upload_session import session_expiry
+from apps.documents.storage import version_storage
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+# Bytes copied from the request body to the part file per read.
+CHUNK_READ_SIZE = 1024 * 1024
+
+
+class UploadConflict(ValueError):
+    """
+    The client's view of an upload disagrees with the session's.
+    """
+
+
+class UploadGone(UploadConflict):
+    """
+    The session's part file is missing, so the upload has to start over.
+    """
+
+
+class ChunkTooLarge(ValueError):
+    """
+    A chunk is longer than ``DOCUMENT_UPLOAD_CHUNK_MAX_BYTES``.
+    """
+
+
+class _PartFile(File):
+    # Lets ContentAddressedStorage move the file instead of copying it.
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def create_session(user, document, filename, size):
+    session = UploadSession.objects.create(
+        user=user, document=document, filename=filename, size=size
+    )
+    path = version_storage.path(session.part_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+    return session
+
+
+def write_chunk(session, offset, stream, length):
+    """
+    Write ``length`` bytes from ``stream`` into the part file at ``offset``.
+
+    No lock or transaction is held while the body arrives. The offset is
+    checked first and only moved on afterwards if no other request moved
+    it meanwhile; every byte lands at its own position in the file, so the
+    request that loses such a race leaves the content intact. If the client
+    disconnects midway, the bytes that did arrive are kept and the client
+    resumes from the returned offset.
+    """
+    if length > settings.DOCUMENT_UPLOAD_CHUNK_MAX_BYTES:
+        raise ChunkTooLarge(
+            f"Chunks are limited to {settings.DOCUMENT_UPLOAD_CHUNK_MAX_BYTES} bytes."
+        )
+    session = _reload(session)
+    if offset != session.offset:
+        raise UploadConflict(f"Upload is at offset {session.offset}.")
+    if offset + length > session.size:
+        raise UploadConflict("Chunk runs past the declared upload size.")
+
+    written = 0
+    with open(version_storage.path(session.part_name), "r+b") as part:
+        part.seek(offset)
+        try:
+            while written < length:
+                data = stream.read(min(CHUNK_READ_SIZE, length - written))
+                if not data:
+                    break
+                part.write(data)
+                written += len(data)
+        except (UnreadablePostError, OSError):
+            pass
+
+    UploadSession.objects.filter(pk=session.pk, offset=offset).update(
+        offset=offset + written,
+        expires_at=session_expiry(),
+        updated_at=timezone.now(),
+    )
+    return _reload(session)
+
+
+def _reload(session):
+    session = UploadSession.objects.filter(pk=session.pk).first()
+    if session is None:
+        raise UploadConflict("Upload was aborted.")
+    return session
+
+
+def finalize(session):
+    """
+    Attach a fully received upload to its document as a new version.
+
+    Storage moves a hard link to the part file rather than the part file
+    itself, so if the transaction rolls back the upload is still whole and
+    finalizing can be retried. Raises UploadGone, after aborting the
+    session, when the part file has disappeared.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if not session.complete:
+            raise UploadConflict(
+                f"Upload is incomplete: {session.offset} of {session.size} bytes."
+            )
+        path = version_storage.path(session.part_name)
+        link = version_storage.path(f"uploads/{session.id}.finalizing")
+        # Left over from a finalize that crashed.
+        _remove(link)
+        try:
+            _link(path, link)
+        except FileNotFoundError:
+            version = None
+        else:
+            try:
+                with open(link, "rb") as part:
+                    version = DocumentVersion(
+                        document=session.document,
+                        created_by=session.user,
+                        file=_PartFile(part, name=session.filename),
+                    )
+                    version.save()
+            finally:
+                # Still there when the content was already stored.
+                _remove(link)
+            session.delete()
+            transaction.on_commit(lambda: _remove(path))
+    if version is None:
+        abort(session)
+        raise UploadGone("The uploaded data is gone; start a new upload.")
+    return version
+
+
+def _link(source, target):
+    try:
+        os.link(source, target)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        # File systems without hard links get a copy.
+        shutil.copyfile(source, target)
+
+
+def abort(session):
+    path = version_storage.path(session.part_name)
+    session.delete()
+    _remove(path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -1,10 +1,63 @@
 from django.urls import path
 
-from ..views import DocumentDetailAPIView, DocumentListAPIView
+from ..views import (
+    DocumentBundleAPIView,
+    DocumentDetailAPIView,
+    DocumentExportAPIView,
+    DocumentListAPIView,
+    DocumentSearchAPIView,
+    DocumentStatsAPIView,
+    DocumentTagsAPIView,
+    DocumentVersionBundleAPIView,
+    DocumentVersionDetailAPIView,
+    DocumentVersionDownloadAPIView,
+    DocumentVersionRenditionAPIView,
+    UploadSessionDetailAPIView,
+    UploadSessionFinalizeAPIView,
+    UploadSessionListAPIView,
+    WorkQueueAPIView,
+)
 
 app_name = "documents"
 
 urlpatterns = [
     path("", DocumentListAPIView.as_view(), name="doc-list"),
+    path("stats/", DocumentStatsAPIView.as_view(), name="doc-stats"),
+    path("queue/", WorkQueueAPIView.as_view(), name="doc-queue"),
+    path("export/", DocumentExportAPIView.as_view(), name="doc-export"),
+    path("bundle/", DocumentBundleAPIView.as_view(), name="doc-bundle"),
+    path("search/", DocumentSearchAPIView.as_view(), name="doc-search"),
+    path("tags/", DocumentTagsAPIView.as_view(), name="doc-tags"),
+    path("uploads/", UploadSessionListAPIView.as_view(), name="doc-upload-list"),
+    path(
+        "uploads/<uuid:upload_id>/",
+        UploadSessionDetailAPIView.as_view(),
+        name="doc-upload-detail",
+    ),
+    path(
+        "uploads/<uuid:upload_id>/finalize/",
+        UploadSessionFinalizeAPIView.as_view(),
+        name="doc-upload-finalize",
+    ),
     path("<uuid:document_id>/", DocumentDetailAPIView.as_view(), name="doc-detail"),
+    path(
+        "<uuid:document_id>/versions/bundle/",
+        DocumentVersionBundleAPIView.as_view(),
+        name="doc-version-bundle",
+    ),
+    path(
+        "<uuid:document_id>/versions/<int:version_number>/",
+        DocumentVersionDetailAPIView.as_view(),
+        name="doc-version-item",
+    ),
+    path(
+        "<uuid:document_id>/versions/<int:version_number>/download/",
+        DocumentVersionDownloadAPIView.as_view(),
+        name="doc-version-download",
+    ),
+    path(
+        "<uuid:document_id>/versions/<int:version_number>/renditions/<size>/",
+        DocumentVersionRenditionAPIView.as_view(),
+        name="doc-version-rendition",
+    ),
 ]
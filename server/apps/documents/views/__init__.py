@@ -1,5 +1,18 @@
 from .document_actions import DocumentActionsAPIView
+from .document_bundle import DocumentBundleAPIView, DocumentVersionBundleAPIView
 from .document_detail import DocumentDetailAPIView
+from .document_export import DocumentExportAPIView
+from .document_search import DocumentSearchAPIView
+from .document_stats import DocumentStatsAPIView
+from .document_tags import DocumentTagsAPIView
 from .document_version_detail import DocumentVersionDetailAPIView
+from .document_version_download import DocumentVersionDownloadAPIView
 from .document_version_list import DocumentVersionListAPIView
+from .document_version_rendition import DocumentVersionRenditionAPIView
 from .documents_list import DocumentListAPIView
+from .upload_sessions import (
+    UploadSessionDetailAPIView,
+    UploadSessionFinalizeAPIView,
+    UploadSessionListAPIView,
+)
+from .work_queue import WorkQueueAPIView
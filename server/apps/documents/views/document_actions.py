@@ -2,7 +2,9 @@ from pathlib import Path
 
 from apps.documents.models import Document
 from apps.documents.models.document_version import DocumentVersion
+from apps.documents.work_queue import sync_work_queue
 from apps.user.models.user import User
+from django.db import transaction
 from django.forms.models import model_to_dict
 from django.http import Http404
 from rest_framework import status
@@ -24,14 +26,15 @@ class DocumentActionsAPIView(APIView):
         data = request.data
         review_notes = data.get("review_notes", None)
         review_date = data.get("review_date", None)
-        if action == "reject":
-            self.reject_document(document_id, review_notes, review_date)
-        if action == "approve":
-            self.approve_document(document_id, review_notes, review_date)
-        if action == "esign":
-            self.esign_document(document_id)
-        if action == "archive":
-            self.archive_document(document_id)
+        with transaction.atomic():
+            if action == "reject":
+                self.reject_document(document_id, review_notes, review_date)
+            if action == "approve":
+                self.approve_document(document_id, review_notes, review_date)
+            if action == "esign":
+                self.esign_document(document_id)
+            if action == "archive":
+                self.archive_document(document_id)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -43,6 +46,7 @@ class DocumentActionsAPIView(APIView):
             doc.review_date = review_date
             doc.review_notes = review_notes
             doc.save()
+            sync_work_queue(doc)
             return doc
         except Document.DoesNotExist:
             return Response(
@@ -57,6 +61,7 @@ class DocumentActionsAPIView(APIView):
             doc.review_date = review_date
             doc.review_notes = review_notes
             doc.save()
+            sync_work_queue(doc)
             return doc
         except Document.DoesNotExist:
             return Response(
@@ -69,6 +74,7 @@ class DocumentActionsAPIView(APIView):
             doc.status = Document.STATUS_SIGNED
             doc.assigned_to = doc.created_by
             doc.save()
+            sync_work_queue(doc)
             return doc
         except Document.DoesNotExist:
             return Response(
@@ -81,6 +87,7 @@ class DocumentActionsAPIView(APIView):
             doc.status = Document.STATUS_ARCHIVED
             doc.assigned_to = doc.created_by
             doc.save()
+            sync_work_queue(doc)
             return doc
         except Document.DoesNotExist:
             return Response(
@@ -0,0 +1,133 @@
+from apps.documents.bundles import stream_bundle
+from apps.documents.downloads import can_download, downloadable_documents
+from apps.documents.filters import InvalidFilter, filter_documents
+from apps.documents.models import Document, DocumentVersion
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+# Versions fetched per server-side cursor round trip.
+CHUNK_SIZE = 200
+
+VERSION_CHOICES = ("latest", "all")
+
+
+def bundle_versions(versions):
+    return (
+        versions.select_related("document", "created_by")
+        .only(
+            "file",
+            "filename",
+            "size",
+            "delta_base",
+            "version_number",
+            "created_at",
+            "document__document_id",
+            "document__title",
+            "created_by__email",
+        )
+        .order_by("document__created_at", "document_id", "version_number")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+def bundle_response(versions, name):
+    response = StreamingHttpResponse(
+        stream_bundle(bundle_versions(versions)), content_type="application/zip"
+    )
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+    response["Content-Disposition"] = f'attachment; filename="{name}-{stamp}.zip"'
+    return response
+
+
+class DocumentBundleAPIView(APIView):
+    """
+    GET   Stream the files of the matching documents as one ZIP archive.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Download Documents Bundle",
+        operation_description=(
+            "Stream a ZIP archive, built as it is sent, of the files of every "
+            "matching document the user may download, with a `manifest.json` "
+            "listing each file's document, version and SHA-256. Accepts the "
+            "document list filters; `versions=all` includes every version "
+            "instead of the latest only."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "versions",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(VERSION_CHOICES),
+                required=False,
+            ),
+        ],
+        responses={
+            200: "ZIP stream",
+            400: "Bad Request (invalid filter or versions)",
+        },
+    )
+    def get(self, request):
+        params = request.query_params
+        which = params.get("versions", "latest")
+        if which not in VERSION_CHOICES:
+            return Response(
+                {"error": "Invalid versions."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            documents = filter_documents(Document.objects.all(), params, request.user)
+        except InvalidFilter as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        documents = downloadable_documents(documents, request.user)
+        if which == "latest":
+            versions = DocumentVersion.objects.filter(
+                pk__in=documents.values("latest_version")
+            )
+        else:
+            versions = DocumentVersion.objects.filter(
+                document__in=documents.values("pk")
+            )
+        return bundle_response(versions, "documents")
+
+
+class DocumentVersionBundleAPIView(APIView):
+    """
+    GET   Stream every version file of one document as one ZIP archive.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=["Documents Versions"],
+        operation_summary="Download Versions Bundle",
+        operation_description=(
+            "Stream a ZIP archive, built as it is sent, of all the document's "
+            "version files with a `manifest.json`, to its creator, assignee "
+            "or reviewer."
+        ),
+        responses={200: "ZIP stream", 404: "Not Found (or no access)"},
+    )
+    def get(self, request, document_id):
+        document = get_object_or_404(
+            Document.objects.only("created_by", "assigned_to", "reviewer"),
+            document_id=document_id,
+        )
+        if not can_download(document, request.user):
+            raise Http404
+        return bundle_response(
+            DocumentVersion.objects.filter(document=document),
+            f"document-{document.document_id}",
+        )
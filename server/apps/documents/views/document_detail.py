@@ -1,10 +1,26 @@
-from pathlib import Path
-
+from apps.documents.conditional import (
+    document_validators,
+    not_modified,
+    set_validators,
+)
+from apps.documents.downloads import can_delete
 from apps.documents.models import Document
 from apps.documents.models.document_version import DocumentVersion
+from apps.documents.serializers import (
+    InvalidFields,
+    allowed_actions,
+    document_queryset,
+    parse_fields,
+    serialize_document,
+    serialize_version,
+)
+from apps.documents.upload_handlers import UploadTooLarge, receive_upload
+from apps.documents.work_queue import sync_work_queue
 from apps.user.models.user import User
+from django.db import transaction
 from django.forms.models import model_to_dict
 from django.http import Http404
+from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
@@ -20,86 +36,44 @@ class DocumentDetailAPIView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def get_object(self, document_id, user_email):
-        try:
-            request_user = User.objects.get(email=user_email)
-            if request_user is None:
-                return Response(
-                    {"error": "User not found."}, status=status.HTTP_400_BAD_REQUEST
-                )
-            return Document.objects.get(document_id=document_id, user=request_user)
-        except Document.DoesNotExist:
+    def get_object(self, document_id, user):
+        doc = get_object_or_404(
+            Document.objects.only("created_by"), document_id=document_id
+        )
+        if not can_delete(doc, user):
             raise Http404
+        return doc
 
     def get(self, request, document_id):
-        doc = Document.objects.get(document_id=document_id)
-        data = model_to_dict(
-            doc,
-            fields=[
-                "document_id",
-                "title",
-                "description",
-            ],
-        )
-        data["document_id"] = doc.document_id
-        data["created_by"] = doc.created_by.email
-        data["created_at"] = doc.created_at.isoformat()
-        data["status"] = doc.status
-        data["tags"] = doc.tags
-        data["priority"] = doc.priority
-        data["reviewer"] = doc.reviewer.email
-        data["assigned_to"] = doc.assigned_to.email
-        data["assignee_id"] = doc.assigned_to.user_id
-        data["reviewer_id"] = doc.reviewer.user_id
-        data["document_type"] = doc.document_type if doc.document_type else None
-
-        data["versions"] = []
-        for v in doc.versions.order_by("version_number"):
-            filename = Path(v.file.name).name
-            # build a full URL to the media file
-            url = request.build_absolute_uri(v.file.url)
-            data["versions"].append(
-                {
-                    "version_number": v.version_number,
-                    "filename": filename,
-                    "download_url": url,
-                    "created_by": v.created_by.email,
-                    "created_at": v.created_at.isoformat(),
-                }
-            )
-        data["allowed_actions"] = []
-
-        user = User.objects.get(email=request.user)
-        is_creator = doc.created_by == user
-        is_assignee = doc.assigned_to == user
-
-        if doc.status == Document.STATUS_PENDING and is_assignee:
-            data["allowed_actions"] += ["approve", "reject", "archive"]
-
-        elif doc.status == Document.STATUS_APPROVED and is_assignee:
-            data["allowed_actions"] += ["esign", "archive"]
-
-        elif (
-            doc.status in (Document.STATUS_REJECTED, Document.STATUS_PENDING)
-            and is_creator
-        ):
-            data["allowed_actions"] += ["resubmit", "archive"]
-
-        elif doc.status == Document.STATUS_SIGNED and is_assignee:
-            data["allowed_actions"].append("archive")
+        try:
+            fields = parse_fields(request.query_params)
+        except InvalidFields as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = document_queryset(fields).filter(document_id=document_id)
+        etag, last_modified, count = document_validators(queryset, request)
+        if not count:
+            raise Http404
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
 
-        elif (
-            doc.status in (Document.STATUS_APPROVED, Document.STATUS_SIGNED)
-            and is_creator
-        ):
-            data["allowed_actions"].append("archive")
-        return Response(data, status=status.HTTP_200_OK)
+        doc = get_object_or_404(queryset)
+        data = serialize_document(doc, request, fields)
+        data["allowed_actions"] = allowed_actions(doc, request.user)
+        response = Response(data, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
 
     def put(self, request, document_id):
         try:
             doc = Document.objects.get(document_id=document_id)
         except Document.DoesNotExist:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            uploaded_file = receive_upload(request)
+        except UploadTooLarge as exc:
+            return Response(
+                {"error": str(exc)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
 
         title = request.data.get("title")
         description = request.data.get("description")
@@ -117,15 +91,16 @@ class DocumentDetailAPIView(APIView):
         doc.title = title
         doc.description = description
         doc.status = doc.STATUS_PENDING
-        doc.save()
 
-        uploaded_file = request.FILES.get("file")
         new_version = None
-        if uploaded_file:
-            new_version = DocumentVersion(
-                document=doc, file=uploaded_file, created_by=request_user
-            )
-            new_version.save()
+        with transaction.atomic():
+            doc.save()
+            if uploaded_file:
+                new_version = DocumentVersion(
+                    document=doc, file=uploaded_file, created_by=request_user
+                )
+                new_version.save()
+            sync_work_queue(doc)
 
         data = model_to_dict(
             doc,
@@ -141,18 +116,12 @@ class DocumentDetailAPIView(APIView):
 
         # if we just made a new version, include its info
         if new_version:
-            data["new_version"] = {
-                "id": new_version.id,
-                "version_number": new_version.version_number,
-                "filename": new_version.file.name.split("/")[-1],
-                "download_url": request.build_absolute_uri(new_version.file.url),
-                "created_at": new_version.created_at.isoformat(),
-                "created_by": new_version.created_by.email,
-            }
+            data["new_version"] = serialize_version(new_version, request)
 
         return Response(data, status=status.HTTP_200_OK)
 
     def delete(self, request, document_id):
+        # Versions and files are removed by a background purge job.
         doc = self.get_object(document_id, request.user)
-        doc.delete()
+        doc.soft_delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,83 @@
+from apps.documents.export import (
+    CONTENT_TYPES,
+    FORMATS,
+    RESOURCES,
+    export_rows,
+    render,
+)
+from apps.documents.filters import InvalidFilter
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class DocumentExportAPIView(APIView):
+    """
+    GET   Stream document or version metadata as NDJSON or CSV.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Export Document Metadata",
+        operation_description=(
+            "Stream every matching row as NDJSON or CSV. Accepts the same "
+            "filters as the document list; `resource=versions` exports the "
+            "versions of the matching documents."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "resource",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(RESOURCES),
+                required=False,
+            ),
+            openapi.Parameter(
+                "export_format",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(FORMATS),
+                required=False,
+            ),
+        ],
+        responses={
+            200: "NDJSON or CSV stream",
+            400: "Bad Request (invalid resource, format or filter)",
+        },
+    )
+    def get(self, request):
+        params = request.query_params
+        resource = params.get("resource", "documents")
+        export_format = params.get("export_format", "ndjson")
+        if resource not in RESOURCES:
+            return Response(
+                {"error": "Invalid resource."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if export_format not in FORMATS:
+            return Response(
+                {"error": "Invalid export format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            columns, rows = export_rows(resource, params, request.user)
+        except InvalidFilter as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            render(export_format, columns, rows),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+        response["Content-Disposition"] = (
+            f'attachment; filename="{resource}-{stamp}.{export_format}"'
+        )
+        return response
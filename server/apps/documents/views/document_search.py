@@ -0,0 +1,116 @@
+from apps.documents.filters import InvalidFilter, filter_documents
+from apps.documents.search import search_documents
+from apps.documents.serializers import (
+    LIST_FIELDS,
+    InvalidFields,
+    document_queryset,
+    parse_fields,
+    serialize_document,
+)
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class DocumentSearchAPIView(APIView):
+    """
+    GET   Full-text search over document metadata and file text, best matches
+          first.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    page_size = 20
+    max_page_size = 100
+    # Ranked results are paged by offset; nobody reads past the first pages.
+    max_page = 50
+
+    @swagger_auto_schema(
+        operation_summary="Search Documents",
+        operation_description=(
+            "Search titles, tags, descriptions, review notes and the text of "
+            "each document's latest version. `q` uses web search syntax "
+            "(quoted phrases, `or`, `-exclude`). Accepts the document list "
+            "filters and `fields`."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "q", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True
+            ),
+            openapi.Parameter(
+                "page", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False
+            ),
+            openapi.Parameter(
+                "page_size",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="Ranked documents with highlighted snippets",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "next": openapi.Schema(type=openapi.TYPE_STRING),
+                        "results": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                        ),
+                    },
+                ),
+            ),
+            400: "Bad Request (missing query, invalid fields or filter)",
+        },
+    )
+    def get(self, request):
+        params = request.query_params
+        text = params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"error": "A search query is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            fields = parse_fields(params, default=LIST_FIELDS)
+            queryset = filter_documents(document_queryset(fields), params, request.user)
+        except (InvalidFields, InvalidFilter) as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        page = self.get_int(params, "page", 1, self.max_page)
+        page_size = self.get_int(
+            params, "page_size", self.page_size, self.max_page_size
+        )
+        start = (page - 1) * page_size
+        docs = list(search_documents(queryset, text)[start : start + page_size + 1])
+
+        results = []
+        for doc in docs[:page_size]:
+            data = serialize_document(doc, request, fields)
+            data["rank"] = doc.rank
+            data["highlights"] = {
+                "title": doc.title_highlight,
+                "snippet": doc.snippet,
+                "content": doc.content_snippet,
+            }
+            results.append(data)
+
+        next_link = None
+        if len(docs) > page_size and page < self.max_page:
+            url = request.build_absolute_uri()
+            next_link = replace_query_param(url, "page", page + 1)
+        return Response({"next": next_link, "results": results})
+
+    def get_int(self, params, name, default, maximum):
+        try:
+            value = int(params[name])
+        except (KeyError, ValueError):
+            return default
+        return max(1, min(value, maximum))
@@ -0,0 +1,90 @@
+from apps.documents.filters import InvalidFilter, filter_documents
+from apps.documents.models import Document
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+counts_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    additional_properties=openapi.Schema(type=openapi.TYPE_INTEGER),
+)
+
+
+class DocumentStatsAPIView(APIView):
+    """
+    GET   Document counts for the dashboard, computed in the database.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Document Statistics",
+        operation_description=(
+            "Per-status and per-priority counts plus the documents waiting on "
+            "the authenticated user, in one aggregate query. Accepts the same "
+            "filters as the document list."
+        ),
+        responses={
+            200: openapi.Response(
+                description="Document counts",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "total": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "by_status": counts_schema,
+                        "by_priority": counts_schema,
+                        "awaiting_review": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "awaiting_signature": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    },
+                ),
+            ),
+            400: "Bad Request (invalid filter)",
+        },
+    )
+    def get(self, request):
+        cache_key = f"documents:stats:{request.user.pk}:{request.GET.urlencode()}"
+        data = cache.get(cache_key)
+        if data is None:
+            try:
+                queryset = filter_documents(
+                    Document.objects.all(), request.query_params, request.user
+                )
+            except InvalidFilter as exc:
+                return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            data = self.get_counts(queryset, request.user)
+            if settings.DOCUMENT_STATS_CACHE_TTL:
+                cache.set(cache_key, data, settings.DOCUMENT_STATS_CACHE_TTL)
+        return Response(data, status=status.HTTP_200_OK)
+
+    def get_counts(self, queryset, user):
+        statuses = [value for value, _ in Document.document_status_choices]
+        priorities = [value for value, _ in Document.document_priority_choices]
+
+        aggregates = {"total": Count("pk")}
+        for value in statuses:
+            aggregates[f"status_{value}"] = Count("pk", filter=Q(status=value))
+        for value in priorities:
+            aggregates[f"priority_{value}"] = Count("pk", filter=Q(priority=value))
+        aggregates["awaiting_review"] = Count(
+            "pk", filter=Q(status=Document.STATUS_PENDING, reviewer=user)
+        )
+        aggregates["awaiting_signature"] = Count(
+            "pk", filter=Q(status=Document.STATUS_APPROVED, assigned_to=user)
+        )
+        counts = queryset.aggregate(**aggregates)
+
+        return {
+            "total": counts["total"],
+            "by_status": {value: counts[f"status_{value}"] for value in statuses},
+            "by_priority": {value: counts[f"priority_{value}"] for value in priorities},
+            "awaiting_review": counts["awaiting_review"],
+            "awaiting_signature": counts["awaiting_signature"],
+        }
@@ -0,0 +1,99 @@
+from apps.documents.filters import InvalidFilter, filter_documents
+from apps.documents.models import Document
+from django.db import connection
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+# unnest() cannot be grouped on through the ORM, so the facet query wraps the
+# filtered documents queryset as a subquery.
+TAG_FACETS_SQL = """
+SELECT tag, COUNT(*) AS count
+FROM ({documents}) AS docs, unnest(docs.tags) AS tag
+WHERE lower(tag) LIKE %s
+GROUP BY tag
+ORDER BY count DESC, tag
+LIMIT %s
+"""
+
+
+class DocumentTagsAPIView(APIView):
+    """
+    GET   Most used tags with document counts, for facets and autocomplete.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    default_limit = 20
+    max_limit = 100
+
+    @swagger_auto_schema(
+        operation_summary="Tag Facets",
+        operation_description=(
+            "Return the most used tags with their document counts, computed in "
+            "SQL. Accepts the document list filters (e.g. `status`) to scope "
+            "the counts and `prefix` for autocomplete."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "prefix",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Only tags starting with this (case-insensitive)",
+                required=False,
+            ),
+            openapi.Parameter(
+                "limit",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="Tags with counts, most used first",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "tag": openapi.Schema(type=openapi.TYPE_STRING),
+                            "count": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        },
+                    ),
+                ),
+            ),
+            400: "Bad Request (invalid filter)",
+        },
+    )
+    def get(self, request):
+        params = request.query_params
+        try:
+            documents = filter_documents(
+                Document.objects.filter(tags__isnull=False), params, request.user
+            )
+        except InvalidFilter as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = max(1, min(int(params["limit"]), self.max_limit))
+        except (KeyError, ValueError):
+            limit = self.default_limit
+        prefix = params.get("prefix", "").lower()
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+        documents_sql, documents_params = (
+            documents.order_by().values("tags").query.sql_with_params()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                TAG_FACETS_SQL.format(documents=documents_sql),
+                [*documents_params, f"{pattern}%", limit],
+            )
+            rows = cursor.fetchall()
+        return Response([{"tag": tag, "count": count} for tag, count in rows])
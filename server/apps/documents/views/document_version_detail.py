@@ -1,7 +1,8 @@
+from apps.documents.downloads import can_delete, can_download
 from apps.documents.models import DocumentVersion
 from apps.documents.models.document import Document
-from apps.user.models.user import User
-from django.forms.models import model_to_dict
+from apps.documents.serializers import serialize_version
+from apps.documents.upload_handlers import UploadTooLarge, receive_upload
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
@@ -14,13 +15,14 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 file_param = openapi.Parameter(
-    name='file',
+    name="file",
     in_=openapi.IN_FORM,
     type=openapi.TYPE_FILE,
     required=True,
-    description='PDF or image file to upload'
+    description="PDF or image file to upload",
 )
 
+
 class DocumentVersionDetailAPIView(APIView):
     swagger_tags = ["Documents Versions"]
     parser_classes = [MultiPartParser, FormParser]
@@ -28,34 +30,37 @@ class DocumentVersionDetailAPIView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
-    @swagger_auto_schema(tags=["Documents Versions"])
-    def get_object(self, pk, user):
-        try:
-            ver = DocumentVersion.objects.get(pk=pk)
-            if ver.document.user != user:
-                raise DocumentVersion.DoesNotExist
-            return ver
-        except DocumentVersion.DoesNotExist:
-            raise Http404
-
-    @swagger_auto_schema(tags=["Documents Versions"])
-    def get(self, request, pk):
-        request_user = User.objects.get(email=request.user)
-        if request_user is None:
-            return
-        ver = self.get_object(pk, request_user)
-        data = model_to_dict(
-            ver, fields=["id", "version_number", "file", "created_at", "created_by"]
+    def get_object(self, document_id, version_number):
+        return get_object_or_404(
+            DocumentVersion.objects.select_related("document", "created_by"),
+            document_id=document_id,
+            version_number=version_number,
         )
-        return Response(data)
 
     @swagger_auto_schema(tags=["Documents Versions"])
-    def delete(self, request, pk):
-        request_user = User.objects.get(email=request.user)
-        if request_user is None:
-            return
-        ver = self.get_object(pk, request_user)
-        ver.delete()
+    def get(self, request, document_id, version_number=None):
+        if version_number is None:
+            raise Http404
+        ver = self.get_object(document_id, version_number)
+        if not can_download(ver.document, request.user):
+            raise Http404
+        return Response(serialize_version(ver, request))
+
+    @swagger_auto_schema(
+        tags=["Documents Versions"],
+        operation_description=(
+            "Delete a version. It disappears at once; its row and file are "
+            "removed by a background job."
+        ),
+        responses={204: "Deleted", 404: "Not Found (or no access)"},
+    )
+    def delete(self, request, document_id, version_number=None):
+        if version_number is None:
+            raise Http404
+        ver = self.get_object(document_id, version_number)
+        if not can_delete(ver.document, request.user):
+            raise Http404
+        ver.soft_delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @swagger_auto_schema(
@@ -87,16 +92,24 @@ class DocumentVersionDetailAPIView(APIView):
                         "created_by": openapi.Schema(type=openapi.TYPE_STRING),
                     },
                 ),
-            )
+            ),
+            413: "File over the user's upload limit",
         },
     )
-    def post(self, request, document_id):
+    def post(self, request, document_id, version_number=None):
+        if version_number is not None:
+            return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
         # 1) Get the user and document (404 if not found)
         user = request.user
         document = get_object_or_404(Document, document_id=document_id)
 
-        # 2) Ensure a file was uploaded
-        upload = request.FILES.get("file")
+        # 2) Ensure a file was uploaded, within the user's size limit
+        try:
+            upload = receive_upload(request)
+        except UploadTooLarge as exc:
+            return Response(
+                {"error": str(exc)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
         if not upload:
             return Response(
                 {"error": "A file is required."}, status=status.HTTP_400_BAD_REQUEST
@@ -107,11 +120,5 @@ class DocumentVersionDetailAPIView(APIView):
         version.save()
 
         # 4) Build a JSON‐serializable response
-        data = {
-            "id": version.id,
-            "version_number": version.version_number,
-            "download_url": request.build_absolute_uri(version.file.url),
-            "created_at": version.created_at.isoformat(),
-            "created_by": version.created_by.email,
-        }
+        data = serialize_version(version, request)
         return Response(data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,80 @@
+from apps.documents.downloads import can_download, version_etag, version_response
+from apps.documents.models import DocumentVersion
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class DocumentVersionDownloadAPIView(APIView):
+    """
+    GET   The file of one document version, with Range support.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=["Documents Versions"],
+        operation_summary="Download Version",
+        operation_description=(
+            "Send the version's file to its document's creator, assignee or "
+            "reviewer. Supports `Range`/`If-Range` for partial content and "
+            "`If-None-Match`. Behind nginx or Apache the transfer is handed to "
+            "the proxy."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "download",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description="Send as an attachment instead of inline",
+                required=False,
+            ),
+        ],
+        responses={
+            200: "The file",
+            206: "Partial Content",
+            304: "Not Modified",
+            404: "Not Found (or no access)",
+            416: "Range Not Satisfiable",
+        },
+    )
+    def get(self, request, document_id, version_number):
+        version = get_object_or_404(
+            DocumentVersion.objects.select_related("document").only(
+                "file",
+                "filename",
+                "content_type",
+                "blob",
+                "delta_base",
+                "created_at",
+                "document__created_by",
+                "document__assigned_to",
+                "document__reviewer",
+            ),
+            document_id=document_id,
+            version_number=version_number,
+        )
+        if not can_download(version.document, request.user):
+            raise Http404
+
+        try:
+            etag = version_etag(version)
+        except FileNotFoundError:
+            raise Http404
+        last_modified = int(version.created_at.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+
+        as_attachment = request.query_params.get("download") in ("1", "true")
+        return version_response(
+            request, version, etag, last_modified, as_attachment=as_attachment
+        )
@@ -0,0 +1,81 @@
+from apps.documents.downloads import can_download
+from apps.documents.models import DocumentVersion
+from apps.documents.renditions import (
+    RENDITION_SIZES,
+    RenditionUnavailable,
+    ensure_rendition,
+)
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+# A version's content never changes, so neither do its renditions.
+RENDITION_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+class DocumentVersionRenditionAPIView(APIView):
+    """
+    GET   A thumbnail or first-page preview of one document version.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=["Documents Versions"],
+        operation_summary="Version Rendition",
+        operation_description=(
+            f"JPEG rendition of an image or PDF version, one of: "
+            f"{', '.join(f'`{name}` ({px}px)' for name, px in RENDITION_SIZES.items())}. "
+            "Rendered on first request if the background workers have not "
+            "made it yet."
+        ),
+        responses={
+            200: "JPEG image",
+            304: "Not Modified",
+            404: "Not Found (or no access)",
+            415: "Unsupported Media Type (file type cannot be rendered)",
+        },
+    )
+    def get(self, request, document_id, version_number, size):
+        if size not in RENDITION_SIZES:
+            raise Http404
+        version = get_object_or_404(
+            DocumentVersion.objects.select_related("document").only(
+                "file",
+                "filename",
+                "delta_base",
+                "document__created_by",
+                "document__assigned_to",
+                "document__reviewer",
+            ),
+            document_id=document_id,
+            version_number=version_number,
+        )
+        if not can_download(version.document, request.user):
+            raise Http404
+
+        etag = f'"{version.pk}-{size}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
+
+        try:
+            name = ensure_rendition(version, size)
+        except RenditionUnavailable as exc:
+            return Response(
+                {"error": str(exc)}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        except FileNotFoundError:
+            raise Http404
+        response = FileResponse(default_storage.open(name), content_type="image/jpeg")
+        response["ETag"] = etag
+        response["Cache-Control"] = RENDITION_CACHE_CONTROL
+        return response
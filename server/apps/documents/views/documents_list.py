@@ -1,7 +1,27 @@
-from pathlib import Path
+from apps.core.pagination import InvalidCursor, KeysetPagination
+from apps.documents.conditional import not_modified, page_etag, set_validators
+from apps.documents.filters import (
+    DATE_FILTERS,
+    ORDERING_FIELDS,
+    USER_FILTERS,
+    InvalidFilter,
+    filter_documents,
+    get_ordering,
+)
 from apps.documents.models import Document
 from apps.documents.models.document_version import DocumentVersion
+from apps.documents.serializers import (
+    ALL_FIELDS,
+    LIST_FIELDS,
+    InvalidFields,
+    document_queryset,
+    parse_fields,
+    serialize_document,
+)
+from apps.documents.upload_handlers import UploadTooLarge, receive_upload
+from apps.documents.work_queue import sync_work_queue
 from apps.user.models.user import User
+from django.db import transaction
 from django.forms.models import model_to_dict
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -24,72 +44,180 @@ class DocumentListAPIView(APIView):
 
     @swagger_auto_schema(
         operation_summary="List Documents",
-        operation_description="Return a list of documents owned by the authenticated user.",
+        operation_description=(
+            "Return one page of documents matching the filters, newest first "
+            "unless `ordering` says otherwise. Follow the opaque "
+            "`next`/`previous` links to move between pages."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "status",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Comma-separated statuses",
+                required=False,
+            ),
+            openapi.Parameter(
+                "priority",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Comma-separated priorities",
+                required=False,
+            ),
+            openapi.Parameter(
+                "tags",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Comma-separated tags; matches documents with any of them",
+                required=False,
+            ),
+            openapi.Parameter(
+                "tags_all",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Comma-separated tags; matches documents with all of them",
+                required=False,
+            ),
+            openapi.Parameter(
+                "document_type",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Comma-separated document types",
+                required=False,
+            ),
+            *[
+                openapi.Parameter(
+                    param,
+                    in_=openapi.IN_QUERY,
+                    type=openapi.TYPE_STRING,
+                    description="User id, or `me` for the authenticated user",
+                    required=False,
+                )
+                for param in USER_FILTERS
+            ],
+            *[
+                openapi.Parameter(
+                    param,
+                    in_=openapi.IN_QUERY,
+                    type=openapi.TYPE_STRING,
+                    format=openapi.FORMAT_DATETIME,
+                    description="ISO 8601 date or datetime",
+                    required=False,
+                )
+                for param in DATE_FILTERS
+            ],
+            openapi.Parameter(
+                "fields",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description=(
+                    "Comma-separated fields to return (default: all but "
+                    "`versions`). "
+                    f"Choose from: {', '.join(ALL_FIELDS)}"
+                ),
+                required=False,
+            ),
+            openapi.Parameter(
+                "expand",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["versions"],
+                description="Include the full version history",
+                required=False,
+            ),
+            openapi.Parameter(
+                "ordering",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=[f"{d}{f}" for f in ORDERING_FIELDS for d in ("", "-")],
+                description="Sort field, prefix with `-` for descending",
+                required=False,
+            ),
+            openapi.Parameter(
+                "cursor",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Opaque page cursor taken from `next` or `previous`",
+                required=False,
+            ),
+            openapi.Parameter(
+                "page_size",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description=f"Documents per page (max {KeysetPagination.max_page_size})",
+                required=False,
+            ),
+        ],
         responses={
             200: openapi.Response(
-                description="A list of documents",
+                description="A page of documents",
                 schema=openapi.Schema(
-                    type=openapi.TYPE_ARRAY,
-                    items=openapi.Schema(
-                        type=openapi.TYPE_OBJECT,
-                        properties={
-                            "document_id": openapi.Schema(type=openapi.TYPE_STRING),
-                            "title": openapi.Schema(type=openapi.TYPE_STRING),
-                            "description": openapi.Schema(type=openapi.TYPE_STRING),
-                            "user_id": openapi.Schema(type=openapi.TYPE_INTEGER),
-                            "status": openapi.Schema(type=openapi.TYPE_STRING),
-                            "created_at": openapi.Schema(
-                                type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "next": openapi.Schema(
+                            type=openapi.TYPE_STRING, format=openapi.FORMAT_URI
+                        ),
+                        "previous": openapi.Schema(
+                            type=openapi.TYPE_STRING, format=openapi.FORMAT_URI
+                        ),
+                        "results": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    "document_id": openapi.Schema(
+                                        type=openapi.TYPE_STRING
+                                    ),
+                                    "title": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "description": openapi.Schema(
+                                        type=openapi.TYPE_STRING
+                                    ),
+                                    "user_id": openapi.Schema(
+                                        type=openapi.TYPE_INTEGER
+                                    ),
+                                    "status": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "created_at": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        format=openapi.FORMAT_DATETIME,
+                                    ),
+                                    "created_by": openapi.Schema(
+                                        type=openapi.TYPE_STRING
+                                    ),
+                                },
                             ),
-                            "created_by": openapi.Schema(type=openapi.TYPE_STRING),
-                        },
-                    ),
+                        ),
+                    },
                 ),
-            )
+            ),
+            304: "Not Modified (If-None-Match matched)",
+            400: "Bad Request (invalid fields, filter, ordering or cursor)",
         },
     )
     def get(self, request):
-        docs = Document.objects.all().order_by("-created_at")
-        data = []
-   
-            
-        for doc in docs:
-            obj = {
-                "document_id": str(doc.document_id),
-                "title": doc.title,
-                "description": doc.description,
-                "created_at": doc.created_at.isoformat(),
-                "created_by": doc.created_by.email,
-                "assigned_to": doc.assigned_to.email,
-                "status": doc.status,
-                "updated_at": doc.updated_at.isoformat(),
-                "reviewer_id": doc.reviewer.user_id,
-                "reviewer": doc.reviewer.email,
-                "assignee_id": doc.assigned_to.user_id,
-                "document_type": doc.document_type, 
-                "priority": doc.priority,
-                "tags": doc.tags,
-                "review_notes": doc.review_notes,
-            }
-            
-            versions = []
-            for v in doc.versions.order_by("version_number"):
-                filename = Path(v.file.name).name
-                # build a full URL to the media file
-                url = request.build_absolute_uri(v.file.url)
-                versions.append(
-                    {
-                        "version_number": v.version_number,
-                        "filename": filename,
-                        "download_url": url,
-                        "created_by": v.created_by.email,
-                        "created_at": v.created_at.isoformat(),
-                    }
-                )
-            obj["versions"] = versions
+        params = request.query_params
+        try:
+            fields = parse_fields(params, default=LIST_FIELDS)
+            queryset = document_queryset(fields)
+            queryset = filter_documents(queryset, params, request.user)
+            paginator = KeysetPagination(ordering=get_ordering(params))
+        except (InvalidFields, InvalidFilter) as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            docs = paginator.paginate_queryset(queryset, request)
+        except InvalidCursor:
+            return Response(
+                {"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        # Answer polls without serializing when the page has not changed.
+        etag = page_etag(docs, request, paginator.has_next, paginator.has_previous)
+        response = not_modified(request, etag, None)
+        if response is not None:
+            return response
 
-            data.append(obj)
-        return Response(data)
+        data = [serialize_document(doc, request, fields) for doc in docs]
+        response = paginator.get_paginated_response(data)
+        return set_validators(response, etag, None)
 
     @swagger_auto_schema(
         operation_summary="Create Document",
@@ -140,6 +268,12 @@ class DocumentListAPIView(APIView):
         },
     )
     def post(self, request):
+        try:
+            upload = receive_upload(request)
+        except UploadTooLarge as exc:
+            return Response(
+                {"error": str(exc)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
         payload = request.data
         print("payload: ", payload)
         title = payload.get("title")
@@ -149,7 +283,6 @@ class DocumentListAPIView(APIView):
         tags = payload.get("tags")
         priority = payload.get("priority")
         document_type = payload.get("document_type")
-        upload = request.FILES.get("file")
         
         if not upload:
             return Response(
@@ -188,21 +321,23 @@ class DocumentListAPIView(APIView):
         assignee_user = User.objects.get(user_id=assignee_id)
         reviewer_user = User.objects.get(user_id=reviewer_id)
 
-        # Create the Document
-        doc = Document.objects.create(
-            title=title,
-            description=description,
-            created_by=request_user,
-            assigned_to=assignee_user,
-            reviewer=reviewer_user,
-            tags=tags,
-            priority=priority,
-            document_type=document_type,
-            status=Document.STATUS_PENDING,
-        )
-        # Create the first version
-        ver = DocumentVersion(document=doc, file=upload, created_by=request_user)
-        ver.save()
+        with transaction.atomic():
+            # Create the Document
+            doc = Document.objects.create(
+                title=title,
+                description=description,
+                created_by=request_user,
+                assigned_to=assignee_user,
+                reviewer=reviewer_user,
+                tags=tags,
+                priority=priority,
+                document_type=document_type,
+                status=Document.STATUS_PENDING,
+            )
+            # Create the first version
+            ver = DocumentVersion(document=doc, file=upload, created_by=request_user)
+            ver.save()
+            sync_work_queue(doc)
 
         out = model_to_dict(
             doc,
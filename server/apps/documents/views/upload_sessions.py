@@ -0,0 +1,253 @@
+from apps.documents.models import Document, UploadSession
+from apps.documents.serializers import serialize_version
+from apps.documents.upload_handlers import UploadTooLarge, upload_limit
+from apps.documents.uploads import (
+    ChunkTooLarge,
+    UploadConflict,
+    UploadGone,
+    abort,
+    create_session,
+    finalize,
+    write_chunk,
+)
+from django.core.exceptions import ValidationError
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+CHUNK_CONTENT_TYPE = "application/offset+octet-stream"
+
+session_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "id": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID),
+        "document_id": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+        ),
+        "filename": openapi.Schema(type=openapi.TYPE_STRING),
+        "size": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "offset": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "expires_at": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME
+        ),
+    },
+)
+
+
+def serialize_session(session):
+    return {
+        "id": str(session.id),
+        "document_id": str(session.document_id),
+        "filename": session.filename,
+        "size": session.size,
+        "offset": session.offset,
+        "expires_at": session.expires_at.isoformat(),
+    }
+
+
+def offset_headers(session):
+    return {
+        "Upload-Offset": str(session.offset),
+        "Upload-Length": str(session.size),
+        "Cache-Control": "no-store",
+    }
+
+
+def live_sessions():
+    # Expired sessions linger until collect_garbage removes them.
+    return UploadSession.objects.filter(expires_at__gt=timezone.now())
+
+
+class UploadSessionListAPIView(APIView):
+    """
+    POST  Start a resumable upload of a new version of a document.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Create Upload Session",
+        operation_description=(
+            "Declare a file that will be sent in chunks. Send the chunks with "
+            "PATCH to the returned `Location`, then finalize the session to add "
+            "the file as a new version of the document."
+        ),
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["document_id", "filename", "size"],
+            properties={
+                "document_id": openapi.Schema(
+                    type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                ),
+                "filename": openapi.Schema(type=openapi.TYPE_STRING),
+                "size": openapi.Schema(
+                    type=openapi.TYPE_INTEGER, description="Total size in bytes"
+                ),
+            },
+        ),
+        responses={
+            201: session_schema,
+            400: "Bad Request",
+            413: "size is over the user's upload limit",
+        },
+    )
+    def post(self, request):
+        filename = str(request.data.get("filename", "")).strip()
+        if not filename or len(filename) > 255:
+            return Response(
+                {"error": "A filename of at most 255 characters is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            size = int(request.data.get("size"))
+        except (TypeError, ValueError):
+            size = 0
+        if size <= 0:
+            return Response(
+                {"error": "size must be a positive number of bytes."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = upload_limit(request.user)
+        if limit is not None and size > limit:
+            return Response(
+                {"error": str(UploadTooLarge(limit))},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        try:
+            document = Document.objects.get(document_id=request.data.get("document_id"))
+        except (Document.DoesNotExist, ValidationError):
+            return Response(
+                {"error": "Document not found."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        session = create_session(request.user, document, filename, size)
+        url = reverse("documents:doc-upload-detail", args=[session.id])
+        headers = {**offset_headers(session), "Location": url}
+        return Response(
+            serialize_session(session), status=status.HTTP_201_CREATED, headers=headers
+        )
+
+
+class UploadSessionDetailAPIView(APIView):
+    """
+    HEAD    Offset to resume from.
+    PATCH   Append a chunk at ``Upload-Offset``.
+    DELETE  Abandon the upload.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self, upload_id, user):
+        return get_object_or_404(live_sessions(), id=upload_id, user=user)
+
+    def head(self, request, upload_id):
+        session = self.get_object(upload_id, request.user)
+        return Response(status=status.HTTP_200_OK, headers=offset_headers(session))
+
+    @swagger_auto_schema(
+        operation_summary="Upload Chunk",
+        operation_description=(
+            f"Send the next bytes of the file as a raw `{CHUNK_CONTENT_TYPE}` "
+            "body. `Upload-Offset` must equal the session's current offset; "
+            "after a dropped connection, HEAD the session to find it."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "Upload-Offset",
+                in_=openapi.IN_HEADER,
+                type=openapi.TYPE_INTEGER,
+                required=True,
+            ),
+        ],
+        responses={
+            204: "Chunk stored; new offset in `Upload-Offset`",
+            400: "Bad Request (missing offset or length)",
+            409: "Conflict (offset mismatch or chunk past the declared size)",
+            413: "Chunk longer than DOCUMENT_UPLOAD_CHUNK_MAX_BYTES",
+            415: f"Unsupported Media Type (expected {CHUNK_CONTENT_TYPE})",
+        },
+    )
+    def patch(self, request, upload_id):
+        session = self.get_object(upload_id, request.user)
+        if request.content_type != CHUNK_CONTENT_TYPE:
+            return Response(
+                {"error": f"Chunks must be sent as {CHUNK_CONTENT_TYPE}."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "Upload-Offset and Content-Length headers are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            session = write_chunk(session, offset, request.stream, length)
+        except ChunkTooLarge as exc:
+            return Response(
+                {"error": str(exc)},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                headers=offset_headers(session),
+            )
+        except UploadConflict as exc:
+            return Response(
+                {"error": str(exc)},
+                status=status.HTTP_409_CONFLICT,
+                headers=offset_headers(session),
+            )
+        return Response(
+            status=status.HTTP_204_NO_CONTENT, headers=offset_headers(session)
+        )
+
+    @swagger_auto_schema(operation_summary="Abort Upload Session")
+    def delete(self, request, upload_id):
+        abort(self.get_object(upload_id, request.user))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionFinalizeAPIView(APIView):
+    """
+    POST  Turn a complete upload into a new document version.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Finalize Upload Session",
+        operation_description=(
+            "Attach the uploaded file to the session's document as its next "
+            "version. The file is moved into version storage, not copied."
+        ),
+        responses={
+            201: "The new version",
+            409: "Conflict (upload incomplete)",
+            410: "Gone (the uploaded data was lost; start a new upload)",
+        },
+    )
+    def post(self, request, upload_id):
+        session = get_object_or_404(live_sessions(), id=upload_id, user=request.user)
+        try:
+            version = finalize(session)
+        except UploadGone as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_410_GONE)
+        except UploadConflict as exc:
+            return Response(
+                {"error": str(exc)},
+                status=status.HTTP_409_CONFLICT,
+                headers=offset_headers(session),
+            )
+        return Response(
+            serialize_version(version, request), status=status.HTTP_201_CREATED
+        )
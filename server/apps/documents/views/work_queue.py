@@ -0,0 +1,108 @@
+from apps.core.pagination import InvalidCursor, KeysetPagination
+from apps.documents.models import WorkQueueItem
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class WorkQueueAPIView(APIView):
+    """
+    GET   Page through the documents waiting on the current user.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="My Work Queue",
+        operation_description=(
+            "Return one page of the actions waiting on the authenticated user, "
+            "oldest queued last. Reads only the work queue table."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "action",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=[value for value, _ in WorkQueueItem.action_choices],
+                required=False,
+            ),
+            openapi.Parameter(
+                "cursor", in_=openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False
+            ),
+            openapi.Parameter(
+                "page_size",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="A page of queued actions",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "next": openapi.Schema(type=openapi.TYPE_STRING),
+                        "previous": openapi.Schema(type=openapi.TYPE_STRING),
+                        "results": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    "document_id": openapi.Schema(
+                                        type=openapi.TYPE_STRING
+                                    ),
+                                    "title": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "priority": openapi.Schema(
+                                        type=openapi.TYPE_STRING
+                                    ),
+                                    "action": openapi.Schema(type=openapi.TYPE_STRING),
+                                    "queued_at": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        format=openapi.FORMAT_DATETIME,
+                                    ),
+                                },
+                            ),
+                        ),
+                    },
+                ),
+            ),
+            400: "Bad Request (invalid action or cursor)",
+        },
+    )
+    def get(self, request):
+        items = WorkQueueItem.objects.filter(user=request.user).only(
+            "id", "document_id", "action", "title", "priority", "created_at"
+        )
+        action = request.query_params.get("action")
+        if action:
+            if action not in dict(WorkQueueItem.action_choices):
+                return Response(
+                    {"error": "Invalid action."}, status=status.HTTP_400_BAD_REQUEST
+                )
+            items = items.filter(action=action)
+
+        paginator = KeysetPagination(ordering=("-created_at", "-id"))
+        try:
+            page = paginator.paginate_queryset(items, request)
+        except InvalidCursor:
+            return Response(
+                {"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = [
+            {
+                "document_id": str(item.document_id),
+                "title": item.title,
+                "priority": item.priority,
+                "action": item.action,
+                "queued_at": item.created_at.isoformat(),
+            }
+            for item in page
+        ]
+        return paginator.get_paginated_response(data)
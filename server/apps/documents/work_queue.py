@@ -0,0 +1,54 @@
+from apps.documents.models import Document, WorkQueueItem
+
+
+def required_actions(doc):
+    """
+    ``(user_id, action)`` pairs still outstanding on ``doc``.
+    """
+    if doc.deleted_at is not None:
+        return set()
+    if doc.status == Document.STATUS_PENDING:
+        return {(doc.reviewer_id, WorkQueueItem.ACTION_REVIEW)}
+    if doc.status == Document.STATUS_APPROVED:
+        return {(doc.assigned_to_id, WorkQueueItem.ACTION_SIGN)}
+    if doc.status == Document.STATUS_REJECTED:
+        return {(doc.created_by_id, WorkQueueItem.ACTION_RESUBMIT)}
+    return set()
+
+
+def sync_work_queue(doc):
+    """
+    Bring the queue rows of ``doc`` in line with its current state.
+
+    Call inside the transaction that changed ``doc`` so the queue never
+    disagrees with the documents table. Rows that are still required keep
+    their ``created_at`` and so their place in the queue. The document row
+    is locked first, so concurrent syncs of one document take turns instead
+    of inserting the same row twice.
+    """
+    list(Document.all_objects.select_for_update().filter(pk=doc.pk).values("pk"))
+    wanted = required_actions(doc)
+    existing = set(
+        WorkQueueItem.objects.filter(document=doc).values_list("user_id", "action")
+    )
+
+    for user_id, action in existing - wanted:
+        WorkQueueItem.objects.filter(
+            document=doc, user_id=user_id, action=action
+        ).delete()
+    if existing & wanted:
+        WorkQueueItem.objects.filter(document=doc).update(
+            title=doc.title, priority=doc.priority
+        )
+    WorkQueueItem.objects.bulk_create(
+        [
+            WorkQueueItem(
+                document=doc,
+                user_id=user_id,
+                action=action,
+                title=doc.title,
+                priority=doc.priority,
+            )
+            for user_id, action in wanted - existing
+        ]
+    )
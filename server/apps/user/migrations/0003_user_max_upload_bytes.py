@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0002_user_name_user_surname"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="max_upload_bytes",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -37,6 +37,8 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
 
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Overrides DOCUMENT_UPLOAD_MAX_BYTES for this user; 0 means no limit.
+    max_upload_bytes = models.PositiveBigIntegerField(blank=True, null=True)
 
     objects = UserManager()
 
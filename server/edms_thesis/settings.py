@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 
 import environ
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -26,6 +27,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "debug_toolbar",
@@ -54,6 +56,10 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
 ]
 
+# Resumable uploads send and read their offset in headers.
+CORS_ALLOW_HEADERS = (*default_headers, "upload-offset")
+CORS_EXPOSE_HEADERS = ["Location", "Upload-Offset", "Upload-Length"]
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
@@ -148,6 +154,101 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 AUTH_USER_MODEL = "user.User"
 
+# Seconds a user's dashboard counts may be served from cache; 0 disables it.
+DOCUMENT_STATS_CACHE_TTL = env.int("DOCUMENT_STATS_CACHE_TTL", default=10)
+
+# Who sends version downloads: "" streams them from Django (zero-copy where the
+# WSGI server supports sendfile), "nginx" hands off with X-Accel-Redirect to an
+# internal location at DOCUMENT_DOWNLOAD_ACCEL_PREFIX mapped to MEDIA_ROOT,
+# "apache" with X-Sendfile.
+DOCUMENT_DOWNLOAD_OFFLOAD = env("DOCUMENT_DOWNLOAD_OFFLOAD", default="")
+DOCUMENT_DOWNLOAD_ACCEL_PREFIX = env(
+    "DOCUMENT_DOWNLOAD_ACCEL_PREFIX", default="/protected-media/"
+)
+
+# Store each new version as a binary delta against the previous one when that
+# is at most DOCUMENT_DELTA_MAX_RATIO of its size. Every
+# DOCUMENT_DELTA_KEYFRAME_INTERVAL-th version in a chain is kept whole to bound
+# reconstruction, and rebuilt versions are cached up to
+# DOCUMENT_DELTA_CACHE_BYTES per process. Versions or bases over
+# DOCUMENT_DELTA_MAX_BYTES stay whole, since diffing holds both in memory.
+DOCUMENT_DELTA_ENCODING = env.bool("DOCUMENT_DELTA_ENCODING", default=False)
+DOCUMENT_DELTA_MAX_RATIO = env.float("DOCUMENT_DELTA_MAX_RATIO", default=0.5)
+DOCUMENT_DELTA_KEYFRAME_INTERVAL = env.int(
+    "DOCUMENT_DELTA_KEYFRAME_INTERVAL", default=10
+)
+DOCUMENT_DELTA_CACHE_BYTES = env.int(
+    "DOCUMENT_DELTA_CACHE_BYTES", default=64 * 1024 * 1024
+)
+DOCUMENT_DELTA_MAX_BYTES = env.int(
+    "DOCUMENT_DELTA_MAX_BYTES", default=64 * 1024 * 1024
+)
+
+# Post-upload work (delta encoding, renditions, file cleanup) runs as jobs on
+# `manage.py run_jobs` workers. Jobs queue in the database ("db") or in Redis
+# at DOCUMENT_JOB_REDIS_URL ("redis"). A failing job is retried up to
+# DOCUMENT_JOB_MAX_ATTEMPTS times, DOCUMENT_JOB_RETRY_DELAY seconds after the
+# first failure and twice as long after each further one. A worker holds a job
+# for DOCUMENT_JOB_LEASE seconds before others may assume it died.
+DOCUMENT_JOB_BACKEND = env("DOCUMENT_JOB_BACKEND", default="db")
+DOCUMENT_JOB_REDIS_URL = env(
+    "DOCUMENT_JOB_REDIS_URL", default="redis://localhost:6379/0"
+)
+DOCUMENT_JOB_CONCURRENCY = env.int("DOCUMENT_JOB_CONCURRENCY", default=2)
+DOCUMENT_JOB_MAX_ATTEMPTS = env.int("DOCUMENT_JOB_MAX_ATTEMPTS", default=5)
+DOCUMENT_JOB_RETRY_DELAY = env.int("DOCUMENT_JOB_RETRY_DELAY", default=10)
+DOCUMENT_JOB_LEASE = env.int("DOCUMENT_JOB_LEASE", default=600)
+
+# Codec version files are compressed with when stored: "zlib", "bz2", "lzma"
+# or "" to store them as uploaded. Files in already compressed formats are
+# always stored as is. The level defaults to the codec's own default.
+DOCUMENT_STORAGE_COMPRESSION = env("DOCUMENT_STORAGE_COMPRESSION", default="")
+DOCUMENT_STORAGE_COMPRESSION_LEVEL = env.int(
+    "DOCUMENT_STORAGE_COMPRESSION_LEVEL", default=None
+)
+
+# Characters of a version's file text kept for content search.
+DOCUMENT_TEXT_MAX_CHARS = env.int("DOCUMENT_TEXT_MAX_CHARS", default=5_000_000)
+
+# `manage.py tier_storage` moves version files used only by documents archived
+# DOCUMENT_COLD_AFTER_DAYS ago to the "cold" storage below, a directory at
+# DOCUMENT_COLD_STORAGE_ROOT unless another backend is configured. A moved file
+# is copied back on first read, and up to DOCUMENT_HOT_CACHE_BYTES of such
+# copies are kept on the hot volume.
+DOCUMENT_COLD_STORAGE_ROOT = env(
+    "DOCUMENT_COLD_STORAGE_ROOT", default=os.path.join(BASE_DIR, "cold-media")
+)
+DOCUMENT_COLD_AFTER_DAYS = env.int("DOCUMENT_COLD_AFTER_DAYS", default=30)
+DOCUMENT_HOT_CACHE_BYTES = env.int("DOCUMENT_HOT_CACHE_BYTES", default=1024**3)
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    "cold": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": DOCUMENT_COLD_STORAGE_ROOT},
+    },
+}
+
+# Megabytes per second `manage.py scrub` reads at most when checking stored
+# files, so a full scrub does not crowd out requests.
+DOCUMENT_SCRUB_RATE_MB = env.float("DOCUMENT_SCRUB_RATE_MB", default=20)
+
+# Bytes a file uploaded through the API may have, unless the user's
+# max_upload_bytes says otherwise; 0 means no limit. Uploads passing it are cut
+# off as soon as they do.
+DOCUMENT_UPLOAD_MAX_BYTES = env.int(
+    "DOCUMENT_UPLOAD_MAX_BYTES", default=100 * 1024 * 1024
+)
+
+# A resumable upload's PATCH may carry at most DOCUMENT_UPLOAD_CHUNK_MAX_BYTES.
+# A session that receives no chunk for DOCUMENT_UPLOAD_SESSION_HOURS expires,
+# and `manage.py collect_garbage` removes it with its part file.
+DOCUMENT_UPLOAD_CHUNK_MAX_BYTES = env.int(
+    "DOCUMENT_UPLOAD_CHUNK_MAX_BYTES", default=16 * 1024 * 1024
+)
+DOCUMENT_UPLOAD_SESSION_HOURS = env.int("DOCUMENT_UPLOAD_SESSION_HOURS", default=24)
+
 SIMPLE_JWT = {
     "USER_ID_FIELD": "user_id",  # JWT uses this field as the user identifier
     "USER_ID_CLAIM": "user_id",